@@ -1,3 +1,5 @@
+from wml.compiler import CompiledProgram, compile
+
 
 def sphinx_example():
     """
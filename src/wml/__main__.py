@@ -0,0 +1,76 @@
+import argparse
+import json
+import os
+import sys
+from typing import Optional
+
+from wml.sweep import completed, DEFAULT_CHUNK_SIZE, json_sink, sweep, Value
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="wml", description="World Modeling Language (WML)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sweep_parser = commands.add_parser("sweep", help="run a program over a grid of parameters")
+    sweep_parser.add_argument("program", help="the file of the program to run")
+    sweep_parser.add_argument(
+        "--param", action="append", default=[], metavar="NAME=V1,V2,...",
+        help="a parameter and its values, as JSON values or bare strings (repeatable)",
+    )
+    sweep_parser.add_argument("--grid", help="a JSON file mapping each parameter to its list of values")
+    sweep_parser.add_argument("--output", help="the JSON lines file to write the results to (default: stdout)")
+    sweep_parser.add_argument(
+        "--resume", action="store_true", help="skip the runs already in the output file and append to it",
+    )
+    sweep_parser.add_argument("--workers", type=int, help="the number of worker processes")
+    sweep_parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="the runs sent to a worker at once")
+
+    args = parser.parse_args(argv)
+    if args.resume and args.output is None:
+        parser.error("--resume needs --output")
+
+    return _sweep(args)
+
+
+def _sweep(args: argparse.Namespace) -> int:
+    with open(args.program, "r") as f:
+        source = f.read()
+
+    parameters: dict[str, list[Value]] = {}
+    if args.grid is not None:
+        with open(args.grid, "r") as f:
+            parameters.update(json.load(f))
+    for param in args.param:
+        name, _, values = param.partition("=")
+        parameters[name] = [_parse_value(value) for value in values.split(",")]
+
+    if args.output is None:
+        sweep(source, parameters, json_sink(sys.stdout), workers=args.workers, chunk_size=args.chunk_size)
+        return 0
+
+    skip: set[int] = set()
+    if args.resume and os.path.exists(args.output):
+        with open(args.output, "r+b") as f:
+            data = f.read()
+            # The last run was cut short by the crash, it is dropped to run again
+            cut = data.rfind(b"\n") + 1
+            f.truncate(cut)
+        skip = completed(data[:cut].decode().splitlines())
+
+    with open(args.output, "a" if args.resume else "w") as output:
+        sweep(source, parameters, json_sink(output), workers=args.workers, chunk_size=args.chunk_size, skip=skip)
+
+    return 0
+
+
+def _parse_value(text: str) -> Value:
+    try:
+        value = json.loads(text)
+    except ValueError:
+        return text
+
+    return value if isinstance(value, (bool, int, float, str)) else text
+
+
+if __name__ == "__main__":
+    sys.exit(main())
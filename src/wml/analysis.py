@@ -0,0 +1,207 @@
+from collections import Counter, defaultdict
+from typing import Iterator, Optional
+
+from wml import ast
+
+
+def children(node: ast.ASTNode) -> list[ast.ASTNode]:
+    """Return the direct child nodes of `node`, in evaluation order."""
+    node_type = type(node)
+
+    if node_type in (ast.Program, ast.Block):
+        nodes = node.statements or []
+    elif node_type == ast.ExpressionStatement:
+        nodes = [node.expression]
+    elif node_type in (ast.SetStatement, ast.ReturnStatement, ast.Temporary):
+        nodes = [node.value]
+    elif node_type == ast.ModelStatement:
+        nodes = [node.body]
+    elif node_type == ast.Infix:
+        nodes = [node.left, node.right]
+    elif node_type == ast.Prefix:
+        nodes = [node.right]
+    elif node_type == ast.If:
+        nodes = [node.condition, node.consequence, node.alternative]
+    elif node_type == ast.Action:
+        nodes = [node.body]
+    elif node_type == ast.Call:
+        nodes = [node.action, *(node.arguments or [])]
+    else:
+        nodes = []
+
+    return [child for child in nodes if child is not None]
+
+
+def walk(node: ast.ASTNode) -> Iterator[ast.ASTNode]:
+    """Yield `node` and all its descendants, in pre-order."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        yield current
+        stack.extend(reversed(children(current)))
+
+
+def assigned_names(node: ast.ASTNode) -> Counter[str]:
+    """Count the set statements targeting each name anywhere inside `node`."""
+    return Counter(
+        child.name.value for child in walk(node)
+        if type(child) == ast.SetStatement and child.name is not None
+    )
+
+
+def read_names(node: ast.ASTNode) -> Counter[str]:
+    """Count the references to each name anywhere inside `node`."""
+    return Counter(
+        child.value for child in walk(node)
+        if type(child) in (ast.Variable, ast.Identifier, ast.Constant)
+    )
+
+
+def free_names(action: ast.Action) -> set[str]:
+    """Return the names read inside `action` that may be bound outside of it.
+
+    Only the parameters are left out: a name set in the body may still be read
+    before it is set, and then it is looked up in the enclosing scopes.
+    """
+    return _free_names(children(action)) - {parameter.value for parameter in action.parameters}
+
+
+def captured_names(action: ast.Action) -> dict[ast.Action, Optional[frozenset[str]]]:
+    """Return what each action created in the scope of `action` needs from that scope.
+
+    An action only needs the names it reads that are parameters of `action` or set
+    in its scope, and only if none of them is set again once the inner action has
+    been created: it would see the new value. Those actions map to None, as they
+    need the whole scope.
+    """
+    statements: list[ast.Statement] = []
+    if action.body is not None:
+        _scope_statements(action.body.statements, statements)
+
+    local = {parameter.value for parameter in action.parameters} | {
+        statement.name.value for statement in statements if type(statement) == ast.SetStatement
+    }
+
+    captures: dict[ast.Action, Optional[frozenset[str]]] = {}
+    set_later: set[str] = set()
+    for statement in reversed(statements):
+        if type(statement) == ast.SetStatement:
+            set_later.add(statement.name.value)
+        for node in _scope_nodes(statement):
+            if type(node) == ast.Action:
+                names = free_names(node) & local
+                captures[node] = None if names & set_later else frozenset(names)
+
+    return captures
+
+
+def scope_assigned_names(statements: list[ast.Statement]) -> Counter[str]:
+    """Count the set statements targeting each name in the scope `statements` run in.
+
+    Unlike `assigned_names`, the set statements in the bodies of actions are left out.
+    """
+    scope: list[ast.Statement] = []
+    _scope_statements(statements, scope)
+
+    return Counter(statement.name.value for statement in scope if type(statement) == ast.SetStatement)
+
+
+def scope_written_names(statements: list[ast.Statement]) -> set[str]:
+    """Return the names bound in the scope `statements` run in, by set statements or temporaries."""
+    scope: list[ast.Statement] = []
+    _scope_statements(statements, scope)
+
+    return {
+        node.name.value if type(node) == ast.SetStatement else node.name
+        for statement in scope for node in [statement, *_scope_nodes(statement)]
+        if type(node) in (ast.SetStatement, ast.Temporary)
+    }
+
+
+def statement_dependencies(statements: list[ast.Statement]) -> list[frozenset[int]]:
+    """Return, for each statement of a scope, the earlier statements it has to run after.
+
+    A statement runs after the last one binding a name it reads or binds, and after
+    the ones that read a name it binds since that name was last bound. The names a
+    statement reads include the ones read by whatever it may call: reading a name
+    brings in the names read by every statement binding it. Statements other than
+    set and expression statements, like return statements, run after all the
+    previous ones and before all the next ones.
+    """
+    writes = [scope_written_names([statement]) for statement in statements]
+    direct = [_free_names([statement]) for statement in statements]
+    writers: dict[str, list[int]] = defaultdict(list)
+    for idx, names in enumerate(writes):
+        for name in names:
+            writers[name].append(idx)
+
+    dependencies: list[frozenset[int]] = []
+    last_writer: dict[str, int] = {}
+    readers: dict[str, list[int]] = defaultdict(list)
+    barrier: Optional[int] = None
+    for idx, statement in enumerate(statements):
+        if type(statement) not in (ast.SetStatement, ast.ExpressionStatement):
+            dependencies.append(frozenset(range(0 if barrier is None else barrier, idx)))
+            barrier = idx
+            continue
+
+        reads = set(direct[idx])
+        pending = list(reads)
+        while pending:
+            for writer in writers.get(pending.pop(), ()):
+                new = direct[writer] - reads
+                reads |= new
+                pending.extend(new)
+
+        deps = set() if barrier is None else {barrier}
+        deps.update(last_writer[name] for name in reads | writes[idx] if name in last_writer)
+        for name in writes[idx]:
+            deps.update(readers.pop(name, ()))
+        deps.discard(idx)
+        dependencies.append(frozenset(deps))
+
+        for name in reads:
+            readers[name].append(idx)
+        for name in writes[idx]:
+            last_writer[name] = idx
+
+    return dependencies
+
+
+def _free_names(nodes: list[ast.ASTNode]) -> set[str]:
+    # The names read inside `nodes`, leaving out the parameters of the actions in them
+    names: set[str] = set()
+    stack = list(nodes)
+
+    while stack:
+        node = stack.pop()
+        if type(node) == ast.Action:
+            names |= free_names(node)
+            continue
+        if type(node) in (ast.Variable, ast.Identifier, ast.Constant):
+            names.add(node.value)
+        stack.extend(children(node))
+
+    return names
+
+
+def _scope_statements(statements: list[ast.Statement], out: list[ast.Statement]) -> None:
+    # The statements that run in the same scope as `statements`, in evaluation order
+    for statement in statements:
+        out.append(statement)
+        for node in _scope_nodes(statement):
+            if type(node) == ast.If:
+                for block in (node.consequence, node.alternative):
+                    if block is not None:
+                        _scope_statements(block.statements, out)
+
+
+def _scope_nodes(statement: ast.Statement) -> Iterator[ast.ASTNode]:
+    # The nodes of `statement`, leaving out the blocks of `if` expressions and the
+    # bodies of actions
+    stack = list(reversed(children(statement)))
+    while stack:
+        node = stack.pop()
+        yield node
+        if type(node) != ast.Action:
+            stack.extend(reversed([child for child in children(node) if type(child) != ast.Block]))
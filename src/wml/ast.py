@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Callable, Optional
 
-from wml.token import Token
+from wml.token import Token, TokenType
+from wml.utils.strings import quote
 
 
 class ASTNode(ABC):
@@ -112,6 +113,12 @@ class Action(Expression):
         super().__init__(token)
         self.parameters = parameters or []
         self.body = body
+        # A copy of the body for arguments of the declared parameter types, see `wml.inference`
+        self.specialized: Optional[Block] = None
+        # The names the action keeps from the scope it is created in, None to keep them
+        # all, see `wml.analysis.captured_names`
+        self.captures: Optional[frozenset[str]] = None
+        self.captures_analyzed = False
 
     def __str__(self) -> str:
         param_list: list[str] = [str(parameter) for parameter in self.parameters]
@@ -155,6 +162,8 @@ class Infix(Expression):
         self.left = left
         self.operator = operator
         self.right = right
+        # The type both operands are known to have, if any, see `wml.inference`
+        self.operand_type: Optional[TokenType] = None
 
     def __str__(self) -> str:
         return f"({str(self.left)} {self.operator} {str(self.right)})"
@@ -176,7 +185,19 @@ class StringLiteral(Expression):
         self.value = value
 
     def __str__(self) -> str:
-        return self.value
+        return quote(self.value)
+
+
+class Temporary(Expression):
+    """Stores the value of an expression in a hidden slot, for later reads of that slot."""
+
+    def __init__(self, token: Token, name: str, value: Optional[Expression] = None) -> None:
+        super().__init__(token)
+        self.name = name
+        self.value = value
+
+    def __str__(self) -> str:
+        return f"({self.name} := {str(self.value)})"
 
 
 class Call(Expression):
@@ -188,6 +209,15 @@ class Call(Expression):
         super().__init__(token)
         self.action = action
         self.arguments = arguments
+        # Weak references to the outer scope and action the callee last resolved to,
+        # with the environment epoch at the time
+        self.cache: Optional[tuple[Callable[[], object], int, Callable[[], object]]] = None
+
+    def __getstate__(self) -> dict[str, object]:
+        # Weak references cannot be pickled, as when an action is sent to another process
+        state = self.__dict__.copy()
+        state["cache"] = None
+        return state
 
     def __str__(self) -> str:
         assert self.arguments is not None
@@ -221,6 +251,8 @@ class SetStatement(Statement):
         super().__init__(token)
         self.name = name
         self.value = value
+        # Set when the value is known to have the declared type, see `wml.inference`
+        self.value_type: Optional[TokenType] = None
 
     def __str__(self) -> str:
         return f'{self.token_literal()} {self.name} = {self.value};'
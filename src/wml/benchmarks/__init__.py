@@ -0,0 +1,32 @@
+from time import perf_counter
+from typing import Callable
+
+from wml.ast import Program
+from wml.lexer import Lexer
+from wml.parser import Parser
+
+
+def parse(source: str) -> Program:
+    lexer: Lexer = Lexer(source)
+    parser: Parser = Parser(lexer)
+    program: Program = parser.parse_program()
+
+    if len(parser.errors) > 0:
+        raise ValueError("\n".join(parser.errors))
+
+    return program
+
+
+def measure(function: Callable[[], object], repeat: int = 5) -> float:
+    """Return the best wall-clock time, in seconds, out of `repeat` calls to `function`."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        best = min(best, perf_counter() - start)
+
+    return best
+
+
+def report(name: str, seconds: float) -> None:
+    print(f"{name:<40} {seconds * 1000:>10.2f} ms")
@@ -0,0 +1,21 @@
+from wml.benchmarks import measure, parse, report
+from wml.benchmarks.calls import call_model
+from wml.budget import Budget
+from wml.evaluator import evaluate
+from wml.object import Environment
+
+# Every call has its own arguments, so none of them is answered from the memo
+WORK = "int work = action(n, s) { if (n < 2) { return 1; }; return work(n - 1, s * 2) + work(n - 2, s * 2 + 1); }; work(18, 1);"
+
+# Limits high enough for the programs to finish, so that only the metering is measured
+BUDGET = Budget(steps=10 ** 9, seconds=3600.0, depth=10 ** 6, int_bits=10 ** 6)
+
+
+def main() -> None:
+    for name, program in (("calls", parse(call_model(100, 200))), ("recursive work", parse(WORK))):
+        report(f"{name} (no budget)", measure(lambda: evaluate(program, Environment())))
+        report(f"{name} (budget)", measure(lambda: evaluate(program, Environment(), BUDGET)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+from wml.benchmarks import measure, parse, report
+from wml.evaluator import evaluate
+from wml.object import Environment
+
+LOOP = """
+int add = action(a, b) { a + b };
+int loop = action(n, acc) {
+    if (n == 0) { return acc; };
+    return loop(n - 1, add(acc, length('x')));
+};
+"""
+
+
+def call_model(depth: int, repeat: int) -> str:
+    """Build a model that calls a helper and a builtin at each of `depth` recursive steps, `repeat` times."""
+    lines = [LOOP, "int total = 0;"]
+    for idx in range(repeat):
+        lines.append(f"int total = total + loop({depth}, {idx});")
+    lines.append("total;")
+
+    return "\n".join(lines)
+
+
+def main() -> None:
+    program = parse(call_model(100, 200))
+
+    report("helper and builtin calls", measure(lambda: evaluate(program, Environment())))
+
+
+if __name__ == "__main__":
+    main()
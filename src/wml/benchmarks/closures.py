@@ -0,0 +1,58 @@
+import tracemalloc
+
+from wml import ast
+from wml.analysis import walk
+from wml.benchmarks import parse
+from wml.evaluator import evaluate
+from wml.object import Environment
+
+LINK = """
+int link = action(prev, a, b, c) {
+    int d = a * b;
+    int e = b * c;
+    int f = d + e;
+    return action(x) { prev(x) + c };
+};
+int chain = action(x) { x };
+"""
+
+
+def chain_model(size: int) -> str:
+    """Build a model that keeps `size` closures alive, each one created in a frame with a few locals."""
+    lines = [LINK]
+    for idx in range(size):
+        lines.append(f"int chain = link(chain, {idx}, {idx + 1}, {idx + 2});")
+    lines.append("chain;")
+
+    return "\n".join(lines)
+
+
+def _whole_scopes(program: ast.Program) -> ast.Program:
+    # Makes every action keep the whole scope it is created in, in place
+    for node in walk(program):
+        if type(node) == ast.Action:
+            node.captures_analyzed = True
+
+    return program
+
+
+def retained(program: ast.Program) -> int:
+    """Return the bytes still allocated once `program` has been evaluated."""
+    tracemalloc.start()
+    env = Environment()
+    evaluate(program, env)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return size
+
+
+def main() -> None:
+    source = chain_model(5_000)
+
+    print(f"{'closures keeping their whole scope':<40} {retained(_whole_scopes(parse(source))) / 1024:>10.0f} KiB")
+    print(f"{'closures keeping what they use':<40} {retained(parse(source)) / 1024:>10.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
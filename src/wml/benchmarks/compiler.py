@@ -0,0 +1,45 @@
+import random
+
+from wml.benchmarks import measure, parse, report
+from wml.compiler import ProgramCache
+from wml.evaluator import evaluate
+from wml.object import Environment, Integer
+from wml.token import Token, TokenType
+
+
+def script(idx: int) -> str:
+    """Return one of the distinct scripts a service is sent, a few dozen statements long."""
+    lines = [f"int base = {idx};"]
+    lines.extend(f"int v{step} = base * {step} + x - {step % 7};" for step in range(30))
+    lines.append("if (v29 > 100) { v29 - v3 } else { v29 + v7 };")
+
+    return "\n".join(lines)
+
+
+def requests(count: int, scripts: int) -> list[tuple[str, int]]:
+    generator = random.Random(0)
+    sources = [script(idx) for idx in range(scripts)]
+    return [(generator.choice(sources), generator.randrange(100)) for _ in range(count)]
+
+
+def uncached(batch: list[tuple[str, int]]) -> None:
+    for source, x in batch:
+        env = Environment()
+        env["x"] = Integer(x, Token(TokenType.INT_VALUE, str(x), 0, 0))
+        evaluate(parse(source), env)
+
+
+def cached(batch: list[tuple[str, int]]) -> None:
+    cache = ProgramCache()
+    for source, x in batch:
+        cache.compile(source).run({"x": x})
+
+
+def main() -> None:
+    batch = requests(500, 100)
+    report("500 requests (parse every time)", measure(lambda: uncached(batch), repeat=3))
+    report("500 requests (compile once)", measure(lambda: cached(batch), repeat=3))
+
+
+if __name__ == "__main__":
+    main()
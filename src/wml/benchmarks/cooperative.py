@@ -0,0 +1,55 @@
+import asyncio
+from time import perf_counter
+from typing import Awaitable, Callable
+
+from wml.ast import Program
+from wml.benchmarks import parse, report
+from wml.cooperative import evaluate_async
+from wml.evaluator import evaluate
+from wml.object import Environment
+
+# Every call has its own arguments, so none of them is answered from the memo
+WORK = "int work = action(n, s) { if (n < 2) { return 1; }; return work(n - 1, s * 2) + work(n - 2, s * 2 + 1); }; work(15, 1);"
+
+
+async def blocking(program: Program) -> None:
+    evaluate(program, Environment())
+
+
+def cooperative(interval: int) -> Callable[[Program], Awaitable[object]]:
+    return lambda program: evaluate_async(program, Environment(), interval)
+
+
+async def load(run: Callable[[Program], Awaitable[object]], programs: int) -> tuple[float, float]:
+    """Run `programs` evaluations at once, and return the p99 lateness of a 1 ms timer meanwhile and the total time."""
+    program = parse(WORK)
+    lateness: list[float] = []
+    running = True
+
+    async def probe() -> None:
+        while running:
+            start = perf_counter()
+            await asyncio.sleep(0.001)
+            lateness.append(perf_counter() - start - 0.001)
+
+    task = asyncio.create_task(probe())
+    await asyncio.sleep(0.01)
+    start = perf_counter()
+    await asyncio.gather(*(run(program) for _ in range(programs)))
+    total = perf_counter() - start
+    running = False
+    await task
+
+    lateness.sort()
+    return lateness[min(len(lateness) - 1, int(len(lateness) * 0.99))], total
+
+
+def main() -> None:
+    for name, run in (("blocking", blocking), ("every 100 steps", cooperative(100)), ("every 500 steps", cooperative(500))):
+        p99, total = asyncio.run(load(run, 20))
+        report(f"20 programs, {name} (p99 latency)", p99)
+        report(f"20 programs, {name} (total)", total)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import subprocess
+import sys
+
+from wml.benchmarks import measure, report
+from wml.forkserver import ForkServer
+
+# Parses and optimizes the library, then evaluates a job, as a fresh process would
+COLD_START = """
+import sys
+from wml.benchmarks import parse
+from wml.analysis import scope_assigned_names
+from wml.evaluator import evaluate
+from wml.object import Environment
+from wml.optimizer import optimize
+
+library = parse(sys.argv[1])
+env = Environment()
+evaluate(optimize(library, keep=scope_assigned_names(library.statements)), env)
+evaluate(parse(sys.argv[2]), env)
+"""
+
+
+def library(size: int) -> str:
+    """Return a library of `size` constants and `size` actions using them."""
+    lines = [f"int k{idx} = {idx};" for idx in range(size)]
+    lines.extend(f"int f{idx} = action(x) {{ if (x > k{idx}) {{ x - k{idx} }} else {{ x + k{idx} }} }};" for idx in range(size))
+
+    return "\n".join(lines)
+
+
+def jobs(count: int, size: int) -> list[str]:
+    return [f"f{idx % size}({idx}) + f{(idx * 7) % size}(3);" for idx in range(count)]
+
+
+def cold(source: str, scripts: list[str]) -> None:
+    for script in scripts:
+        subprocess.run([sys.executable, "-c", COLD_START, source, script], check=True)
+
+
+def main() -> None:
+    source = library(500)
+    scripts = jobs(10, 500)
+
+    report("10 jobs (a process each)", measure(lambda: cold(source, scripts), repeat=1))
+    report("fork server start", measure(lambda: ForkServer(source, workers=2).close(), repeat=1))
+    with ForkServer(source, workers=2) as server:
+        report("10 jobs (fork server)", measure(lambda: list(server.map(scripts)), repeat=3))
+
+
+if __name__ == "__main__":
+    main()
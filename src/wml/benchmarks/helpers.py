@@ -0,0 +1,33 @@
+from wml.benchmarks import measure, parse, report
+from wml.evaluator import evaluate
+from wml.object import Environment
+from wml.optimizer import optimize
+
+HELPERS = """
+flt area = action(w, h) { return w * h; };
+flt twice = action(a) { return a * 2; };
+flt inc = action(a) { return a + 1; };
+flt scale = action(x) { return twice(inc(x)) + area(x, 0.5); };
+"""
+
+
+def helper_model(size: int) -> str:
+    """Build a model that calls small helper actions inside `size` expressions."""
+    lines = ["flt x = 0.5;", HELPERS]
+    for idx in range(size):
+        lines.append(f"flt x = scale(x) + twice(area(x, {idx}.0)) - inc(x) * 0.5;")
+    lines.append("x;")
+
+    return "\n".join(lines)
+
+
+def main() -> None:
+    program = parse(helper_model(1_000))
+    optimized = optimize(program)
+
+    report("helper model", measure(lambda: evaluate(program, Environment())))
+    report("helper model (inlined)", measure(lambda: evaluate(optimized, Environment())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from tempfile import TemporaryDirectory
+
+from wml.benchmarks import measure, report
+from wml.interpreters import interpreter_pool, InterpreterPoolExecutor, run_file
+
+# Every call has its own arguments, so none of them is answered from the memo
+SOURCE = """
+int work = action(n, s) {{ if (n < 2) {{ return 1; }}; return work(n - 1, s * 2) + work(n - 2, s * 2 + 1); }};
+work(14, {seed});
+"""
+
+
+def write_programs(directory: str, count: int) -> list[str]:
+    """Write `count` programs to `directory` and return their file names."""
+    filenames = []
+    for idx in range(count):
+        filename = os.path.join(directory, f"program{idx}.wml")
+        with open(filename, "w") as f:
+            f.write(SOURCE.format(seed=idx + 1))
+        filenames.append(filename)
+
+    return filenames
+
+
+def run(executor: Executor, filenames: list[str]) -> None:
+    list(executor.map(run_file, filenames))
+
+
+def main() -> None:
+    workers = os.cpu_count() or 1
+    with TemporaryDirectory() as directory:
+        filenames = write_programs(directory, 32)
+
+        with ProcessPoolExecutor(workers) as executor:
+            report(f"32 files ({workers} processes)", measure(lambda: run(executor, filenames), repeat=3))
+
+        if InterpreterPoolExecutor is None:
+            print("Sub-interpreters need Python 3.14 or later")
+            return
+        with interpreter_pool(workers) as executor:
+            report(f"32 files ({workers} sub-interpreters)", measure(lambda: run(executor, filenames), repeat=3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from wml.benchmarks import measure, parse, report
+from wml.evaluator import evaluate
+from wml.object import Environment
+from wml.parallel import evaluate_parallel
+
+# Every call has its own arguments, so none of them is answered from the memo
+WORK = "int work = action(n, s) { if (n < 2) { return 1; }; return work(n - 1, s * 2) + work(n - 2, s * 2 + 1); };"
+
+
+def model(blocks: int, n: int) -> str:
+    """Return a program with `blocks` independent set statements, each making fib(n) calls."""
+    lines = [WORK]
+    lines.extend(f"int r{idx} = work({n}, {(idx + 1) * 10 ** 9});" for idx in range(blocks))
+    lines.append(" + ".join(f"r{idx}" for idx in range(blocks)) + ";")
+
+    return "\n".join(lines)
+
+
+def main() -> None:
+    program = parse(model(8, 16))
+    report("8 blocks (sequential)", measure(lambda: evaluate(program, Environment()), repeat=3))
+    for workers in (2, 4, 8):
+        with ProcessPoolExecutor(workers) as executor:
+            report(
+                f"8 blocks ({workers} processes)",
+                measure(lambda: evaluate_parallel(program, Environment(), executor, workers), repeat=3),
+            )
+
+
+if __name__ == "__main__":
+    main()
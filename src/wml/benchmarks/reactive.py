@@ -0,0 +1,40 @@
+from wml.ast import Program
+from wml.benchmarks import measure, parse, report
+from wml.evaluator import evaluate
+from wml.object import Environment, Integer
+from wml.reactive import ReactiveProgram
+from wml.token import Token, TokenType
+
+
+def model(inputs: int, depth: int) -> str:
+    """Return a program with `inputs` inputs, each feeding a chain of `depth` derived quantities."""
+    lines = []
+    for idx in range(inputs):
+        lines.append(f"int in{idx} = {idx};")
+        lines.append(f"int d{idx}n0 = in{idx} + 1;")
+        lines.extend(f"int d{idx}n{step} = d{idx}n{step - 1} * 3 - in{idx};" for step in range(1, depth))
+    lines.append(" + ".join(f"d{idx}n{depth - 1}" for idx in range(inputs)) + ";")
+
+    return "\n".join(lines)
+
+
+def full(program: Program, updates: int) -> None:
+    for _ in range(updates):
+        evaluate(program, Environment())
+
+
+def incremental(program: Program, updates: int) -> None:
+    reactive = ReactiveProgram(program)
+    reactive.run()
+    for value in range(updates):
+        reactive.set("in0", Integer(value, Token(TokenType.INT_VALUE, str(value))))
+
+
+def main() -> None:
+    program = parse(model(20, 25))
+    report("100 updates (full evaluation)", measure(lambda: full(program, 100), repeat=3))
+    report("100 updates (reactive)", measure(lambda: incremental(program, 100), repeat=3))
+
+
+if __name__ == "__main__":
+    main()
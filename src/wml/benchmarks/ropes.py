@@ -0,0 +1,27 @@
+from wml.ast import Program
+from wml.benchmarks import measure, parse, report
+from wml.evaluator import evaluate
+from wml.object import Environment
+
+CHUNK = "x" * 100
+
+
+def report_model(megabytes: int) -> Program:
+    """Build a model that grows one string to `megabytes` MB, 100 characters at a time."""
+    header = parse('str report = "";')
+    append = parse(f'str report = report + "{CHUNK}";')
+    footer = parse("length(report);")
+
+    repetitions = megabytes * 1_000_000 // len(CHUNK)
+    return Program(header.statements + append.statements * repetitions + footer.statements)
+
+
+def main() -> None:
+    for megabytes in (1, 5, 10):
+        program = report_model(megabytes)
+        seconds = measure(lambda: evaluate(program, Environment()), repeat=3)
+        report(f"build {megabytes} MB report", seconds)
+
+
+if __name__ == "__main__":
+    main()
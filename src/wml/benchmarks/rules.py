@@ -0,0 +1,60 @@
+import random
+import tracemalloc
+from collections import deque
+from typing import Iterator
+
+from wml.benchmarks import measure, parse, report
+from wml.compiler import _to_object
+from wml.evaluator import evaluate
+from wml.object import Environment
+from wml.rules import Record, RuleSet
+
+RULES = {
+    "total": "int total = price * quantity; total;",
+    "discount": "if (vip) { if (total > 500) { total * 0.15 } else { total * 0.05 } } else { 0.0 };",
+    "flagged": "total > 2000;",
+    "priority": "if (vip) { 1 } else { if (quantity > 20) { 2 } else { 3 } };",
+}
+
+
+def events(count: int) -> Iterator[Record]:
+    generator = random.Random(0)
+    for _ in range(count):
+        yield {"price": generator.randrange(1, 200), "quantity": generator.randrange(1, 40), "vip": generator.random() < 0.2}
+
+
+def naive(count: int) -> None:
+    # Every record parses the rules again, in a new environment
+    for record in events(count):
+        env = Environment()
+        for field, value in record.items():
+            env[field] = _to_object(value)
+        for source in RULES.values():
+            evaluate(parse(source), env)
+
+
+def streamed(count: int) -> None:
+    deque(RuleSet(RULES).apply(events(count)), maxlen=0)
+
+
+def peak_memory(count: int) -> int:
+    tracemalloc.start()
+    streamed(count)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return peak
+
+
+def main() -> None:
+    report("1000 records (parsed every time)", measure(lambda: naive(1000), repeat=3))
+    for count in (1000, 100000):
+        seconds = measure(lambda: streamed(count), repeat=3)
+        report(f"{count} records (rule set)", seconds)
+        print(f"{'':<40} {count / seconds:>10.0f} records/s")
+    for count in (10000, 100000):
+        print(f"{f'{count} records (peak memory)':<40} {peak_memory(count) / 1024:>10.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
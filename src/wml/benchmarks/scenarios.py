@@ -0,0 +1,32 @@
+from wml.benchmarks import measure, parse, report
+from wml.evaluator import evaluate
+from wml.object import Environment, Integer
+from wml.token import Token, TokenType
+
+WHAT_IF = "int v10 = v10 * 2; int v20 = v20 + v10; v20;"
+
+
+def base_state(size: int, persistent: bool) -> Environment:
+    """Return a scope with `size` integer bindings, named v0, v1 and so on."""
+    env = Environment(persistent=persistent)
+    for idx in range(size):
+        env[f"v{idx}"] = Integer(idx, Token(TokenType.INT_VALUE, str(idx)))
+
+    return env
+
+
+def run_scenarios(base: Environment, count: int) -> None:
+    program = parse(WHAT_IF)
+    for _ in range(count):
+        evaluate(program, base.fork())
+
+
+def main() -> None:
+    for persistent in (False, True):
+        base = base_state(100_000, persistent)
+        name = "persistent" if persistent else "dict"
+        report(f"1000 what-if scenarios ({name})", measure(lambda: run_scenarios(base, 1_000), repeat=3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+from wml.benchmarks import measure, parse, report
+from wml.evaluator import evaluate
+from wml.object import Environment
+
+
+def string_model(size: int, width: int = 1) -> str:
+    """Build a model that concatenates, compares and measures strings `size` times.
+
+    `width` repeats every literal to make the strings longer.
+    """
+    lines = [f'str greeting = "{"Hello" * width}";']
+    for idx in range(size):
+        name = f"user {idx}" * width
+        lines.append(f"str name = '{name}';")
+        lines.append('str message = greeting + ", " + name + "!";')
+        lines.append(f'message == "{"Hello" * width}, {name}!";')
+        lines.append("message != greeting;")
+        lines.append("length(message);")
+
+    return "\n".join(lines)
+
+
+def main() -> None:
+    for size, width in ((100, 1), (1_000, 1), (1_000, 100)):
+        program = parse(string_model(size, width))
+        seconds = measure(lambda: evaluate(program, Environment()))
+        report(f"string model ({size} blocks, width {width})", seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from wml.benchmarks import measure, report
+from wml.sweep import sweep
+
+SOURCE = """
+flt grow = action(value, rate, years) {
+    if (years < 1) { return value; };
+    return grow(value * (1.0 + rate), rate, years - 1);
+};
+grow(principal, rate, 60);
+"""
+
+PARAMETERS = {
+    "principal": [float(value) for value in range(100, 2100, 100)],
+    "rate": [value / 1000 for value in range(1, 101)],
+}
+
+
+def main() -> None:
+    for workers in (1, 2, 4):
+        with ProcessPoolExecutor(workers) as executor:
+            report(
+                f"2000 runs ({workers} processes)",
+                measure(lambda: sweep(SOURCE, PARAMETERS, lambda _: None, executor, workers), repeat=3),
+            )
+
+
+if __name__ == "__main__":
+    main()
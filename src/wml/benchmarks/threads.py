@@ -0,0 +1,33 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from wml.benchmarks import measure, parse, report
+from wml.evaluator import evaluate
+from wml.object import Environment
+
+# Comparisons, branches and calls: the parts of the evaluator that used to share state
+SOURCE = """
+int work = action(n, s) {
+    if (n < 2) { return if (s > 0) { 1 } else { 0 }; };
+    return work(n - 1, s * 2) + work(n - 2, s * 2 + 1);
+};
+work(12, 1) == 233;
+"""
+
+
+def run(threads: int, evaluations: int) -> None:
+    program = parse(SOURCE)
+    with ThreadPoolExecutor(threads) as executor:
+        list(executor.map(lambda _: evaluate(program, Environment()), range(evaluations)))
+
+
+def main() -> None:
+    # Only a free-threaded build of Python (3.13t and later) runs the threads at once
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"GIL {'enabled' if gil else 'disabled'}")
+    for threads in (1, 2, 4, 8):
+        report(f"64 evaluations ({threads} threads)", measure(lambda: run(threads, 64), repeat=3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+from wml import ast
+from wml.analysis import walk
+from wml.benchmarks import measure, parse, report
+from wml.evaluator import evaluate
+from wml.object import Environment
+from wml.optimizer import optimize
+
+OSCILLATOR = """
+flt integrate = action(flt x, flt v, int n) {
+    if (n == 0) { return x; };
+    flt a = 0.0 - x * 0.5 - v * 0.1;
+    return integrate(x + v * 0.01, v + a * 0.01, n - 1);
+};
+"""
+
+
+def oscillator_model(steps: int, runs: int) -> str:
+    """Build a model that integrates a damped oscillator for `steps` steps, from `runs` starting points."""
+    lines = [OSCILLATOR, "flt total = 0.0;"]
+    for idx in range(runs):
+        lines.append(f"flt total = total + integrate({idx}.5, 0.0, {steps});")
+    lines.append("total;")
+
+    return "\n".join(lines)
+
+
+def _without_types(program: ast.Program) -> ast.Program:
+    # Drops what `wml.inference.infer_types` annotated, in place
+    for node in walk(program):
+        if type(node) == ast.Infix:
+            node.operand_type = None
+        elif type(node) == ast.SetStatement:
+            node.value_type = None
+        elif type(node) == ast.Action:
+            node.specialized = None
+
+    return program
+
+
+def main() -> None:
+    typed = optimize(parse(oscillator_model(100, 200)))
+    untyped = _without_types(optimize(parse(oscillator_model(100, 200))))
+
+    report("oscillator (optimized, no types)", measure(lambda: evaluate(untyped, Environment())))
+    report("oscillator (optimized, typed)", measure(lambda: evaluate(typed, Environment())))
+
+
+if __name__ == "__main__":
+    main()
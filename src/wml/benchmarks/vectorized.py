@@ -0,0 +1,68 @@
+import random
+from array import array
+
+from wml.ast import Program
+from wml.benchmarks import measure, parse, report
+from wml.evaluator import _do_action, evaluate
+from wml.object import Action, Environment, Float, Integer
+from wml.token import Token, TokenType
+from wml.vectorized import call_lanes, evaluate_lanes
+
+# A random walk from a sampled start, with a drift that depends on where it is
+MODEL = (
+    "flt walk = action(n, position, step) { "
+    "if (n == 0) { return position; }; "
+    "if (position > 1.0) { return walk(n - 1, position - step * 2.0, step); }; "
+    "if (position < -1.0) { return walk(n - 1, position + step, step); }; "
+    "walk(n - 1, position + step / 2.0, step) "
+    "}; "
+    "walk(40, start, 0.25);"
+)
+
+# A scoring action called from Python for each row of a table
+SCORE = (
+    "int score = action(age, income, debt) { "
+    "if (debt > income * 0.5) { return 0.0; }; "
+    "if (age < 25) { return income / 1000.0 - debt / 500.0; }; "
+    "income / 800.0 - debt / 600.0 + age * 0.1 "
+    "};"
+)
+
+
+def scalar(program: Program, starts: list[float]) -> None:
+    for start in starts:
+        env = Environment()
+        env["start"] = Float(start, Token(TokenType.FLOAT_VALUE, str(start), 0, 0))
+        evaluate(program, env)
+
+
+def rows(score: Action, ages: array, incomes: array, debts: array) -> None:
+    for age, income, debt in zip(ages, incomes, debts):
+        _do_action(score, [
+            Integer(age, Token(TokenType.INT_VALUE, str(age), 0, 0)),
+            Float(income, Token(TokenType.FLOAT_VALUE, str(income), 0, 0)),
+            Float(debt, Token(TokenType.FLOAT_VALUE, str(debt), 0, 0)),
+        ])
+
+
+def main() -> None:
+    program = parse(MODEL)
+    generator = random.Random(0)
+    for samples in (100, 1000, 10000):
+        starts = [generator.uniform(-3.0, 3.0) for _ in range(samples)]
+        report(f"{samples} samples (one by one)", measure(lambda: scalar(program, starts), repeat=3))
+        report(f"{samples} samples (lanes)", measure(lambda: evaluate_lanes(program, {"start": starts}), repeat=3))
+
+    env = Environment()
+    evaluate(parse(SCORE), env)
+    score = env["score"]
+    for count in (1000, 100000):
+        ages = array("q", (generator.randrange(18, 80) for _ in range(count)))
+        incomes = array("d", (generator.uniform(1000.0, 9000.0) for _ in range(count)))
+        debts = array("d", (generator.uniform(0.0, 5000.0) for _ in range(count)))
+        report(f"{count} rows (one call each)", measure(lambda: rows(score, ages, incomes, debts), repeat=3))
+        report(f"{count} rows (batched)", measure(lambda: call_lanes(score, [ages, incomes, debts]), repeat=3))
+
+
+if __name__ == "__main__":
+    main()
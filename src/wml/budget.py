@@ -0,0 +1,96 @@
+from time import monotonic
+from typing import Callable, NamedTuple, Optional
+
+from wml import object as obj
+from wml.errors import BudgetExceeded
+from wml.token import Token
+
+# Number of steps between two looks at the clock
+CLOCK_INTERVAL = 64
+
+
+class Budget(NamedTuple):
+    """Limits on an evaluation, None meaning no limit.
+
+    Attributes:
+        steps -- number of action calls. Anything else a program does is bounded by
+                 its size, so a program can only run away through its calls.
+        seconds -- wall-clock time, checked every `CLOCK_INTERVAL` steps
+        depth -- number of nested action calls. Running out of Python stack first
+                 also stops a metered evaluation on this limit.
+        int_bits -- size of the integers computed by multiplications and powers
+    """
+
+    steps: Optional[int] = None
+    seconds: Optional[float] = None
+    depth: Optional[int] = None
+    int_bits: Optional[int] = None
+
+
+class Meter:
+    """What is left of the budget of an evaluation.
+
+    If given, `pause` is called every `interval` steps, see `wml.cooperative`.
+    """
+
+    __slots__ = ("budget", "steps", "depth", "deadline", "pause", "interval", "overflow")
+
+    def __init__(self, budget: Budget, pause: Optional[Callable[[], None]] = None, interval: int = 1) -> None:
+        if interval < 1:
+            raise ValueError(f"The interval between pauses must be at least 1 step, got {interval}")
+        self.budget = budget
+        self.steps = 0
+        self.depth = 0
+        self.deadline = None if budget.seconds is None else monotonic() + budget.seconds
+        self.pause = pause
+        self.interval = interval
+        # The depth and action of the call that ran out of Python stack, if one did
+        self.overflow: Optional[tuple[int, Optional[Token]]] = None
+
+    def enter(self, action: obj.Type) -> Optional[BudgetExceeded]:
+        """Count a call to `action`, and return an error if it goes over the budget.
+
+        Every call entered is to be left with `leave`, whether it fails or not.
+        """
+        self.steps += 1
+        self.depth += 1
+        budget = self.budget
+        if budget.steps is not None and self.steps > budget.steps:
+            return _exceeded("steps", budget.steps, action.token)
+        if budget.depth is not None and self.depth > budget.depth:
+            return _exceeded("depth", budget.depth, action.token)
+        if self.deadline is not None and self.steps % CLOCK_INTERVAL == 0 and monotonic() > self.deadline:
+            return _exceeded("seconds", budget.seconds, action.token)
+        if self.pause is not None and self.steps % self.interval == 0:
+            self.pause()
+        return None
+
+    def leave(self) -> None:
+        self.depth -= 1
+
+    def exhausted(self) -> BudgetExceeded:
+        """Return the error of an evaluation that ran out of Python stack before reaching its depth limit."""
+        if self.overflow is None:
+            return _exceeded("depth", self.budget.depth, None)
+        depth, token = self.overflow
+        return _exceeded("depth", depth, token)
+
+    def check_power(self, base: int, exponent: int, token: Token) -> Optional[BudgetExceeded]:
+        """Return an error if `base ** exponent` is sure to be over the budget, before it is computed."""
+        int_bits = self.budget.int_bits
+        # |base| >= 2 ** (bits - 1), so the power has more than (bits - 1) * exponent bits
+        if int_bits is not None and exponent > 0 and (abs(base).bit_length() - 1) * exponent >= int_bits:
+            return _exceeded("int_bits", int_bits, token)
+        return None
+
+    def check_integer(self, value: int, token: Token) -> Optional[BudgetExceeded]:
+        int_bits = self.budget.int_bits
+        if int_bits is not None and value.bit_length() > int_bits:
+            return _exceeded("int_bits", int_bits, token)
+        return None
+
+
+def _exceeded(limit: str, value: object, token: Optional[Token]) -> BudgetExceeded:
+    if token is None:
+        return BudgetExceeded(limit, value, 0, 0)
+    return BudgetExceeded(limit, value, token.line, token.column - len(token.literal))
@@ -10,7 +10,7 @@ def length(*args: obj.Type) -> obj.Integer | Error:
         return InvalidNumberOfArguments(1, len(args), 0,0)
     elif type(args[0]) == obj.String:
         argument = cast(obj.String, args[0])
-        value = len(argument.value[1:-1])
+        value = argument.length
         token = Token(TokenType.INT_VALUE, str(value), 0, 0)
         return obj.Integer(value, token)
     else:
@@ -18,5 +18,5 @@ def length(*args: obj.Type) -> obj.Integer | Error:
 
 
 BUILTINS: dict[str, obj.BuiltIn] = {
-    'length': obj.BuiltIn(function=length),
+    'length': obj.BuiltIn(function=length, pure=True),
 }
@@ -0,0 +1,149 @@
+import hashlib
+from collections import OrderedDict
+from threading import Lock
+from typing import Mapping, NamedTuple, Optional
+
+from wml import object as obj
+from wml.ast import Program
+from wml.budget import Budget
+from wml.evaluator import evaluate
+from wml.lexer import Lexer
+from wml.parser import Parser
+from wml.token import Token, TokenType
+
+# Total length of the sources of the programs kept by a cache, unless it is given another size
+DEFAULT_MAX_SIZE = 4 * 1024 * 1024
+
+# The values Python values are bound as
+_VALUES: dict[type, tuple[type[obj.Type], TokenType]] = {
+    bool: (obj.Boolean, TokenType.BOOL_VALUE),
+    float: (obj.Float, TokenType.FLOAT_VALUE),
+    int: (obj.Integer, TokenType.INT_VALUE),
+    str: (obj.String, TokenType.STR_VALUE),
+}
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size: int
+    max_size: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class CompiledProgram:
+    """A parsed program, to be run as many times as needed, from several threads at once."""
+
+    def __init__(self, program: Program) -> None:
+        self.program = program
+
+    def run(
+            self,
+            bindings: Optional[Mapping[str, obj.Type | bool | int | float | str]] = None,
+            env: Optional[obj.Environment] = None,
+            budget: Optional[Budget] = None,
+    ) -> Optional[obj.Type]:
+        """Evaluate the program in a new scope inside `env`, with `bindings` already bound, and return its value.
+
+        Bindings are WML values, or Python booleans, integers, floats and strings.
+        The evaluation stops with an error once over `budget`, see `wml.budget`.
+        """
+        scope = obj.Environment(env)
+        for name, value in (bindings or {}).items():
+            scope[name] = _to_object(value)
+
+        return evaluate(self.program, scope, budget)
+
+
+class ProgramCache:
+    """Compiled programs by the hash of their source.
+
+    The least recently used programs are evicted first, once the sources of the
+    programs kept add up to more than `max_size` characters, and a size of 0
+    disables the cache. A cache can be used from several threads at once.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size = 0
+        self._programs: OrderedDict[bytes, tuple[CompiledProgram, int]] = OrderedDict()
+        self._lock = Lock()
+
+    def compile(self, source: str) -> CompiledProgram:
+        """Return the compiled program of `source`, parsing it only if it is not kept yet.
+
+        Raises ValueError if `source` has syntax errors.
+        """
+        key = hashlib.blake2b(source.encode(), digest_size=16).digest()
+        with self._lock:
+            entry = self._programs.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._programs.move_to_end(key)
+                return entry[0]
+            self.misses += 1
+
+        # Parsed outside the lock, so that other threads keep getting their programs
+        compiled = CompiledProgram(parse(source))
+        size = len(source)
+        if size > self.max_size:
+            return compiled
+
+        with self._lock:
+            if key not in self._programs:
+                self._programs[key] = (compiled, size)
+                self._size += size
+            while self._size > self.max_size:
+                _, (_, evicted) = self._programs.popitem(last=False)
+                self._size -= evicted
+                self.evictions += 1
+        return compiled
+
+    def clear(self) -> None:
+        with self._lock:
+            self._programs.clear()
+            self._size = 0
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self.hits, self.misses, self.evictions, len(self._programs), self._size, self.max_size)
+
+
+# The cache of `compile`
+default_cache = ProgramCache()
+
+
+def compile(source: str) -> CompiledProgram:  # noqa  # Shadows the builtin, as `re.compile` does
+    """Return the compiled program of `source`, from `default_cache` if it was compiled before.
+
+    Raises ValueError if `source` has syntax errors.
+    """
+    return default_cache.compile(source)
+
+
+def _to_object(value: obj.Type | bool | int | float | str) -> obj.Type:
+    if isinstance(value, obj.Type):
+        return value
+
+    value_type, token_type = _VALUES[type(value)]
+    return value_type(value, Token(token_type, str(value), 0, 0))
+
+
+def parse(source: str) -> Program:
+    """Parse `source`, raising ValueError if it has syntax errors."""
+    lexer: Lexer = Lexer(source)
+    parser: Parser = Parser(lexer)
+    program: Program = parser.parse_program()
+
+    if len(parser.errors) > 0:
+        raise ValueError("\n".join(parser.errors))
+
+    return program
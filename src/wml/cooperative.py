@@ -0,0 +1,106 @@
+import asyncio
+import threading
+from typing import Optional
+from weakref import WeakKeyDictionary
+
+from wml import ast
+from wml import object as obj
+from wml.budget import Budget, Meter
+from wml.evaluator import _evaluate_metered
+
+# Number of steps run before giving the event loop a turn, unless told otherwise
+DEFAULT_INTERVAL = 500
+
+# The evaluations of each loop take turns, one slice of one of them at a time
+_TURNS: WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock] = WeakKeyDictionary()
+
+
+async def evaluate_async(
+        node: ast.ASTNode,
+        env: obj.Environment,
+        interval: int = DEFAULT_INTERVAL,
+        budget: Optional[Budget] = None,
+) -> Optional[obj.Type]:
+    """Like `evaluate`, but give the event loop a turn every `interval` steps.
+
+    A step is an action call, as in `wml.budget`. Between two turns the
+    evaluation holds the loop just as any synchronous code would. Evaluations
+    running at once take turns, the loop getting a turn after each slice of
+    `interval` steps, so other tasks wait for at most `interval` steps however
+    many evaluations are running.
+
+    The evaluator keeps its state on the Python stack, so each evaluation runs on
+    a thread of its own, which is only ever running while the loop waits for it:
+    WML code and the tasks of the loop never run at the same time.
+    """
+    if interval < 1:
+        raise ValueError(f"The interval between turns must be at least 1 step, got {interval}")
+
+    loop = asyncio.get_running_loop()
+    turn = _TURNS.get(loop)
+    if turn is None:
+        turn = _TURNS[loop] = asyncio.Lock()
+
+    evaluation = _Evaluation(node, env, Meter(budget or Budget(), interval=interval))
+    try:
+        while True:
+            async with turn:
+                if evaluation.run_slice():
+                    break
+                # The turn is only given up once the loop has had its own
+                await asyncio.sleep(0)
+    except asyncio.CancelledError:
+        evaluation.cancel()
+        raise
+
+    if evaluation.exception is not None:
+        raise evaluation.exception
+    return evaluation.result
+
+
+class _Cancelled(BaseException):
+    """Unwinds an evaluation whose task was cancelled, out of the reach of any handler."""
+
+
+class _Evaluation:
+
+    def __init__(self, node: ast.ASTNode, env: obj.Environment, meter: Meter) -> None:
+        self.result: Optional[obj.Type] = None
+        self.exception: Optional[BaseException] = None
+        self._done = False
+        self._cancelled = False
+        # Each of the two threads waits on its own semaphore while the other runs
+        self._resume = threading.Semaphore(0)
+        self._paused = threading.Semaphore(0)
+        meter.pause = self._pause
+        self._thread = threading.Thread(target=self._run, args=(node, env, meter), daemon=True)
+        self._thread.start()
+
+    def run_slice(self) -> bool:
+        """Run the evaluation up to its next pause, and return whether it is done."""
+        self._resume.release()
+        self._paused.acquire()
+        return self._done
+
+    def cancel(self) -> None:
+        self._cancelled = True
+        self._resume.release()
+
+    def _run(self, node: ast.ASTNode, env: obj.Environment, meter: Meter) -> None:
+        self._resume.acquire()
+        try:
+            if not self._cancelled:
+                self.result = _evaluate_metered(node, env, meter)
+        except _Cancelled:
+            pass
+        except BaseException as exception:
+            self.exception = exception
+        finally:
+            self._done = True
+            self._paused.release()
+
+    def _pause(self) -> None:
+        self._paused.release()
+        self._resume.acquire()
+        if self._cancelled:
+            raise _Cancelled()
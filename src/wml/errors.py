@@ -4,7 +4,13 @@ from wml.object import Type, TypeName
 
 
 class Error(Type, ABC):
-    """Base class for exceptions in this module."""
+    """Base class for exceptions in this module.
+
+    Runtime errors only store their structured fields; the message is formatted
+    on demand, so building an error that is never shown stays cheap.
+    """
+
+    __slots__ = ()
 
     @abstractmethod
     def __init__(self) -> None:
@@ -59,188 +65,280 @@ class SyntaxError(Error):
         return f"SyntaxError: {self.message} at line {self.line}, column {self.column}"
 
 
-class TypeMismatch(Error):  # TODO: Replace by TypeError
+class EvaluationError(Error, ABC):
+    """Base class for errors raised while evaluating a program.
+
+    Attributes:
+        line -- line number where the error occurred
+        column -- column number where the error occurred
+    """
+
+    __slots__ = ("line", "column")
+
+    @property
+    @abstractmethod
+    def message(self) -> str:
+        pass
+
+    def __str__(self) -> str:
+        return self.message
+
+
+class TypeMismatch(EvaluationError):  # TODO: Replace by TypeError
     """Exception raised for errors in the input.
 
     Attributes:
-        message -- explanation of the error
+        left -- type of the left operand
+        operator -- operator that was applied
+        right -- type of the right operand
         line -- line number where the error occurred
         column -- column number where the error occurred
     """
 
+    __slots__ = ("left", "operator", "right")
+
     def __init__(self, left: Type, operator: str, right: Type, line: int, column: int) -> None:
-        self.message = f"{self.type()}: {left} {operator} {right} on line {line}, column {column}"
+        self.left = left
+        self.operator = operator
+        self.right = right
         self.line = line
         self.column = column
 
-    def __str__(self) -> str:
-        return self.message
+    @property
+    def message(self) -> str:
+        return f"{self.type()}: {self.left} {self.operator} {self.right} on line {self.line}, column {self.column}"
 
 
-class UnknownPrefixOperator(Error):  # TODO: Replace by TypeError
+class UnknownPrefixOperator(EvaluationError):  # TODO: Replace by TypeError
     """Exception raised for errors in the input.
 
     Attributes:
-        message -- explanation of the error
+        operator -- operator that was applied
+        right -- type of the operand
         line -- line number where the error occurred
         column -- column number where the error occurred
     """
 
+    __slots__ = ("operator", "right")
+
     def __init__(self, operator: str, right: Type, line: int, column: int) -> None:
-        self.message = f"{self.type()}: {operator}{right} on line {line}, column {column}"
+        self.operator = operator
+        self.right = right
         self.line = line
         self.column = column
         super().__init__()
 
-    def __str__(self) -> str:
-        return self.message
+    @property
+    def message(self) -> str:
+        return f"{self.type()}: {self.operator}{self.right} on line {self.line}, column {self.column}"
 
 
-class UnknownInfixOperator(Error):  # TODO: Replace by TypeError
+class UnknownInfixOperator(EvaluationError):  # TODO: Replace by TypeError
     """Exception raised for errors in the input.
 
     Attributes:
-        message -- explanation of the error
+        left -- type of the left operand
+        operator -- operator that was applied
+        right -- type of the right operand
         line -- line number where the error occurred
         column -- column number where the error occurred
     """
 
+    __slots__ = ("left", "operator", "right")
+
     def __init__(self, left: Type, operator: str, right: Type, line: int, column: int) -> None:
-        self.message = f"{self.type()}: {left} {operator} {right} on line {line}, column {column}"
+        self.left = left
+        self.operator = operator
+        self.right = right
         self.line = line
         self.column = column
         super().__init__()
 
-    def __str__(self) -> str:
-        return self.message
+    @property
+    def message(self) -> str:
+        return f"{self.type()}: {self.left} {self.operator} {self.right} on line {self.line}, column {self.column}"
 
 
-class _TypeError(Error):
+class _TypeError(EvaluationError):
     """Exception raised for errors in the input.
 
     Attributes:
-        message -- explanation of the error
+        identifier -- name that could not be resolved
         line -- line number where the error occurred
         column -- column number where the error occurred
     """
 
+    __slots__ = ("identifier",)
+
     def __init__(self, identifier: str, line: int, column: int) -> None:
-        self.message = f"{self.type()}: {identifier}, line {line}, column {column}"
+        self.identifier = identifier
         self.line = line
         self.column = column
         super().__init__()
 
-    def __str__(self) -> str:
-        return self.message
+    @property
+    def message(self) -> str:
+        return f"{self.type()}: {self.identifier}, line {self.line}, column {self.column}"
 
 
-class InvalidNumberOfArguments(Error):  # TODO: Replace by TypeError
+class InvalidNumberOfArguments(EvaluationError):  # TODO: Replace by TypeError
     """Exception raised for errors in the input.
 
     Attributes:
-        message -- explanation of the error
+        expected -- number of arguments expected
+        actual -- number of arguments received
         line -- line number where the error occurred
         column -- column number where the error occurred
     """
 
+    __slots__ = ("expected", "actual")
+
     def __init__(self, expected: int, actual: int, line: int, column: int) -> None:
-        self.message = f"{self.type()}: Expected {expected}, got {actual}"
+        self.expected = expected
+        self.actual = actual
         self.line = line
         self.column = column
         super().__init__()
 
-    def __str__(self) -> str:
-        return self.message
+    @property
+    def message(self) -> str:
+        return f"{self.type()}: Expected {self.expected}, got {self.actual}"
 
 
-class UnsupportedArgumentType(Error):  # TODO: Replace by TypeError
+class UnsupportedArgumentType(EvaluationError):  # TODO: Replace by TypeError
     """Exception raised for errors in the input.
 
     Attributes:
-        message -- explanation of the error
+        expected -- type expected
+        actual -- type received
         line -- line number where the error occurred
         column -- column number where the error occurred
     """
 
+    __slots__ = ("expected", "actual")
+
     def __init__(self, expected: TypeName, actual: Type, line: int, column: int) -> None:
-        self.message = f"{self.type()}: Expected {expected}, got {actual}"
+        self.expected = expected
+        self.actual = actual
         self.line = line
         self.column = column
         super().__init__()
 
-    def __str__(self) -> str:
-        return self.message
+    @property
+    def message(self) -> str:
+        return f"{self.type()}: Expected {self.expected}, got {self.actual}"
 
 
-class InvalidTypeAssignment(Error):  # TODO: Replace by TypeError
+class InvalidTypeAssignment(EvaluationError):  # TODO: Replace by TypeError
     """Exception raised for errors in the input.
 
     Attributes:
-        message -- explanation of the error
+        expected -- type declared
+        actual -- type of the assigned value
         line -- line number where the error occurred
         column -- column number where the error occurred
     """
 
+    __slots__ = ("expected", "actual")
+
     def __init__(self, expected: Type, actual: Type, line: int, column: int) -> None:
-        self.message = f"{self.type()}: {expected} != {actual} on line {line}, column {column}"
+        self.expected = expected
+        self.actual = actual
         self.line = line
         self.column = column
         super().__init__()
 
-    def __str__(self) -> str:
-        return self.message
+    @property
+    def message(self) -> str:
+        return f"{self.type()}: {self.expected} != {self.actual} on line {self.line}, column {self.column}"
+
 
+class ConstantReassignmentError(EvaluationError):  # TODO: Replace by TypeError
 
-class ConstantReassignmentError(Error):  # TODO: Replace by TypeError
+    __slots__ = ("identifier",)
 
     def __init__(self, identifier: str, line: int, column: int) -> None:
-        self.message = f"{self.type()}: {identifier} on line {line}, column {column}"
+        self.identifier = identifier
         self.line = line
         self.column = column
         super().__init__()
 
-    def __str__(self) -> str:
-        return self.message
+    @property
+    def message(self) -> str:
+        return f"{self.type()}: {self.identifier} on line {self.line}, column {self.column}"
 
 
-class ModelReassignmentError(Error):  # TODO: Replace by TypeError
+class ModelReassignmentError(EvaluationError):  # TODO: Replace by TypeError
 
-        def __init__(self, identifier: str, line: int, column: int) -> None:
-            self.message = f"{self.type()}: {identifier} on line {line}, column {column}"
-            self.line = line
-            self.column = column
-            super().__init__()
+    __slots__ = ("identifier",)
 
-        def __str__(self) -> str:
-            return self.message
+    def __init__(self, identifier: str, line: int, column: int) -> None:
+        self.identifier = identifier
+        self.line = line
+        self.column = column
+        super().__init__()
+
+    @property
+    def message(self) -> str:
+        return f"{self.type()}: {self.identifier} on line {self.line}, column {self.column}"
 
 
-class _ValueError(Error):
+class _ValueError(EvaluationError):
     """Exception raised for errors in the input.
 
     Attributes:
-        message -- explanation of the error
+        identifier -- offending value
         line -- line number where the error occurred
         column -- column number where the error occurred
     """
 
+    __slots__ = ("identifier",)
+
     def __init__(self, identifier: str, line: int, column: int) -> None:
-        self.message = f"{self.type()}: {identifier}, line {line}, column {column}"
+        self.identifier = identifier
         self.line = line
         self.column = column
         super().__init__()
 
-    def __str__(self) -> str:
-        return self.message
+    @property
+    def message(self) -> str:
+        return f"{self.type()}: {self.identifier}, line {self.line}, column {self.column}"
+
 
+class NotAnActionError(EvaluationError):
 
-class NotAnActionError(Error):
+    __slots__ = ("identifier",)
 
     def __init__(self, identifier: str, line: int, column: int) -> None:
-        self.message = f"{self.type()}: {identifier}, line {line}, column {column}"
+        self.identifier = identifier
         self.line = line
         self.column = column
         super().__init__()
 
-    def __str__(self) -> str:
-        return self.message
+    @property
+    def message(self) -> str:
+        return f"{self.type()}: {self.identifier}, line {self.line}, column {self.column}"
+
+
+class BudgetExceeded(EvaluationError):
+    """Exception raised when an evaluation goes over its budget, see `wml.budget`.
+
+    Attributes:
+        limit -- name of the limit that was reached
+        value -- value of that limit
+        line -- line number where the error occurred
+        column -- column number where the error occurred
+    """
+
+    __slots__ = ("limit", "value")
+
+    def __init__(self, limit: str, value: object, line: int, column: int) -> None:
+        self.limit = limit
+        self.value = value
+        self.line = line
+        self.column = column
+        super().__init__()
+
+    @property
+    def message(self) -> str:
+        return f"{self.type()}: {self.limit} limit of {self.value} reached on line {self.line}, column {self.column}"
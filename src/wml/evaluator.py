@@ -1,7 +1,11 @@
-from typing import cast, Optional, Type, Union
+import threading
+import weakref
+from typing import Callable, cast, Optional, Type
 
 from wml import ast as ast
 from wml import object as obj
+from wml.analysis import captured_names
+from wml.budget import Budget, Meter
 from wml.builtings import BUILTINS
 from wml.errors import (
     UnknownPrefixOperator,
@@ -13,15 +17,103 @@ from wml.errors import (
     ConstantReassignmentError,
     ModelReassignmentError,
     NotAnActionError,
+    InvalidNumberOfArguments,
 )
+from wml.memo import MISSING
 from wml.token import Token, TokenType
 
-TRUE = obj.Boolean(True)
-FALSE = obj.Boolean(False)
-NULL = obj.Null()
+# Operations on operands of a known type, which need no checks, see `wml.inference`
+_INTEGER_OPERATIONS: dict[str, Callable[[obj.Integer, obj.Integer], obj.Type]] = {
+    "+": lambda left, right: obj.Integer(left.value + right.value, right.token),
+    "-": lambda left, right: obj.Integer(left.value - right.value, right.token),
+    "*": lambda left, right: _multiply_integers(left, right),
+    "==": lambda left, right: _to_boolean_object(left.value == right.value, right.token),
+    "!=": lambda left, right: _to_boolean_object(left.value != right.value, right.token),
+    "<": lambda left, right: _to_boolean_object(left.value < right.value, right.token),
+    ">": lambda left, right: _to_boolean_object(left.value > right.value, right.token),
+    "<=": lambda left, right: _to_boolean_object(left.value <= right.value, right.token),
+    ">=": lambda left, right: _to_boolean_object(left.value >= right.value, right.token),
+}
+_FLOAT_OPERATIONS: dict[str, Callable[[obj.Float, obj.Float], obj.Type]] = {
+    "+": lambda left, right: obj.Float(left.value + right.value, right.token),
+    "-": lambda left, right: obj.Float(left.value - right.value, right.token),
+    "*": lambda left, right: obj.Float(left.value * right.value, right.token),
+    "/": lambda left, right: obj.Float(left.value / right.value, right.token),
+    "==": lambda left, right: _to_boolean_object(left.value == right.value, right.token),
+    "!=": lambda left, right: _to_boolean_object(left.value != right.value, right.token),
+    "<": lambda left, right: _to_boolean_object(left.value < right.value, right.token),
+    ">": lambda left, right: _to_boolean_object(left.value > right.value, right.token),
+    "<=": lambda left, right: _to_boolean_object(left.value <= right.value, right.token),
+    ">=": lambda left, right: _to_boolean_object(left.value >= right.value, right.token),
+}
+_TYPED_OPERATIONS = {
+    TokenType.INT_TYPE: _INTEGER_OPERATIONS,
+    TokenType.FLOAT_TYPE: _FLOAT_OPERATIONS,
+}
+
+# The meter of the evaluation running in each thread, if it has a budget. Only
+# looked up while `_metered` evaluations are running, in any thread, so that
+# evaluations without a budget pay for nothing but that check.
+class _Meters(threading.local):
+    meter: Optional[Meter] = None
+
+
+_meters = _Meters()
+_metered = 0
+_metered_lock = threading.Lock()
+
+
+class _ReturnSignal(Exception):
+    """Unwinds the evaluation up to the enclosing action call or program."""
+
+    def __init__(self, value: obj.Type, token: Token) -> None:
+        self.value = value
+        self.token = token
+
+
+class _ErrorSignal(Exception):
+    """Unwinds the evaluation up to `evaluate`, which hands the error back as a value."""
+
+    def __init__(self, error: Error) -> None:
+        self.error = error
+
+
+def evaluate(node: ast.ASTNode, env: obj.Environment, budget: Optional[Budget] = None) -> Optional[obj.Type]:
+    """Evaluate `node` in `env` and return its value, or the error that stopped it.
+
+    An evaluation going over its `budget` stops with a `BudgetExceeded` error. An
+    evaluation without a budget started by another one shares its budget.
+    """
+    if budget is not None:
+        return _evaluate_metered(node, env, Meter(budget))
+
+    try:
+        return _evaluate(node, env)
+    except _ReturnSignal as signal:
+        return obj.Return(signal.value, signal.token)
+    except _ErrorSignal as signal:
+        return signal.error
 
 
-def evaluate(node: ast.ASTNode, env: obj.Environment) -> Optional[obj.Type]:
+def _evaluate_metered(node: ast.ASTNode, env: obj.Environment, meter: Meter) -> Optional[obj.Type]:
+    global _metered
+
+    outer = _meters.meter
+    _meters.meter = meter
+    with _metered_lock:
+        _metered += 1
+    try:
+        return evaluate(node, env)
+    except RecursionError:
+        # A runaway recursion can run out of Python stack before any limit is reached
+        return meter.exhausted()
+    finally:
+        _meters.meter = outer
+        with _metered_lock:
+            _metered -= 1
+
+
+def _evaluate(node: ast.ASTNode, env: obj.Environment) -> Optional[obj.Type]:
     node_type: Type = type(node)
 
     match node_type:
@@ -30,7 +122,12 @@ def evaluate(node: ast.ASTNode, env: obj.Environment) -> Optional[obj.Type]:
             node = cast(ast.Action, node)
 
             assert node.body is not None
-            return obj.Action(node.parameters, node.body, env, node.token)
+            if not node.captures_analyzed:
+                _analyze_captures(node)
+            # Actions created inside another one only keep the names they need
+            if node.captures is not None:
+                env = env.capture(node.captures)
+            return obj.Action(node.parameters, node.body, env, node.token, node.specialized)
 
         case ast.Block:
             node = cast(ast.Block, node)
@@ -46,12 +143,12 @@ def evaluate(node: ast.ASTNode, env: obj.Environment) -> Optional[obj.Type]:
         case ast.Call:
             node = cast(ast.Call, node)
 
-            action = evaluate(node.action, env)
+            action = _resolve_action(node, env)
 
             assert action is not None
             action = cast(obj.Action, action)
 
-            if not isinstance(action, obj.BuiltIn):
+            if type(action) == obj.Action:
                 assert action.parameters is not None
             args = _evaluate_expression(node.arguments, env)
 
@@ -67,7 +164,7 @@ def evaluate(node: ast.ASTNode, env: obj.Environment) -> Optional[obj.Type]:
             node = cast(ast.ExpressionStatement, node)
 
             assert node.expression is not None
-            return evaluate(node.expression, env)
+            return _evaluate(node.expression, env)
 
         case ast.Float:
             node = cast(ast.Float, node)
@@ -88,10 +185,12 @@ def evaluate(node: ast.ASTNode, env: obj.Environment) -> Optional[obj.Type]:
             node = cast(ast.Infix, node)
 
             assert node.left is not None and node.right is not None
-            left = evaluate(node.left, env)
-            right = evaluate(node.right, env)
+            left = _evaluate(node.left, env)
+            right = _evaluate(node.right, env)
 
             assert left is not None and right is not None
+            if node.operand_type is not None:
+                return _TYPED_OPERATIONS[node.operand_type][node.operator](left, right)
             res = _evaluate_infix_expression(node.operator, left, right)
             return res
 
@@ -104,7 +203,7 @@ def evaluate(node: ast.ASTNode, env: obj.Environment) -> Optional[obj.Type]:
             node = cast(ast.Prefix, node)
 
             assert node.right is not None
-            right = evaluate(node.right, env)
+            right = _evaluate(node.right, env)
 
             assert right is not None
             return _evaluate_prefix_expression(node.operator, right)
@@ -117,26 +216,37 @@ def evaluate(node: ast.ASTNode, env: obj.Environment) -> Optional[obj.Type]:
             node = cast(ast.ReturnStatement, node)
 
             assert node.value is not None
-            value = evaluate(node.value, env)
+            value = _evaluate(node.value, env)
 
             assert value is not None
-            return obj.Return(value, node.token)
+            raise _ReturnSignal(value, node.token)
 
         case ast.SetStatement:
             node = cast(ast.SetStatement, node)
 
             assert node.value is not None
-            value = evaluate(node.value, env)
+            value = _evaluate(node.value, env)
 
             assert node.name is not None
             assert value is not None
-            _set_environment_value(env, node.name.value, node.token, value)
+            if node.value_type is not None:
+                env[node.name.value] = value
+            else:
+                _set_environment_value(env, node.name.value, node.token, value)
 
         case ast.StringLiteral:
             node = cast(ast.StringLiteral, node)
 
             return obj.String(node.value, node.token)
 
+        case ast.Temporary:
+            node = cast(ast.Temporary, node)
+
+            assert node.value is not None
+            value = _evaluate(node.value, env)
+            env[node.name] = value
+            return value
+
         case ast.Variable:
             node = cast(ast.Variable, node)
 
@@ -147,46 +257,118 @@ def evaluate(node: ast.ASTNode, env: obj.Environment) -> Optional[obj.Type]:
 
 
 def _do_action(action: obj.Action, args: list[obj.Type]) -> obj.Type:
-    if type(action) == obj.Action:
-        action = cast(obj.Action, action)
+    meter = _meters.meter if _metered else None
+    if meter is not None:
+        error = meter.enter(action)
+        if error is not None:
+            meter.leave()
+            raise _ErrorSignal(error)
 
-        extended_env = _extend_action_environment(action, args)
-        evaluated = evaluate(action.body, extended_env)
+    try:
+        if type(action) == obj.Action:
+            action = cast(obj.Action, action)
 
-        assert evaluated is not None
-        return _unwrap_return_value(evaluated)
+            memo = action.memo
+            key = None if memo is None else memo.key(args)
+            if key is not None:
+                result = memo.get(key)
+                if result is not MISSING:
+                    return result
+
+            body = action.body
+            if action.specialized is not None and all(
+                    guard is None or type(arg) == guard for guard, arg in zip(action.guards, args)
+            ):
+                body = action.specialized
+
+            extended_env = _extend_action_environment(action, args)
+            try:
+                result = _evaluate(body, extended_env)
+            except _ReturnSignal as signal:
+                result = signal.value
+
+            # Failed calls raise, so only results are ever kept
+            if key is not None:
+                memo.put(key, result)
+            return result
 
-    elif type(action) == obj.BuiltIn:
-        action = cast(obj.BuiltIn, action)
+        elif type(action) == obj.BuiltIn:
+            action = cast(obj.BuiltIn, action)
 
-        return action.function(*args)
+            result = action.function(*args)
+            if isinstance(result, Error):
+                raise _ErrorSignal(result)
+            return result
 
-    return NotAnActionError(action.type().name, action.token.line, action.token.column - len(action.token.literal))
+        raise _ErrorSignal(NotAnActionError(
+            str(action.type()), action.token.line, action.token.column - len(action.token.literal)
+        ))
+    except RecursionError:
+        # Only noted by the deepest call, with no function calls, as the stack is full
+        if meter is not None and meter.overflow is None:
+            meter.overflow = (meter.depth, action.token)
+        raise
+    finally:
+        if meter is not None:
+            meter.leave()
+
+
+def _analyze_captures(node: ast.Action) -> None:
+    # Tells the actions created in the scope of `node` what they need from it
+    for body in (node.body, node.specialized):
+        if body is not None:
+            for inner, names in captured_names(ast.Action(node.token, node.parameters, body)).items():
+                inner.captures = names
+    node.captures_analyzed = True
+
+
+def _resolve_action(node: ast.Call, env: obj.Environment) -> obj.Type:
+    callee = node.action
+    if type(callee) != ast.Variable and type(callee) != ast.Identifier:
+        return _evaluate(callee, env)
+
+    # Names bound in the scope itself are found right away, and the epoch tells
+    # whether anything else may have been bound since the last resolution
+    local = callee.value in env
+    cache = node.cache
+    if not local and cache is not None and cache[0]() is env.outer and cache[1] == obj.Environment.epoch:
+        action = cache[2]()
+        if action is not None:
+            return action
+
+    epoch = obj.Environment.epoch
+    action = _evaluate(callee, env)
+    # Held weakly, as the node outlives its callers when the program is kept to be
+    # run again. Top-level scopes, whose outer scope is a plain dict, are not cached.
+    if not local and type(env.outer) == obj.Environment and type(action) in (obj.Action, obj.BuiltIn):
+        node.cache = (weakref.ref(env.outer), epoch, weakref.ref(action))
+    return action
 
 
 def _evaluate_block_statement(block: ast.Block, env: obj.Environment) -> Optional[obj.Type]:
     result: Optional[obj.Type] = None
     for statement in block.statements:
-        result = evaluate(statement, env)
-
-        if result is not None and (type(result) == obj.Return or isinstance(result, Error)):
-            return result
+        result = _evaluate(statement, env)
 
     return result
 
 
 def _evaluate_constant(node: ast.Constant, env: obj.Environment) -> obj.Type:
+    builtin = BUILTINS.get(node.value)
+    if builtin is not None:
+        return builtin
+
     try:
-        return BUILTINS.get(node.value, env[node.value])
+        return env[node.value]
     except KeyError:
-        return _TypeError(node.value, node.token.line, node.token.column - len(node.token.literal))
+        raise _ErrorSignal(_TypeError(node.value, node.token.line, node.token.column - len(node.token.literal)))
 
 
 def _evaluate_expression(expressions: list[ast.Expression], env: obj.Environment) -> list[obj.Type]:
     result: list[obj.Type] = []
 
     for expression in expressions:
-        evaluated = evaluate(expression, env)
+        evaluated = _evaluate(expression, env)
 
         assert evaluated is not None
         result.append(evaluated)
@@ -198,26 +380,24 @@ def _evaluate_identifier(node: ast.Identifier, env: obj.Environment) -> obj.Type
     try:
         return env[node.value]
     except KeyError:
-        return BUILTINS.get(
-            node.value,
-            _TypeError(node.value, node.token.line, node.token.column - len(node.token.literal))
-        )
+        builtin = BUILTINS.get(node.value)
+        if builtin is None:
+            raise _ErrorSignal(_TypeError(node.value, node.token.line, node.token.column - len(node.token.literal)))
+        return builtin
 
 
 def _evaluate_if_expression(node: ast.If, env: obj.Environment) -> Optional[obj.Type]:
     assert node.condition is not None
-    condition = evaluate(node.condition, env)
+    condition = _evaluate(node.condition, env)
 
     assert condition is not None
     if _is_truthy(condition):
         assert node.consequence is not None
-        return evaluate(node.consequence, env)
+        return _evaluate(node.consequence, env)
     elif node.alternative is not None:
-        return evaluate(node.alternative, env)
+        return _evaluate(node.alternative, env)
 
-    null = NULL
-    null.token = node.token
-    return null
+    return obj.Null(node.token)
 
 
 def _evaluate_float_infix_expression(operator: str, left: obj.Float, right: obj.Float) -> obj.Type:
@@ -248,9 +428,7 @@ def _evaluate_float_infix_expression(operator: str, left: obj.Float, right: obj.
     if operator == "!=":
         return _to_boolean_object(left_value != right_value, right.token)
 
-    null = NULL
-    null.token = right.token
-    return null
+    return obj.Null(right.token)
 
 
 def _evaluate_infix_expression(operator: str, left: obj.Type, right: obj.Type) -> obj.Type:
@@ -279,9 +457,9 @@ def _evaluate_infix_expression(operator: str, left: obj.Type, right: obj.Type) -
         return _evaluate_string_infix_expression(operator, left, right)
 
     if operator == "==":
-        return _to_boolean_object(left == right, right.token)  # noqa
+        return _to_boolean_object(_equals(left, right), right.token)  # noqa
     if operator == "!=":
-        return _to_boolean_object(left != right, right.token)  # noqa
+        return _to_boolean_object(not _equals(left, right), right.token)  # noqa
     # TODO: Implement logical operators
     # if operator == "&&":
     #     return _to_boolean_object(_is_truthy(left) and _is_truthy(right))
@@ -289,11 +467,21 @@ def _evaluate_infix_expression(operator: str, left: obj.Type, right: obj.Type) -
     #     return _to_boolean_object(_is_truthy(left) or _is_truthy(right))
 
     if left.type() != right.type():
-        return TypeMismatch(left.type(), operator, right.type(), right.token.line,  # noqa
-                            right.token.column - len(right.token.literal) - 3)  # noqa
+        raise _ErrorSignal(TypeMismatch(left.type(), operator, right.type(), right.token.line,  # noqa
+                                        right.token.column - len(right.token.literal) - 3))  # noqa
+
+    raise _ErrorSignal(UnknownInfixOperator(left.type(), operator, right.type(), right.token.line,  # noqa
+                                            right.token.column - len(right.token.literal) - 3))  # noqa
 
-    return UnknownInfixOperator(left.type(), operator, right.type(), right.token.line, # noqa
-                                right.token.column - len(right.token.literal) - 3)  # noqa
+
+def _equals(left: obj.Type, right: obj.Type) -> bool:
+    # Booleans and nulls are new objects every time, so they are compared by value.
+    # Anything else is only equal to itself.
+    if type(left) == type(right) == obj.Boolean:
+        return left.value == right.value
+    if type(left) == type(right) == obj.Null:
+        return True
+    return left is right
 
 
 def _evaluate_integer_infix_expression(operator: str, left: obj.Integer, right: obj.Integer) -> obj.Type:
@@ -305,9 +493,14 @@ def _evaluate_integer_infix_expression(operator: str, left: obj.Integer, right:
     if operator == "-":
         return obj.Integer(left_value - right_value, right.token)
     if operator == "*":
-        return obj.Integer(left_value * right_value, right.token)
+        return _multiply_integers(left, right)
     if operator == "**":
-        return obj.Integer(left_value ** right_value, right.token)
+        if _metered:
+            _check_power(left_value, right_value, right.token)
+        value = left_value ** right_value
+        if _metered and type(value) == int:
+            _check_integer(value, right.token)
+        return obj.Integer(value, right.token)
     if operator == "/":
         return obj.Float(left_value / right_value, right.token)
     if operator == "//":
@@ -327,8 +520,32 @@ def _evaluate_integer_infix_expression(operator: str, left: obj.Integer, right:
     if operator == ">=":
         return _to_boolean_object(left_value >= right_value, right.token)
 
-    return UnknownInfixOperator(left.type(), operator, right.type(), right.token.line,  # noqa
-                                right.token.column - len(right.token.literal) - 1)  # noqa
+    raise _ErrorSignal(UnknownInfixOperator(left.type(), operator, right.type(), right.token.line,  # noqa
+                                            right.token.column - len(right.token.literal) - 1))  # noqa
+
+
+def _multiply_integers(left: obj.Integer, right: obj.Integer) -> obj.Integer:
+    value = left.value * right.value
+    if _metered:
+        # Checked once computed: the operands are within the budget, so the product is at most twice as large
+        _check_integer(value, right.token)
+    return obj.Integer(value, right.token)
+
+
+def _check_integer(value: int, token: Token) -> None:
+    meter = _meters.meter
+    if meter is not None:
+        error = meter.check_integer(value, token)
+        if error is not None:
+            raise _ErrorSignal(error)
+
+
+def _check_power(base: int, exponent: int, token: Token) -> None:
+    meter = _meters.meter
+    if meter is not None:
+        error = meter.check_power(base, exponent, token)
+        if error is not None:
+            raise _ErrorSignal(error)
 
 
 def _evaluate_minus_prefix_operator_expression(right: obj.Type) -> obj.Type:
@@ -340,33 +557,28 @@ def _evaluate_minus_prefix_operator_expression(right: obj.Type) -> obj.Type:
         right = cast(obj.Float, right)
         return obj.Float(-right.value, right.token)
 
-    return UnknownPrefixOperator("-", right.type(), right.token.line,  # noqa
-                                 right.token.column - len(right.token.literal) - 1)  # noqa
+    raise _ErrorSignal(UnknownPrefixOperator("-", right.type(), right.token.line,  # noqa
+                                             right.token.column - len(right.token.literal) - 1))  # noqa
 
 
 def _evaluate_prefix_expression(operator: str, right: obj.Type) -> obj.Type:
     if operator == "!":
-        return FALSE if _is_truthy(right) else TRUE
+        return obj.Boolean(not _is_truthy(right), right.token)
     elif operator == "-":
         return _evaluate_minus_prefix_operator_expression(right)
     else:
         # TODO: Add unit tests
-        return UnknownPrefixOperator(operator, right.type(), right.token.line,  # noqa
-                                     right.token.column - len(right.token.literal) - 1)  # noqa
+        raise _ErrorSignal(UnknownPrefixOperator(operator, right.type(), right.token.line,  # noqa
+                                                 right.token.column - len(right.token.literal) - 1))  # noqa
 
 
 def _evaluate_program(program: ast.Program, env: obj.Environment) -> Optional[obj.Type]:
     result: Optional[obj.Type] = None
-    for statement in program.statements:
-        result = evaluate(statement, env)
-
-        if type(result) == obj.Return:
-            result = cast(obj.Return, result)
-            assert result is not None
-            return result.value  # noqa
-
-        if isinstance(result, Error):
-            return result
+    try:
+        for statement in program.statements:
+            result = _evaluate(statement, env)
+    except _ReturnSignal as signal:
+        return signal.value
 
     return result
 
@@ -375,48 +587,47 @@ def _evaluate_variable(node: ast.Variable, env: obj.Environment) -> obj.Type:
     # if node.typing.token_type is not TokenType.ANY_TYPE or node.typing.token_type
     try:
         return env[node.value]
-    except KeyError:  # FIXME: This is not being returned to the user, is returning to be processed by the evaluator
-        return BUILTINS.get(
-            node.value,
-            _TypeError(node.value, node.token.line, node.token.column - len(node.token.literal))
-        )
+    except KeyError:
+        builtin = BUILTINS.get(node.value)
+        if builtin is None:
+            raise _ErrorSignal(_TypeError(node.value, node.token.line, node.token.column - len(node.token.literal)))
+        return builtin
 
 
 def _evaluate_string_infix_expression(operator: str, left: obj.String, right: obj.String) -> obj.Type:
 
-    left_value = _standardize_string(left.value, True)
-    right_value = _standardize_string(right.value, True)
-
     if operator == "+":
-        new_content = left_value["value"][1:-1] + right_value["value"][1:-1]
-        new_wrapper = "'" if (left_value["has_double_quotes"] or right_value["has_double_quotes"]) and not (left_value["has_simple_quotes"] or right_value["has_simple_quotes"]) else '"'
-        new_content = f"{new_wrapper}{new_content}{new_wrapper}"
-        return obj.String(new_content, right.token)
+        return left.concat(right, right.token)
     if operator == "==":
-        return _to_boolean_object(left_value == right_value, right.token)
+        return _to_boolean_object(left.length == right.length and left.value == right.value, right.token)
     if operator == "!=":
-        return _to_boolean_object(left_value != right_value, right.token)
+        return _to_boolean_object(left.length != right.length or left.value != right.value, right.token)
 
-    return UnknownInfixOperator(left.type(), operator, right.type(), right.token.line,  # noqa
-                                right.token.column - len(right.token.literal) - 3)  # noqa
+    raise _ErrorSignal(UnknownInfixOperator(left.type(), operator, right.type(), right.token.line,  # noqa
+                                            right.token.column - len(right.token.literal) - 3))  # noqa
 
 
 def _extend_action_environment(action: obj.Action, args: list[obj.Type]) -> obj.Environment:
+    # A missing parameter would otherwise be looked up in the enclosing scopes
+    if len(args) != len(action.parameters):
+        raise _ErrorSignal(InvalidNumberOfArguments(
+            len(action.parameters), len(args), action.token.line, action.token.column - len(action.token.literal)
+        ))
+
     env = obj.Environment(action.env)
 
-    for idx, param in enumerate(action.parameters):
-        env[param.value] = args[idx - 1]
+    for param, arg in zip(action.parameters, args):
+        env[param.value] = arg
 
     return env
 
 
 def _is_truthy(evaluated: obj.Type) -> bool:
-    if evaluated is NULL:
-        return False
-    if evaluated is TRUE:
-        return True
-    if evaluated is FALSE:
+    # Compared by type, as values may come from another process, see `wml.parallel`
+    if type(evaluated) == obj.Null:
         return False
+    if type(evaluated) == obj.Boolean:
+        return evaluated.value
     if type(evaluated) == obj.Integer:
         evaluated = cast(obj.Integer, evaluated)
         return evaluated.value != 0
@@ -430,9 +641,9 @@ def _is_truthy(evaluated: obj.Type) -> bool:
 
 
 def _to_boolean_object(value: bool, token: Token) -> obj.Boolean:
-    value = TRUE if value else FALSE
-    value.token = token
-    return value
+    # A new object every time: a shared one would have its token changed under the
+    # feet of any other evaluation using it, in this thread or another
+    return obj.Boolean(value, token)
 
 
 def _set_environment_value(env: obj.Environment, key_str: str, key_token: Token, value: obj.Type):
@@ -475,33 +686,3 @@ def _validate_set_statement_types(key_type, value_type):
         return True
 
     return False
-
-
-def _standardize_string(value: str, additional_info: bool = False) -> str | dict[str, Union[bool, str]]:
-    value_wrapper = value[0]
-    value_content = _unescape_string(value[1:-1], value_wrapper)
-    value_has_simple_quotes = value_content.find("'") != -1
-    value_has_double_quotes = value_content.find('"') != -1
-
-    new_wrapper = "'" if value_has_double_quotes and not value_has_simple_quotes else '"'
-    mew_value = f"{new_wrapper}{value_content}{new_wrapper}"
-
-    if not additional_info:
-        return mew_value
-    return {
-        "value": mew_value,
-        "has_simple_quotes": value_has_simple_quotes,
-        "has_double_quotes": value_has_double_quotes,
-    }
-
-
-def _unescape_string(value: str, wrapper: str) -> str:
-    return value.replace(f"\\{wrapper}", wrapper)
-
-
-def _unwrap_return_value(evaluated: obj.Type) -> obj.Type:
-    if type(evaluated) == obj.Return:
-        evaluated = cast(obj.Return, evaluated)
-        return evaluated.value
-
-    return evaluated
@@ -0,0 +1,86 @@
+import gc
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Iterable, Iterator, Optional
+
+from wml import object as obj
+from wml.analysis import scope_assigned_names
+from wml.compiler import compile, parse
+from wml.errors import Error
+from wml.evaluator import evaluate
+from wml.interpreters import decode, encode, Encoded
+from wml.optimizer import optimize
+
+# The environment of the library, in a worker
+_LIBRARY: Optional[obj.Environment] = None
+
+
+class ForkServer:
+    """Workers forked from a process that already evaluated a library of shared definitions.
+
+    The library is parsed, optimized and evaluated once, in this process, and the
+    workers are forked once this is done. They share the pages of its objects with
+    this process, copy-on-write, and have no imports or parsing to do before their
+    first job. Each worker freezes what it inherited with `gc.freeze` as it starts,
+    so its collector never visits those objects, and never writes to their pages.
+    This process is left as it was, whatever it does with its own collector.
+
+    Each job is a script evaluated in its own fork of the environment of the library,
+    so it sees the definitions of the library but not the bindings of other jobs.
+    Results come back encoded as in `wml.interpreters`.
+
+    Forking is only available on POSIX systems.
+    """
+
+    def __init__(self, library: str, workers: Optional[int] = None, optimized: bool = True) -> None:
+        program = parse(library)
+        if optimized:
+            # Whatever the library binds may be read by the jobs
+            program = optimize(program, keep=scope_assigned_names(program.statements))
+
+        # Forks of a persistent environment are O(1), whatever the size of the library
+        self.env = obj.Environment(persistent=True)
+        result = evaluate(program, self.env)
+        if isinstance(result, Error):
+            raise ValueError(str(result))
+
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(
+            self.workers, mp_context=get_context("fork"), initializer=_preload, initargs=(self.env,),
+        )
+        # All the workers are forked on the first submission
+        self._executor.submit(os.getpid).result()
+
+    def submit(self, script: str) -> "Future[Optional[Encoded]]":
+        return self._executor.submit(_run_job, script)
+
+    def run(self, script: str) -> Optional[obj.Type]:
+        """Evaluate `script` in a worker and return its value."""
+        return decode(self.submit(script).result())
+
+    def map(self, scripts: Iterable[str]) -> Iterator[Optional[obj.Type]]:
+        """Evaluate each of `scripts` in the workers and yield their values in order."""
+        return (decode(encoded) for encoded in self._executor.map(_run_job, scripts))
+
+    def close(self) -> None:
+        self._executor.shutdown()
+
+    def __enter__(self) -> "ForkServer":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def _preload(env: obj.Environment) -> None:
+    # Runs in each worker right after the fork, which hands `env` over without pickling it
+    global _LIBRARY
+    _LIBRARY = env
+    gc.freeze()
+
+
+def _run_job(script: str) -> Optional[Encoded]:
+    assert _LIBRARY is not None
+    # Scripts sent again are not parsed again
+    return encode(evaluate(compile(script).program, _LIBRARY.fork()))
@@ -0,0 +1,263 @@
+from collections.abc import Iterator, MutableMapping
+from typing import Hashable, Optional, Union
+
+# Each level of the trie uses this many bits of the hash of a key
+BITS = 5
+MASK = (1 << BITS) - 1
+
+# Hashes are made non-negative, so their bits run out past this shift
+MAX_SHIFT = 64
+HASH_MASK = (1 << MAX_SHIFT) - 1
+
+_MISSING = object()
+
+Leaf = tuple[Hashable, object]
+
+
+class _Bitmap:
+    """A trie node holding up to 32 entries, one per 5-bit chunk of the hashes of the keys.
+
+    Only the entries present are stored, in the order of their chunk, and `bitmap`
+    tells which chunks they stand for. Each entry is either a (key, value) leaf or
+    a child node.
+    """
+
+    __slots__ = ("bitmap", "entries")
+
+    def __init__(self, bitmap: int, entries: tuple) -> None:
+        self.bitmap = bitmap
+        self.entries = entries
+
+
+class _Collision:
+    """The leaves of keys whose hashes are all the same."""
+
+    __slots__ = ("hash", "entries")
+
+    def __init__(self, hash_: int, entries: tuple[Leaf, ...]) -> None:
+        self.hash = hash_
+        self.entries = entries
+
+
+Node = Union[_Bitmap, _Collision]
+
+
+class HAMT:
+    """An immutable mapping backed by a hash array mapped trie.
+
+    Setting or deleting a key returns a new mapping that shares everything but the
+    path to that key with this one, in O(log32 n) time.
+    """
+
+    __slots__ = ("_root", "_size")
+
+    def __init__(self, root: Optional[Node] = None, size: int = 0) -> None:
+        self._root = root
+        self._size = size
+
+    def get(self, key: Hashable, default: object = None) -> object:
+        node = self._root
+        if node is None:
+            return default
+
+        key_hash = hash(key) & HASH_MASK
+        shift = 0
+        while True:
+            if type(node) is _Collision:
+                for leaf in node.entries:
+                    if leaf[0] == key:
+                        return leaf[1]
+                return default
+
+            bit = 1 << ((key_hash >> shift) & MASK)
+            if not node.bitmap & bit:
+                return default
+            entry = node.entries[(node.bitmap & (bit - 1)).bit_count()]
+            if type(entry) is tuple:
+                return entry[1] if entry[0] == key else default
+            node = entry
+            shift += BITS
+
+    def set(self, key: Hashable, value: object) -> "HAMT":
+        key_hash = hash(key) & HASH_MASK
+        if self._root is None:
+            return HAMT(_Bitmap(1 << (key_hash & MASK), ((key, value),)), 1)
+
+        root, added = _set(self._root, key, value, key_hash, 0)
+        if root is self._root:
+            return self
+        return HAMT(root, self._size + added)
+
+    def delete(self, key: Hashable) -> "HAMT":
+        if self._root is None:
+            return self
+
+        key_hash = hash(key) & HASH_MASK
+        root = _delete(self._root, key, key_hash, 0)
+        if root is self._root:
+            return self
+        if type(root) is tuple:
+            # A single leaf is left, put it back in a node
+            root = _Bitmap(1 << ((hash(root[0]) & HASH_MASK) & MASK), (root,))
+        return HAMT(root, self._size - 1)
+
+    def items(self) -> Iterator[Leaf]:
+        if self._root is None:
+            return
+
+        stack: list[Node] = [self._root]
+        while stack:
+            node = stack.pop()
+            for entry in node.entries:
+                if type(entry) is tuple:
+                    yield entry
+                else:
+                    stack.append(entry)
+
+    def __getitem__(self, key: Hashable) -> object:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return (key for key, _ in self.items())
+
+    def __len__(self) -> int:
+        return self._size
+
+
+def _set(node: Node, key: Hashable, value: object, key_hash: int, shift: int) -> tuple[Node, bool]:
+    # Returns the new node, and whether the key was added rather than replaced
+    if type(node) is _Collision:
+        if node.hash == key_hash:
+            for idx, leaf in enumerate(node.entries):
+                if leaf[0] == key:
+                    if leaf[1] is value:
+                        return node, False
+                    entries = node.entries[:idx] + ((key, value),) + node.entries[idx + 1:]
+                    return _Collision(key_hash, entries), False
+            return _Collision(key_hash, node.entries + ((key, value),)), True
+
+        # Another hash reaching this node: move the collision one level down
+        node = _Bitmap(1 << ((node.hash >> shift) & MASK), (node,))
+
+    bit = 1 << ((key_hash >> shift) & MASK)
+    idx = (node.bitmap & (bit - 1)).bit_count()
+
+    if not node.bitmap & bit:
+        entries = node.entries[:idx] + ((key, value),) + node.entries[idx:]
+        return _Bitmap(node.bitmap | bit, entries), True
+
+    entry = node.entries[idx]
+    if type(entry) is tuple:
+        if entry[0] == key:
+            if entry[1] is value:
+                return node, False
+            child, added = (key, value), False
+        else:
+            child, added = _merge(entry, (key, value), key_hash, shift + BITS), True
+    else:
+        child, added = _set(entry, key, value, key_hash, shift + BITS)
+        if child is entry:
+            return node, False
+
+    entries = node.entries[:idx] + (child,) + node.entries[idx + 1:]
+    return _Bitmap(node.bitmap, entries), added
+
+
+def _merge(leaf: Leaf, other: Leaf, other_hash: int, shift: int) -> Node:
+    # A node holding two leaves whose hashes agree up to `shift`
+    leaf_hash = hash(leaf[0]) & HASH_MASK
+    if leaf_hash == other_hash or shift >= MAX_SHIFT:
+        return _Collision(other_hash, (leaf, other))
+
+    chunk = (leaf_hash >> shift) & MASK
+    other_chunk = (other_hash >> shift) & MASK
+    if chunk == other_chunk:
+        return _Bitmap(1 << chunk, (_merge(leaf, other, other_hash, shift + BITS),))
+
+    entries = (leaf, other) if chunk < other_chunk else (other, leaf)
+    return _Bitmap((1 << chunk) | (1 << other_chunk), entries)
+
+
+def _delete(node: Node, key: Hashable, key_hash: int, shift: int) -> Union[Node, Leaf, None]:
+    # Returns the same node if the key is missing, None if nothing is left, or a
+    # leaf if it is all that is left and it can move up
+    if type(node) is _Collision:
+        entries = tuple(leaf for leaf in node.entries if leaf[0] != key)
+        if len(entries) == len(node.entries):
+            return node
+        return entries[0] if len(entries) == 1 else _Collision(node.hash, entries)
+
+    bit = 1 << ((key_hash >> shift) & MASK)
+    if not node.bitmap & bit:
+        return node
+    idx = (node.bitmap & (bit - 1)).bit_count()
+
+    entry = node.entries[idx]
+    if type(entry) is tuple:
+        if entry[0] != key:
+            return node
+        child = None
+    else:
+        child = _delete(entry, key, key_hash, shift + BITS)
+        if child is entry:
+            return node
+
+    if child is None:
+        entries = node.entries[:idx] + node.entries[idx + 1:]
+        if not entries:
+            return None
+        if len(entries) == 1 and type(entries[0]) is tuple:
+            return entries[0]
+        return _Bitmap(node.bitmap & ~bit, entries)
+
+    if type(child) is tuple and len(node.entries) == 1:
+        return child
+    return _Bitmap(node.bitmap, node.entries[:idx] + (child,) + node.entries[idx + 1:])
+
+
+class PersistentDict(MutableMapping):
+    """A mutable mapping over a `HAMT`, which can be forked in O(1).
+
+    A fork starts with the same bindings and shares them until either side changes
+    one, so changing it never copies the bindings it does not touch.
+    """
+
+    __slots__ = ("_map",)
+
+    def __init__(self, mapping: Optional[HAMT] = None) -> None:
+        self._map = HAMT() if mapping is None else mapping
+
+    def fork(self) -> "PersistentDict":
+        return PersistentDict(self._map)
+
+    def get(self, key: Hashable, default: object = None) -> object:
+        return self._map.get(key, default)
+
+    def __getitem__(self, key: Hashable) -> object:
+        return self._map[key]
+
+    def __setitem__(self, key: Hashable, value: object) -> None:
+        self._map = self._map.set(key, value)
+
+    def __delitem__(self, key: Hashable) -> None:
+        if key not in self._map:
+            raise KeyError(key)
+        self._map = self._map.delete(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._map
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._map)
+
+    def __len__(self) -> int:
+        return len(self._map)
+
+    def __repr__(self) -> str:
+        return repr(dict(self._map.items()))
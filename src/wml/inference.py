@@ -0,0 +1,181 @@
+from copy import deepcopy
+from typing import Optional
+
+from wml import ast
+from wml import object as obj
+from wml.analysis import children
+from wml.evaluator import _TYPED_OPERATIONS
+from wml.token import TokenType
+
+# What is known about each name in scope: the type of its value. Names whose type is
+# unknown are left out.
+Types = dict[str, type[obj.Type]]
+
+# The type of the values of each literal
+LITERAL_TYPES: dict[type[ast.Expression], type[obj.Type]] = {
+    ast.Boolean: obj.Boolean,
+    ast.Float: obj.Float,
+    ast.Integer: obj.Integer,
+    ast.StringLiteral: obj.String,
+}
+
+# Declarations that always accept a value of the type they name
+DECLARATIONS: dict[TokenType, type[obj.Type]] = {
+    TokenType.FLOAT_TYPE: obj.Float,
+    TokenType.INT_TYPE: obj.Integer,
+    TokenType.STR_TYPE: obj.String,
+}
+
+# The declaration naming each type that has typed operations
+OPERAND_TYPES: dict[type[obj.Type], TokenType] = {
+    obj.Float: TokenType.FLOAT_TYPE,
+    obj.Integer: TokenType.INT_TYPE,
+}
+
+COMPARISONS = ("<", ">", "<=", ">=")
+NUMBERS = (obj.Float, obj.Integer)
+
+
+def infer_types(program: ast.Program) -> None:
+    """Annotate `program`, in place, with the types its values are known to have.
+
+    Types are followed through the statements of each scope, from literals, set
+    statements and operations. Infix operations on operands known to be integers or
+    floats are marked to run without checking their operands, and set statements
+    whose value is known to have the declared type are marked to skip the check.
+
+    Inside an action, the names of the enclosing scopes may have been bound to
+    anything by the time it is called, so only its parameters and its own set
+    statements are known. Actions with typed parameters also get a copy of their
+    body where each typed parameter has its declared type; the evaluator runs it
+    when the arguments do have those types.
+    """
+    _statements(program.statements, {}, set())
+
+
+def _statements(statements: list[ast.Statement], types: Types, done: set[int]) -> None:
+    for statement in statements:
+        statement_type = type(statement)
+
+        if statement_type == ast.ExpressionStatement and statement.expression is not None:
+            _expression(statement.expression, types, done)
+        elif statement_type == ast.ReturnStatement and statement.value is not None:
+            _expression(statement.value, types, done)
+        elif statement_type == ast.SetStatement and statement.value is not None:
+            value_type = _expression(statement.value, types, done)
+            name = statement.name.value
+            if value_type is not None and DECLARATIONS.get(statement.token.token_type) == value_type:
+                statement.value_type = statement.token.token_type
+                types[name] = value_type
+            else:
+                # The check may fail and leave the previous value in place
+                types.pop(name, None)
+
+
+def _expression(node: ast.Expression, types: Types, done: set[int]) -> Optional[type[obj.Type]]:
+    node_type = type(node)
+
+    if node_type in LITERAL_TYPES:
+        return LITERAL_TYPES[node_type]
+
+    if node_type == ast.Variable:
+        return types.get(node.value)
+
+    if node_type == ast.Temporary:
+        value_type = _expression(node.value, types, done)
+        if value_type is None:
+            types.pop(node.name, None)
+        else:
+            types[node.name] = value_type
+        return value_type
+
+    if node_type == ast.Infix:
+        left = _expression(node.left, types, done)
+        right = _expression(node.right, types, done)
+        return _infix(node, left, right)
+
+    if node_type == ast.Prefix:
+        right = _expression(node.right, types, done)
+        if node.operator == "!":
+            return obj.Boolean
+        if node.operator == "-" and right in NUMBERS:
+            return right
+        return None
+
+    if node_type == ast.If:
+        _expression(node.condition, types, done)
+        # Both branches run in this scope, so a name keeps its type only if it is the
+        # same whichever branch runs
+        branches = []
+        for block in (node.consequence, node.alternative):
+            branch = dict(types)
+            if block is not None:
+                _statements(block.statements, branch, done)
+            branches.append(branch)
+        known = {name: value_type for name, value_type in branches[0].items() if branches[1].get(name) == value_type}
+        types.clear()
+        types.update(known)
+        return None
+
+    if node_type == ast.Call:
+        _expression(node.action, types, done)
+        for argument in node.arguments or []:
+            _expression(argument, types, done)
+        return None
+
+    if node_type == ast.Action:
+        if id(node) not in done:
+            _action(node, done)
+        return None
+
+    return None
+
+
+def _infix(node: ast.Infix, left: Optional[type[obj.Type]], right: Optional[type[obj.Type]]) -> Optional[type[obj.Type]]:
+    if left == right and left in OPERAND_TYPES and node.operator in _TYPED_OPERATIONS[OPERAND_TYPES[left]]:
+        node.operand_type = OPERAND_TYPES[left]
+
+    if node.operator in ("==", "!="):
+        return obj.Boolean
+    if left in NUMBERS and right in NUMBERS:
+        if node.operator in COMPARISONS:
+            return obj.Boolean
+        if left == right == obj.Integer and node.operator in ("+", "-", "*"):
+            return obj.Integer
+        return obj.Float if node.operator in ("+", "-", "*", "/") else None
+    if left == right == obj.String and node.operator == "+":
+        return obj.String
+
+    return None
+
+
+def _action(node: ast.Action, done: set[int]) -> None:
+    done.add(id(node))
+    if node.body is None:
+        return
+
+    _statements(node.body.statements, {}, done)
+
+    typed = {
+        parameter.value: obj.DECLARED_TYPES[parameter.typing.token_type]
+        for parameter in node.parameters
+        if parameter.typing.token_type in obj.DECLARED_TYPES
+    }
+    if typed:
+        # The actions created in the body know nothing of its names either way, so the
+        # copy shares them, already annotated, instead of copying them at every level
+        node.specialized = deepcopy(node.body, {id(inner): inner for inner in _inner_actions(node.body)})
+        _statements(node.specialized.statements, typed, done)
+
+
+def _inner_actions(block: ast.Block) -> list[ast.Action]:
+    # The actions created in the scope of `block`, without those created in theirs
+    actions = []
+    pending = children(block)
+    while pending:
+        node = pending.pop()
+        if type(node) == ast.Action:
+            actions.append(node)
+        else:
+            pending.extend(children(node))
+    return actions
@@ -0,0 +1,88 @@
+import pickle
+from concurrent.futures import Executor
+from typing import Iterable, Optional
+
+from wml import object as obj
+from wml.compiler import compile
+from wml.errors import Error
+from wml.token import Token, TokenType
+
+try:
+    from concurrent.futures import InterpreterPoolExecutor
+except ImportError:  # Python < 3.14
+    InterpreterPoolExecutor = None
+
+# What crosses from one interpreter to another: the name of the type of a value and
+# its Python value, which interpreters can share without pickling it. Errors are
+# pickled, as they are only sent once per run.
+Encoded = tuple[str, object]
+
+_VALUES: dict[str, tuple[type[obj.Type], TokenType]] = {
+    "Boolean": (obj.Boolean, TokenType.BOOL_VALUE),
+    "Float": (obj.Float, TokenType.FLOAT_VALUE),
+    "Integer": (obj.Integer, TokenType.INT_VALUE),
+    "String": (obj.String, TokenType.STR_VALUE),
+}
+
+
+def interpreter_pool(max_workers: Optional[int] = None) -> Executor:
+    """Return an executor running its tasks in sub-interpreters, each with its own GIL.
+
+    Sub-interpreters start faster than processes and share no objects with each
+    other, so nothing but the source and the encoded result has to be copied.
+    """
+    if InterpreterPoolExecutor is None:
+        raise RuntimeError("Sub-interpreters need Python 3.14 or later")
+
+    return InterpreterPoolExecutor(max_workers)
+
+
+def evaluate_sources(sources: Iterable[str], executor: Optional[Executor] = None) -> list[Optional[obj.Type]]:
+    """Evaluate each of `sources` on its own, in `executor`, and return their values in order."""
+    if executor is None:
+        with interpreter_pool() as executor:
+            return evaluate_sources(sources, executor)
+
+    return [decode(encoded) for encoded in executor.map(run_source, sources)]
+
+
+def run_source(source: str) -> Optional[Encoded]:
+    """Evaluate `source` in a new environment, and return its encoded value."""
+    return encode(compile(source).run())
+
+
+def run_file(filename: str) -> Optional[Encoded]:
+    """Like `wml.repl.execute_file`, but return the encoded value instead of printing it."""
+    with open(filename, "r") as f:
+        return run_source(f.read())
+
+
+def encode(value: Optional[obj.Type]) -> Optional[Encoded]:
+    if value is None:
+        return None
+
+    value_type = type(value)
+    if value_type == obj.Null:
+        return ("Null", None)
+    if value_type == obj.Return:
+        return encode(value.value)
+    if isinstance(value, Error):
+        return ("Error", pickle.dumps(value))
+    if value_type.__name__ in _VALUES:
+        return (value_type.__name__, value.value)
+
+    raise TypeError(f"{value.type()} values cannot leave the interpreter that created them")
+
+
+def decode(encoded: Optional[Encoded]) -> Optional[obj.Type]:
+    if encoded is None:
+        return None
+
+    name, value = encoded
+    if name == "Null":
+        return obj.Null()
+    if name == "Error":
+        return pickle.loads(value)
+
+    value_type, token_type = _VALUES[name]
+    return value_type(value, Token(token_type, str(value)))
@@ -0,0 +1,170 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Hashable, NamedTuple, Optional
+from weakref import WeakKeyDictionary
+
+from wml import ast
+from wml import object as obj
+from wml.analysis import free_names
+from wml.builtings import BUILTINS
+
+# Number of results kept per action, unless its memo is given another capacity
+DEFAULT_CAPACITY = 1024
+
+# Arguments that can be part of a memo key
+SCALARS = (obj.Boolean, obj.Float, obj.Integer, obj.String)
+
+# Marks a name that is not bound, or a result that is not in the memo
+MISSING = object()
+
+_FREE_NAMES: WeakKeyDictionary[ast.Block, frozenset[str]] = WeakKeyDictionary()
+
+
+class MemoStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    capacity: int
+
+
+class Memo:
+    """The results of the calls to an action, by argument values, see `memoize`.
+
+    An action is pure when everything it can reach, through the names it reads, is
+    a value, a pure builtin or another pure action. Set statements always target the
+    scope of the call, so they never make an action impure. The results of a pure
+    action only depend on its arguments and on the values bound to those names, so
+    they are kept until one of the names is bound to something else.
+
+    At most `capacity` results are kept, the least recently used one being evicted
+    first, and a capacity of 0 disables the memo. A memo can be used from several
+    threads at once.
+
+    Arguments are told apart by their position in the source as well as by their
+    value, so that a result kept for a call is the very one that call would get,
+    down to the positions its errors are reported at.
+    """
+
+    def __init__(self, action: obj.Action, capacity: Optional[int] = None) -> None:
+        self.capacity = DEFAULT_CAPACITY if capacity is None else capacity
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._action = action
+        self._results: OrderedDict[Hashable, obj.Type] = OrderedDict()
+        self._lock = Lock()
+        self._analyze()
+
+    def key(self, args: list[obj.Type]) -> Optional[Hashable]:
+        """Return the key of a call with `args`, or None if its result is not to be kept."""
+        if self.capacity <= 0:
+            return None
+
+        key = []
+        for arg in args:
+            if type(arg) not in SCALARS:
+                return None
+            # 0.0 == -0.0, but the two are different arguments
+            value = arg.value.hex() if type(arg) == obj.Float else arg.value
+            token = arg.token
+            if token is None:
+                key.append((type(arg), value))
+            else:
+                key.append((type(arg), value, token.token_type, token.line, token.column))
+
+        # The names can only have been bound to something else if the epoch changed
+        epoch = obj.Environment.epoch
+        if epoch != self._epoch:
+            with self._lock:
+                if any(_lookup(env, name) is not value for env, name, value in self._bindings):
+                    self._results.clear()
+                    self._analyze()
+                self._epoch = epoch
+
+        return tuple(key) if self._pure else None
+
+    def get(self, key: Hashable) -> object:
+        """Return the result kept for `key`, or MISSING."""
+        with self._lock:
+            result = self._results.get(key, MISSING)
+            if result is MISSING:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._results.move_to_end(key)
+        return result
+
+    def put(self, key: Hashable, result: obj.Type) -> None:
+        with self._lock:
+            self._results[key] = result
+            if len(self._results) > self.capacity:
+                self._results.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+
+    def stats(self) -> MemoStats:
+        return MemoStats(self.hits, self.misses, self.evictions, len(self._results), self.capacity)
+
+    def __getstate__(self) -> dict[str, object]:
+        # Locks cannot be pickled, as when an action is sent to another process
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, object]) -> None:
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+    def _analyze(self) -> None:
+        # The names read by the action and by every action it can reach, with their
+        # current values
+        self._bindings: list[tuple[obj.Environment, str, object]] = []
+        self._pure = True
+        self._epoch = obj.Environment.epoch
+
+        seen: set[int] = set()
+        pending = [self._action]
+        while pending:
+            action = pending.pop()
+            if id(action) in seen:
+                continue
+            seen.add(id(action))
+
+            for name in _free_names(action):
+                value = _lookup(action.env, name)
+                self._bindings.append((action.env, name, value))
+                if type(value) == obj.BuiltIn and not value.pure:
+                    self._pure = False
+                elif type(value) == obj.Action:
+                    pending.append(value)
+
+
+def memoize(action: obj.Action, capacity: Optional[int] = None) -> Memo:
+    """Keep the results of the calls to `action` while it is pure, and return its memo.
+
+    The results of a recursive action are kept for its recursive calls as well, as
+    they go through the name the action is bound to.
+    """
+    memo = action.memo = Memo(action, capacity)
+    return memo
+
+
+def _free_names(action: obj.Action) -> frozenset[str]:
+    # Every action created by the same definition shares its body
+    names = _FREE_NAMES.get(action.body)
+    if names is None:
+        names = _FREE_NAMES[action.body] = frozenset(
+            free_names(ast.Action(action.token, action.parameters, action.body))
+        )
+    return names
+
+
+def _lookup(env: obj.Environment, name: str) -> object:
+    try:
+        return env[name]
+    except KeyError:
+        return BUILTINS.get(name, MISSING)
@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
+from itertools import count
 from typing_extensions import Protocol
 
 from wml import ast
+from wml.hamt import PersistentDict
 from wml.token import Token, TokenType
+from wml.utils.strings import quote
 
 
 class TypeName: #TODO: metaclass=Singleton
@@ -33,6 +36,8 @@ class TypeName: #TODO: metaclass=Singleton
 
 class Type(ABC):
 
+    __slots__ = ()
+
     @classmethod
     def type(cls) -> TypeName:
         return TypeName(cls.__name__)
@@ -50,9 +55,10 @@ class BuiltInFunction(Protocol):
 
 class BuiltIn(Type):
 
-    def __init__(self, function: BuiltInFunction) -> None:
+    def __init__(self, function: BuiltInFunction, pure: bool = False) -> None:
         self.function = function
-        pass
+        # Pure functions answer the same to the same arguments and have no side effects
+        self.pure = pure
 
     def inspect(self) -> str:
         return 'Built-in function'
@@ -69,34 +75,101 @@ class ReservedWord(Type, ABC):
 ### Environment ###
 
 
+# Marks a missing key while looking up the environment chain
+_MISSING = object()
+
+_EPOCHS = count()
+
+
 class Environment(Type):
+    """The names bound in a scope, falling back to the names of the outer scope.
+
+    `epoch` changes whenever a name is bound in an environment that is the outer
+    scope of another one. While it stays the same, a name that is not bound in an
+    environment resolves to the same value through its outer scopes.
+
+    A `persistent` environment keeps its names in a `wml.hamt.PersistentDict`, so
+    `fork` is O(1) and binding a name in either copy never copies the others.
+    Lookups are somewhat slower than in a plain dict.
+    """
+
+    epoch = next(_EPOCHS)
 
     # TODO: Do we need to pass a dict?
     #  Maybe we can just initialize an empty dict in the constructor every time
-    def __init__(self, outer: dict | None = None) -> None:
+    def __init__(self, outer: dict | None = None, persistent: bool = False, store: dict | None = None) -> None:
         if outer is None:
             outer = {}
-        self._store = dict()
+        elif isinstance(outer, Environment):
+            outer._captured = True
+        if store is None:
+            store = PersistentDict() if persistent else dict()
+        self._store = store
         self._outer = outer
+        self._captured = False
         super().__init__()
 
+    @property
+    def outer(self) -> "Environment | dict":
+        return self._outer
+
+    @staticmethod
+    def invalidate() -> None:
+        """Change the epoch, so that no resolution cached so far is trusted again."""
+        Environment.epoch = next(_EPOCHS)
+
     def __getitem__(self, key: str) -> object:
-        try:
-            return self._store[key]
-        except KeyError as err:
-            if self._outer is not None:
-                return self._outer[key]
-            raise err
+        env = self
+        while type(env) == Environment:
+            value = env._store.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            env = env._outer
+        return env[key]
 
     def __setitem__(self, key: str, value: object) -> None:
         self._store[key] = value
+        if self._captured:
+            Environment.epoch = next(_EPOCHS)
 
     def __contains__(self, key: str) -> bool:
         return key in self._store
 
+    def fork(self) -> "Environment":
+        """Return a copy of this scope, in front of the same outer scope, to be changed on its own.
+
+        The actions bound in this scope still read the names of this scope, not those
+        of the copy: binding a name in the copy does not change what they return.
+        Actions are to be defined again in the copy for them to see its names.
+        """
+        env = Environment(self._outer)
+        env._store = self._store.fork() if type(self._store) == PersistentDict else dict(self._store)
+        return env
+
+    def capture(self, keys: frozenset[str]) -> "Environment":
+        """Return a scope with only the `keys` bound in this one, in front of the same outer scope."""
+        env = Environment(self._outer)
+        for key in keys:
+            value = self._store.get(key, _MISSING)
+            if value is not _MISSING:
+                env._store[key] = value
+        return env
+
     def __delitem__(self, key: str) -> None:
         if key in self._store:
             del self._store[key]
+            if self._captured:
+                Environment.epoch = next(_EPOCHS)
+
+    def clear(self) -> None:
+        """Unbind every name of this scope, to use it again."""
+        if self._store:
+            if type(self._store) == PersistentDict:
+                self._store = PersistentDict()
+            else:
+                self._store.clear()
+            if self._captured:
+                Environment.epoch = next(_EPOCHS)
 
     def __iter__(self):
         return iter(self._store)
@@ -191,13 +264,50 @@ class Null(DataType):
 
 
 class String(DataType):
+    """A string backed by a shared join buffer.
+
+    Concatenating onto the string that owns the tail of the buffer appends in place, so
+    building a long text piece by piece is linear. The parts are only joined when the
+    value is observed.
+    """
 
     def __init__(self, value: str, token: Token) -> None:
-        self.value = value
+        # The buffer and how many of its parts are ours, replaced together so that
+        # another thread never sees one without the other
+        self._buffer = ([value], 1)
+        self._value: str | None = value
+        self.length = len(value)
         self.token = token
 
+    @property
+    def value(self) -> str:
+        if self._value is None:
+            parts, size = self._buffer
+            value = "".join(parts[:size])
+            self._buffer = ([value], 1)
+            self._value = value
+        return self._value
+
+    def concat(self, other: "String", token: Token) -> "String":
+        # Observing `other` may collapse its parts, and `other` may be this very string
+        tail = other.value
+        parts, size = self._buffer
+        if len(parts) == size:
+            parts.append(tail)
+        if parts[size] is not tail:
+            # Another string grew this buffer first, branch off a copy of our parts
+            parts = parts[:size]
+            parts.append(tail)
+
+        result = String.__new__(String)
+        result._buffer = (parts, size + 1)
+        result._value = None
+        result.length = self.length + other.length
+        result.token = token
+        return result
+
     def inspect(self) -> str:
-        return self.value
+        return quote(self.value)
 
 
 ### Reserved words ###
@@ -211,11 +321,19 @@ class Action(ReservedWord):
             body: ast.Block,
             env: Environment,
             token: Token,
+            specialized: ast.Block | None = None,
     ) -> None:
         self.parameters = parameters
         self.body = body
+        # Runs instead of the body when every typed parameter gets an argument of its type
+        self.specialized = specialized
+        self.guards = [DECLARED_TYPES.get(parameter.typing.token_type) for parameter in parameters]
         self.env = env
         self.token = token
+        # Names bound in the scope of an action from now on may change what it does
+        env._captured = True
+        # Only set for the actions memoized by `wml.memo.memoize`
+        self.memo = None
 
     def inspect(self) -> str:
         params = [str(param) for param in self.parameters]
@@ -230,3 +348,12 @@ class Return(ReservedWord):
 
     def inspect(self) -> str:
         return self.value.inspect()
+
+
+# The values accepted by each type declaration
+DECLARED_TYPES: dict[TokenType, type[Type]] = {
+    TokenType.BOOL_TYPE: Boolean,
+    TokenType.FLOAT_TYPE: Float,
+    TokenType.INT_TYPE: Integer,
+    TokenType.STR_TYPE: String,
+}
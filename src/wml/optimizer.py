@@ -0,0 +1,595 @@
+from collections import Counter, defaultdict
+from itertools import count
+from typing import Collection, Hashable, Iterator, Optional
+
+from wml import ast
+from wml import object as obj
+from wml.analysis import assigned_names, read_names, walk
+from wml.errors import Error
+from wml.inference import infer_types
+from wml.evaluator import evaluate, _is_truthy, _validate_set_statement_types
+from wml.token import Token, TokenType
+
+# Nodes whose value is known before the program runs
+LITERALS = (ast.Boolean, ast.Float, ast.Integer, ast.StringLiteral)
+
+# Nodes the body of an action may be made of to be inlined
+INLINABLE = (*LITERALS, ast.Call, ast.Constant, ast.Identifier, ast.Infix, ast.Prefix, ast.Variable)
+
+# Maximum number of nodes in the body of an inlined action
+INLINE_THRESHOLD = 12
+
+# Marks a name set inside an enclosing action, which may or may not be bound
+LOCAL = object()
+
+# A specialized copy of an action, keyed by the action name and its known arguments
+Signature = tuple[str, tuple[tuple[int, Hashable], ...]]
+
+# What is known about each name in scope: its value (a literal or an action), None for
+# parameters (bound, value unknown) or LOCAL. Names bound at the top level whose value
+# is unknown are left out.
+Bindings = dict[str, object]
+
+
+def optimize(
+        program: ast.Program,
+        inline_threshold: int = INLINE_THRESHOLD,
+        keep: Collection[str] = (),
+) -> ast.Program:
+    """Return an optimized copy of `program`.
+
+    Literal arithmetic is folded, variables assigned a single literal value are
+    replaced by that value, `if` expressions with a known condition are reduced to
+    the branch that runs, and set statements whose variable is never read are
+    dropped, unless it is one of the names to `keep` for other programs to read.
+    Operations that would fail (such as a division by zero) are left for
+    the evaluator, so the optimized program reports the same errors.
+
+    Calls to small, non-recursive actions that are never reassigned are replaced by
+    the body of the action, with the arguments in place of the parameters. Actions
+    with more than `inline_threshold` nodes in their body are not inlined, and 0
+    disables inlining.
+
+    Calls that pass literal arguments to an action that is never reassigned call a
+    copy of the action specialized on those arguments instead: the parameters are
+    replaced by the literals and the body optimized again, so the branches that
+    depend on them are gone. Calls with the same literal arguments share the copy.
+
+    Within each block of an action body, pure subexpressions that are evaluated
+    more than once with the same operands are computed a single time into a hidden
+    slot, and the later occurrences read the slot instead. Finally, the types the
+    values are known to have are inferred, see `wml.inference.infer_types`.
+    """
+    return _Optimizer(program, inline_threshold, keep).optimize()
+
+
+class _Optimizer:
+
+    def __init__(self, program: ast.Program, inline_threshold: int, keep: Collection[str]) -> None:
+        self._program = program
+        self._inline_threshold = inline_threshold
+        self._keep = keep
+        self._single_assignments = {name for name, count in assigned_names(program).items() if count == 1}
+        self._globals: Bindings = {}
+        self._specializations: dict[Signature, ast.SetStatement] = {}
+        self._specializing: set[str] = set()
+        self._definitions: dict[str, Token] = {}
+
+    def optimize(self) -> ast.Program:
+        optimized = ast.Program(self._optimize_statements(self._program.statements, self._globals, True))
+        self._add_specializations(optimized)
+        _remove_unused_set_statements(optimized, self._keep)
+        _eliminate_common_subexpressions(optimized)
+        infer_types(optimized)
+
+        return optimized
+
+    def _optimize_statements(
+            self,
+            statements: list[ast.Statement],
+            bindings: Bindings,
+            top_level: bool,
+    ) -> list[ast.Statement]:
+        # Only the statements that run unconditionally at the top level can define
+        # values known to the rest of the program
+        optimized: list[ast.Statement] = []
+
+        for idx, statement in enumerate(statements):
+            is_last = idx == len(statements) - 1
+
+            # Blocks share the environment they run in, so the branch that will run can
+            # take the place of the `if`. Its value only matters for the last statement.
+            if type(statement) == ast.ExpressionStatement and type(statement.expression) == ast.If:
+                node = statement.expression
+                condition = _known_condition(self._optimize_expression(node.condition, bindings))
+                if condition is not None:
+                    block = node.consequence if condition else node.alternative
+                    if block is not None and block.statements:
+                        optimized.extend(self._optimize_statements(block.statements, bindings, top_level))
+                        continue
+                    if not is_last:
+                        continue
+
+            statement = self._optimize_statement(statement, bindings)
+
+            if (
+                    top_level
+                    and type(statement) == ast.SetStatement
+                    and statement.name.value in self._single_assignments
+            ):
+                value = statement.value
+                if type(value) == ast.Action:
+                    self._definitions[statement.name.value] = statement.token
+                if type(value) == ast.Action or (
+                        type(value) in LITERALS
+                        and _validate_set_statement_types(statement.token.token_type, value.token.token_type)
+                ):
+                    bindings[statement.name.value] = value
+
+            optimized.append(statement)
+
+        return optimized
+
+    def _optimize_statement(self, statement: ast.Statement, bindings: Bindings) -> ast.Statement:
+        statement_type = type(statement)
+
+        if statement_type == ast.ExpressionStatement and statement.expression is not None:
+            return ast.ExpressionStatement(statement.token, self._optimize_expression(statement.expression, bindings))
+        if statement_type == ast.SetStatement and statement.value is not None:
+            return ast.SetStatement(statement.token, statement.name, self._optimize_expression(statement.value, bindings))
+        if statement_type == ast.ReturnStatement and statement.value is not None:
+            return ast.ReturnStatement(statement.token, self._optimize_expression(statement.value, bindings))
+        if statement_type == ast.ModelStatement:
+            return ast.ModelStatement(statement.token, statement.name, statement.parent,
+                                      self._optimize_block(statement.body, bindings))
+
+        return statement
+
+    def _optimize_block(self, block: Optional[ast.Block], bindings: Bindings) -> Optional[ast.Block]:
+        if block is None:
+            return None
+
+        return ast.Block(block.token, self._optimize_statements(block.statements, bindings, False))
+
+    def _optimize_expression(self, node: ast.Expression, bindings: Bindings) -> ast.Expression:
+        node_type = type(node)
+
+        if node_type == ast.Variable:
+            value = bindings.get(node.value)
+            return value if type(value) in LITERALS else node
+
+        if node_type == ast.Infix:
+            node = ast.Infix(
+                node.token,
+                self._optimize_expression(node.left, bindings),
+                node.operator,
+                self._optimize_expression(node.right, bindings),
+            )
+            if type(node.left) in LITERALS and type(node.right) in LITERALS:
+                return _fold(node)
+            return node
+
+        if node_type == ast.Prefix:
+            node = ast.Prefix(node.token, node.operator, self._optimize_expression(node.right, bindings))
+            # `!` answers with a boolean carrying the token of its operand, an integer token
+            # for `!0`, and set statements check that token: a literal printed back as
+            # `True` would not be checked the same way
+            if node.operator != "!" and type(node.right) in LITERALS:
+                return _fold(node)
+            return node
+
+        if node_type == ast.If:
+            node = ast.If(
+                node.token,
+                self._optimize_expression(node.condition, bindings),
+                self._optimize_block(node.consequence, bindings),
+                self._optimize_block(node.alternative, bindings),
+            )
+            condition = _known_condition(node.condition)
+            if condition is not None:
+                block = node.consequence if condition else node.alternative
+                # A branch made of a single expression evaluates to that expression
+                if (
+                        block is not None
+                        and len(block.statements) == 1
+                        and type(block.statements[0]) == ast.ExpressionStatement
+                        and block.statements[0].expression is not None
+                ):
+                    return block.statements[0].expression
+            return node
+
+        if node_type == ast.Action:
+            return self._optimize_action(node, bindings, {})
+
+        if node_type == ast.Call:
+            node = ast.Call(
+                node.token,
+                self._optimize_expression(node.action, bindings),
+                [self._optimize_expression(argument, bindings) for argument in node.arguments or []],
+            )
+            inlined = self._inline(node, bindings)
+            if inlined is not None:
+                return self._optimize_expression(inlined, bindings)
+            specialized = self._specialize(node, bindings)
+            if specialized is not None:
+                return specialized
+            return node
+
+        return node
+
+    def _optimize_action(
+            self,
+            node: ast.Action,
+            bindings: Bindings,
+            arguments: dict[str, ast.Expression],
+    ) -> ast.Action:
+        # Names set in the body shadow the outer ones, and parameters are always bound,
+        # to the given literal arguments or to unknown values
+        inner = {
+            **bindings,
+            **{name: LOCAL for name in assigned_names(node.body)},
+            **{parameter.value: arguments.get(parameter.value) for parameter in node.parameters},
+        }
+        parameters = [parameter for parameter in node.parameters if parameter.value not in arguments]
+        return ast.Action(node.token, parameters, self._optimize_block(node.body, inner))
+
+    def _inline(self, call: ast.Call, bindings: Bindings) -> Optional[ast.Expression]:
+        if type(call.action) == ast.Action:
+            # The action would be created right here, so its body sees the same names
+            action = call.action
+            name = None
+        elif type(call.action) == ast.Variable and type(bindings.get(call.action.value)) == ast.Action:
+            action = bindings[call.action.value]
+            name = call.action.value
+        else:
+            return None
+
+        body = _body_expression(action)
+        if body is None or len(call.arguments) != len(action.parameters):
+            return None
+
+        nodes = list(walk(body))
+        if len(nodes) > self._inline_threshold or any(type(node) not in INLINABLE for node in nodes):
+            return None
+
+        parameters = [parameter.value for parameter in action.parameters]
+        arguments = dict(zip(parameters, call.arguments))
+        free_names = {node.value for node in nodes
+                      if type(node) in (ast.Variable, ast.Identifier, ast.Constant)} - set(parameters)
+
+        if name is not None:
+            # Recursive actions are never inlined
+            if name in free_names:
+                return None
+
+            # The body is moved away from where the action was defined, so the names
+            # it uses must not be shadowed at the call site
+            if any(free_name in bindings and bindings[free_name] in (None, LOCAL) for free_name in free_names):
+                return None
+
+        if not _keeps_evaluation_order(body, parameters, arguments, bindings):
+            return None
+
+        return _substitute(body, arguments)
+
+    def _specialize(self, call: ast.Call, bindings: Bindings) -> Optional[ast.Call]:
+        if type(call.action) != ast.Variable or type(bindings.get(call.action.value)) != ast.Action:
+            return None
+
+        name = call.action.value
+        action = bindings[name]
+        if name not in self._single_assignments or len(call.arguments) != len(action.parameters):
+            return None
+
+        # Parameters set in the body do not keep the value they were called with
+        assigned = assigned_names(action.body) if action.body is not None else {}
+        known = [
+            idx for idx, (parameter, argument) in enumerate(zip(action.parameters, call.arguments))
+            if type(argument) in LITERALS and parameter.value not in assigned
+        ]
+        if not known:
+            return None
+
+        signature = (name, tuple((idx, _literal_key(call.arguments[idx])) for idx in known))
+        definition = self._specializations.get(signature)
+        if definition is None:
+            # Recursive calls with other arguments would specialize the action forever
+            if name in self._specializing:
+                return None
+            hidden = f"{name}%{len(self._specializations)}"
+            definition = ast.SetStatement(
+                self._definitions[name],
+                ast.Identifier(Token(TokenType.VARIABLE, hidden, call.token.line, call.token.column),
+                               Token(TokenType.ANY_TYPE, "Any"), hidden),
+            )
+            # Registered before the body is optimized, so recursive calls with the same
+            # arguments reach the copy as well
+            self._specializations[signature] = definition
+            arguments = {action.parameters[idx].value: call.arguments[idx] for idx in known}
+            self._specializing.add(name)
+            definition.value = self._optimize_action(action, dict(self._globals), arguments)
+            self._specializing.discard(name)
+
+        return ast.Call(
+            call.token,
+            ast.Variable(definition.name.token, Token(TokenType.ANY_TYPE, "Any"), definition.name.value),
+            [argument for idx, argument in enumerate(call.arguments) if idx not in known],
+        )
+
+    def _add_specializations(self, program: ast.Program) -> None:
+        # Each copy is set right after the action it specializes, in the same scope
+        statements: list[ast.Statement] = []
+        for statement in program.statements:
+            statements.append(statement)
+            if type(statement) == ast.SetStatement and type(statement.value) == ast.Action:
+                statements.extend(
+                    definition for (name, _), definition in self._specializations.items()
+                    if name == statement.name.value
+                )
+        program.statements = statements
+
+
+def _body_expression(action: ast.Action) -> Optional[ast.Expression]:
+    # The expression an action evaluates to, if its body is a single expression
+    statements = action.body.statements if action.body is not None else []
+    if len(statements) != 1 or type(statements[0]) not in (ast.ReturnStatement, ast.ExpressionStatement):
+        return None
+
+    statement = statements[0]
+    return statement.value if type(statement) == ast.ReturnStatement else statement.expression
+
+
+def _is_trivial(argument: ast.Expression, bindings: Bindings) -> bool:
+    # Arguments that can neither fail nor change between two reads
+    if type(argument) in LITERALS:
+        return True
+
+    return (
+            type(argument) == ast.Variable
+            and argument.value in bindings
+            and bindings[argument.value] is not LOCAL
+    )
+
+
+def _keeps_evaluation_order(
+        body: ast.Expression,
+        parameters: list[str],
+        arguments: dict[str, ast.Expression],
+        bindings: Bindings,
+) -> bool:
+    # Arguments are evaluated before the body. Once inlined, the ones that could fail
+    # must be evaluated once each, in the same order and before anything else.
+    trivial = {parameter for parameter in parameters if _is_trivial(arguments[parameter], bindings)}
+    pending = [parameter for parameter in parameters if parameter not in trivial]
+    seen: set[str] = set()
+
+    for event in _evaluation_events(body):
+        if event in trivial:
+            continue
+        if event in arguments:
+            if event in seen or not pending or event != pending[0]:
+                return False
+            seen.add(event)
+            pending.pop(0)
+        elif pending:
+            return False
+
+    return not pending
+
+
+def _evaluation_events(node: ast.Expression) -> list[Optional[str]]:
+    # The names read and the operations applied (as None) by `node`, in evaluation order
+    node_type = type(node)
+
+    if node_type in (ast.Variable, ast.Identifier, ast.Constant):
+        return [node.value]
+    if node_type == ast.Infix:
+        return [*_evaluation_events(node.left), *_evaluation_events(node.right), None]
+    if node_type == ast.Prefix:
+        return [*_evaluation_events(node.right), None]
+    if node_type == ast.Call:
+        events = _evaluation_events(node.action)
+        for argument in node.arguments or []:
+            events.extend(_evaluation_events(argument))
+        return [*events, None]
+
+    return []
+
+
+def _substitute(node: ast.Expression, arguments: dict[str, ast.Expression]) -> ast.Expression:
+    node_type = type(node)
+
+    if node_type == ast.Variable:
+        return arguments.get(node.value, node)
+    if node_type == ast.Infix:
+        return ast.Infix(node.token, _substitute(node.left, arguments), node.operator,
+                         _substitute(node.right, arguments))
+    if node_type == ast.Prefix:
+        return ast.Prefix(node.token, node.operator, _substitute(node.right, arguments))
+    if node_type == ast.Call:
+        return ast.Call(node.token, _substitute(node.action, arguments),
+                        [_substitute(argument, arguments) for argument in node.arguments or []])
+
+    return node
+
+
+def _fold(node: ast.Expression) -> ast.Expression:
+    try:
+        result = evaluate(node, obj.Environment())
+    except (ArithmeticError, TypeError):
+        # Leave it to the evaluator to fail at runtime
+        return node
+
+    if isinstance(result, Error) or getattr(result, "token", None) is None:
+        return node
+
+    result_type = type(result)
+    if result_type == obj.Integer:
+        return ast.Integer(result.token, result.value)
+    if result_type == obj.Float:
+        return ast.Float(result.token, result.value)
+    if result_type == obj.Boolean:
+        return ast.Boolean(result.token, result.value)
+    if result_type == obj.String:
+        # The lexer has no escapes, so no literal can hold both kinds of quotes
+        if "'" in result.value and '"' in result.value:
+            return node
+        return ast.StringLiteral(result.token, result.value)
+
+    return node
+
+
+def _known_condition(condition: ast.Expression) -> Optional[bool]:
+    if type(condition) not in LITERALS:
+        return None
+
+    return _is_truthy(evaluate(condition, obj.Environment()))
+
+
+def _remove_unused_set_statements(program: ast.Program, keep: Collection[str]) -> None:
+    # Works in place, every block of `program` is a fresh copy at this point
+    reads = read_names(program).keys() | set(keep)
+
+    for node in walk(program):
+        if type(node) not in (ast.Program, ast.Block):
+            continue
+
+        # The last statement gives the block its value, so it is always kept
+        node.statements = [
+            statement for idx, statement in enumerate(node.statements)
+            if idx == len(node.statements) - 1
+            or type(statement) != ast.SetStatement
+            or statement.name.value in reads
+            or type(statement.value) not in (*LITERALS, ast.Action)
+        ]
+
+
+def _eliminate_common_subexpressions(program: ast.Program) -> None:
+    # Works in place, like `_remove_unused_set_statements`
+    for action in [node for node in walk(program) if type(node) == ast.Action]:
+        if action.body is not None:
+            _CommonSubexpressions(f"%{idx}" for idx in count()).rewrite(action.body)
+
+
+class _CommonSubexpressions:
+    """Shares the pure subexpressions evaluated more than once in a block.
+
+    Only the expressions that run every time the block runs are considered: the
+    branches of an `if` are blocks of their own, and the bodies of nested actions
+    are rewritten separately. Each name read by a subexpression is keyed by the
+    number of set statements that targeted it so far, so a subexpression is never
+    shared across an assignment to one of its operands. Calls are never shared.
+    """
+
+    COUNT, SELECT, REWRITE = range(3)
+
+    def __init__(self, slots: Iterator[str]) -> None:
+        # Slot names are drawn from a single sequence per action, so nested blocks
+        # never reuse the slot of an enclosing one
+        self._slots = slots
+        self._occurrences: Counter[Hashable] = Counter()
+        self._shared: Counter[Hashable] = Counter()
+        self._seen: set[Hashable] = set()
+        self._names: dict[Hashable, str] = {}
+
+    def rewrite(self, block: ast.Block) -> None:
+        # A first pass counts the occurrences of each subexpression, a second one
+        # leaves out those nested in an occurrence that will be shared anyway, and
+        # the last one stores the first occurrence in a slot and reads the others
+        for phase in (self.COUNT, self.SELECT, self.REWRITE):
+            self._phase = phase
+            self._statements(block)
+
+    def _statements(self, block: ast.Block) -> None:
+        versions: defaultdict[str, int] = defaultdict(int)
+
+        for statement in block.statements:
+            statement_type = type(statement)
+
+            if statement_type == ast.ExpressionStatement and statement.expression is not None:
+                statement.expression = self._expression(statement.expression, versions)
+            elif statement_type in (ast.SetStatement, ast.ReturnStatement) and statement.value is not None:
+                statement.value = self._expression(statement.value, versions)
+
+            for name in assigned_names(statement):
+                versions[name] += 1
+
+    def _expression(self, node: ast.Expression, versions: defaultdict[str, int]) -> ast.Expression:
+        key = _pure_key(node, versions) if type(node) in (ast.Infix, ast.Prefix) else None
+
+        if key is not None:
+            if self._phase == self.COUNT:
+                self._occurrences[key] += 1
+            elif self._phase == self.SELECT and self._occurrences[key] > 1:
+                self._shared[key] += 1
+                if key in self._seen:
+                    return node
+                self._seen.add(key)
+            elif self._phase == self.REWRITE and self._shared[key] > 1:
+                if key in self._names:
+                    name = self._names[key]
+                    return ast.Variable(Token(TokenType.VARIABLE, name, node.token.line, node.token.column),
+                                        Token(TokenType.ANY_TYPE, "Any"), name)
+                name = self._names[key] = next(self._slots)
+                return ast.Temporary(node.token, name, self._children(node, versions))
+
+        return self._children(node, versions)
+
+    def _children(self, node: ast.Expression, versions: defaultdict[str, int]) -> ast.Expression:
+        node_type = type(node)
+        rewrite = self._phase == self.REWRITE
+
+        if node_type == ast.Infix:
+            left = self._expression(node.left, versions)
+            right = self._expression(node.right, versions)
+            return ast.Infix(node.token, left, node.operator, right) if rewrite else node
+
+        if node_type == ast.Prefix:
+            right = self._expression(node.right, versions)
+            return ast.Prefix(node.token, node.operator, right) if rewrite else node
+
+        if node_type == ast.Call:
+            action = self._expression(node.action, versions)
+            arguments = [self._expression(argument, versions) for argument in node.arguments or []]
+            return ast.Call(node.token, action, arguments) if rewrite else node
+
+        if node_type == ast.If:
+            condition = self._expression(node.condition, versions)
+            for block in (node.consequence, node.alternative):
+                if block is None:
+                    continue
+                if rewrite:
+                    _CommonSubexpressions(self._slots).rewrite(block)
+                # Either branch may have run by the time the next operand is evaluated
+                for name in assigned_names(block):
+                    versions[name] += 1
+            return ast.If(node.token, condition, node.consequence, node.alternative) if rewrite else node
+
+        return node
+
+
+def _pure_key(node: ast.Expression, versions: defaultdict[str, int]) -> Optional[Hashable]:
+    # A key equal for structurally identical subexpressions reading the same values,
+    # or None if evaluating `node` could do more than compute a value
+    node_type = type(node)
+
+    if node_type in LITERALS:
+        return _literal_key(node)
+    if node_type in (ast.Variable, ast.Identifier, ast.Constant):
+        return node_type.__name__, node.value, versions[node.value]
+    if node_type == ast.Infix:
+        left = _pure_key(node.left, versions)
+        right = _pure_key(node.right, versions)
+        if left is None or right is None:
+            return None
+        return node.operator, left, right
+    if node_type == ast.Prefix:
+        right = _pure_key(node.right, versions)
+        return None if right is None else (node.operator, right)
+
+    return None
+
+
+def _literal_key(node: ast.Expression) -> Hashable:
+    # Tells apart literals that compare equal in Python, such as 1, 1.0 and True
+    return type(node).__name__, node.value, node.token.token_type
@@ -0,0 +1,272 @@
+import io
+import os
+import pickle
+import sys
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+from uuid import uuid4
+
+from wml import ast
+from wml import object as obj
+from wml.analysis import scope_written_names, statement_dependencies, walk
+from wml.errors import Error
+from wml.evaluator import evaluate
+
+_MISSING = object()
+
+# Values that are the same in a worker and in the process running the program, as
+# opposed to actions, which would be tied to the worker's copy of the environment
+TRANSFERABLE = (obj.Boolean, obj.Float, obj.Integer, obj.Null, obj.String, Error)
+
+# The index of a statement, its value, and the names it bound with their new values
+Outcome = tuple[int, Optional[obj.Type], dict[str, obj.Type]]
+
+# The statements of one task: their indexes, the statements and the names they bind
+Chunk = list[tuple[int, ast.Statement, set[str]]]
+
+# In a worker process, the pickled environment of the last run it took part in
+_BASES: dict[str, bytes] = {}
+
+
+def default_executor(max_workers: Optional[int] = None) -> Executor:
+    """Return a pool of threads on free-threaded builds of Python, or else a pool of processes."""
+    if not getattr(sys, "_is_gil_enabled", lambda: True)():
+        return ThreadPoolExecutor(max_workers)
+    return ProcessPoolExecutor(max_workers)
+
+
+def evaluate_parallel(
+        program: ast.Program,
+        env: obj.Environment,
+        executor: Optional[Executor] = None,
+        workers: Optional[int] = None,
+) -> Optional[obj.Type]:
+    """Evaluate `program` like `wml.evaluator.evaluate`, running independent statements at once.
+
+    Each statement runs in the first wave after the statements it depends on, see
+    `wml.analysis.statement_dependencies`. The set and expression statements of a
+    wave that create no action are split among `workers` tasks on `executor`, each
+    evaluating its share in its own copy of `env`. The names they bound are then
+    bound in `env`, in source order. The other statements, and the ones whose values
+    cannot leave the worker, are evaluated in `env` itself.
+
+    As in a sequential evaluation, the first error in source order stops the program,
+    and the statements after it that did run have their bindings undone. Statements
+    whose task failed with a Python exception are evaluated again in `env`, and a
+    Python exception raised there stops the program just as an error does, so that
+    it is only raised if no earlier statement failed.
+
+    Unless `executor` is a pool of threads, `env` is pickled once per run and sent
+    once to each worker, each task only carrying the names bound since.
+    """
+    if executor is None:
+        with default_executor(workers) as executor:
+            return evaluate_parallel(program, env, executor, workers)
+
+    statements = program.statements
+    if not statements:
+        return None
+
+    workers = workers or os.cpu_count() or 1
+    writes = [scope_written_names([statement]) for statement in statements]
+    offload = [_can_offload(statement) for statement in statements]
+
+    snapshot = None if isinstance(executor, ThreadPoolExecutor) else _Snapshot(env)
+    results: dict[int, Optional[obj.Type]] = {}
+    undo: dict[int, dict[str, object]] = {}
+    exceptions: dict[int, Exception] = {}
+    stop: Optional[int] = None
+    for wave in _waves(statement_dependencies(statements)):
+        if stop is not None:
+            wave = [idx for idx in wave if idx < stop]
+
+        remote = [idx for idx in wave if offload[idx]]
+        if len(remote) < 2:
+            remote = []
+        chunks = [
+            [(idx, statements[idx], writes[idx]) for idx in remote[start::workers]]
+            for start in range(min(workers, len(remote)))
+        ]
+        if snapshot is None:
+            futures = [executor.submit(_evaluate_statements, env, chunk) for chunk in chunks]
+            outcomes = _outcomes(futures)
+        else:
+            outcomes = snapshot.evaluate(executor, chunks)
+
+        for idx in wave:
+            if stop is not None and idx > stop:
+                break
+
+            outcome = outcomes.get(idx)
+            if outcome is not None and all(isinstance(value, TRANSFERABLE) for value in _values(outcome)):
+                result, bound = outcome
+                undo[idx] = _bindings(env, bound)
+                for name, value in bound.items():
+                    env[name] = value
+            else:
+                undo[idx] = _bindings(env, writes[idx])
+                try:
+                    result = evaluate(statements[idx], env)
+                except Exception as exception:
+                    # Only raised once no earlier statement, of a later wave, failed first
+                    exceptions[idx] = exception
+                    result = None
+            if snapshot is not None:
+                snapshot.changed.update(undo[idx])
+
+            results[idx] = result
+            if idx in exceptions or isinstance(result, (Error, obj.Return)):
+                stop = idx
+
+    if stop is None:
+        return results[len(statements) - 1]
+
+    for idx in sorted(undo, reverse=True):
+        if idx > stop:
+            _restore(env, undo[idx])
+
+    if stop in exceptions:
+        raise exceptions[stop]
+    result = results[stop]
+    return result.value if type(result) == obj.Return else result
+
+
+class _Snapshot:
+    """The environment of a run, as sent to workers in other processes.
+
+    The environment is pickled once, and only sent to the workers that ask for it.
+    Each wave then sends the names bound since the run started, with the actions
+    created in the environment pointing back to the worker's copy of it.
+    """
+
+    def __init__(self, env: obj.Environment) -> None:
+        self.run = uuid4().hex
+        self.changed: set[str] = set()
+        self._env = env
+        self._base: Optional[bytes] = None
+
+    def evaluate(self, executor: Executor, chunks: list[Chunk]) -> dict[int, tuple[Optional[obj.Type], dict[str, obj.Type]]]:
+        if not chunks:
+            return {}
+
+        updates = self._updates()
+        futures = [executor.submit(_evaluate_remote, self.run, None, updates, chunk) for chunk in chunks]
+        # The workers that do not have the environment yet get it along with their task
+        for idx, future in enumerate(futures):
+            if future.exception() is None and future.result() is None:
+                if self._base is None:
+                    self._base = pickle.dumps(self._env)
+                futures[idx] = executor.submit(_evaluate_remote, self.run, self._base, updates, chunks[idx])
+
+        return _outcomes(futures)
+
+    def _updates(self) -> bytes:
+        bound = {name: self._env[name] for name in self.changed if name in self._env}
+        buffer = io.BytesIO()
+        _Pickler(buffer, self._env).dump((bound, self.changed - bound.keys()))
+        return buffer.getvalue()
+
+
+class _Pickler(pickle.Pickler):
+
+    def __init__(self, file: io.BytesIO, env: obj.Environment) -> None:
+        super().__init__(file)
+        self._env = env
+
+    def persistent_id(self, value: object) -> Optional[str]:
+        return "env" if value is self._env else None
+
+
+class _Unpickler(pickle.Unpickler):
+
+    def __init__(self, file: io.BytesIO, env: obj.Environment) -> None:
+        super().__init__(file)
+        self._env = env
+
+    def persistent_load(self, pid: str) -> obj.Environment:
+        return self._env
+
+
+def _evaluate_remote(run: str, base: Optional[bytes], updates: bytes, items: Chunk) -> Optional[list[Outcome]]:
+    # Runs in a worker process, and returns None if it needs the environment of the run
+    if base is not None:
+        _BASES.clear()
+        _BASES[run] = base
+    base = _BASES.get(run)
+    if base is None:
+        return None
+
+    env = pickle.loads(base)
+    bound, unbound = _Unpickler(io.BytesIO(updates), env).load()
+    for name, value in bound.items():
+        env[name] = value
+    for name in unbound:
+        if name in env:
+            del env[name]
+
+    return _evaluate_each(env, items)
+
+
+def _outcomes(futures: list[Future]) -> dict[int, tuple[Optional[obj.Type], dict[str, obj.Type]]]:
+    # The statements of the tasks that raised have no outcome, so they are evaluated
+    # again in order
+    return {
+        idx: (result, bound)
+        for future in futures if future.exception() is None
+        for idx, result, bound in future.result()
+    }
+
+
+def _evaluate_statements(env: obj.Environment, items: Chunk) -> list[Outcome]:
+    # Runs in a worker thread, on a copy of the environment that only its statements change
+    return _evaluate_each(env.fork(), items)
+
+
+def _evaluate_each(env: obj.Environment, items: Chunk) -> list[Outcome]:
+    outcomes: list[Outcome] = []
+    for idx, statement, names in items:
+        before = _bindings(env, names)
+        result = evaluate(statement, env)
+        bound = {name: env[name] for name in names if name in env and env[name] is not before[name]}
+        outcomes.append((idx, result, bound))
+        if isinstance(result, Error):
+            break
+
+    return outcomes
+
+
+def _can_offload(statement: ast.Statement) -> bool:
+    # Actions created in a worker would be tied to its copy of the environment
+    return type(statement) in (ast.SetStatement, ast.ExpressionStatement) and all(
+        type(node) != ast.Action for node in walk(statement)
+    )
+
+
+def _waves(dependencies: list[frozenset[int]]) -> list[list[int]]:
+    # Groups the statements that only depend on the ones in previous groups
+    levels: list[int] = []
+    for deps in dependencies:
+        levels.append(1 + max((levels[dep] for dep in deps), default=-1))
+
+    waves: list[list[int]] = [[] for _ in range(max(levels, default=-1) + 1)]
+    for idx, level in enumerate(levels):
+        waves[level].append(idx)
+
+    return waves
+
+
+def _values(outcome: tuple[Optional[obj.Type], dict[str, obj.Type]]) -> list[obj.Type]:
+    result, bound = outcome
+    return [*bound.values()] if result is None else [result, *bound.values()]
+
+
+def _bindings(env: obj.Environment, names: set[str]) -> dict[str, object]:
+    return {name: env[name] if name in env else _MISSING for name in names}
+
+
+def _restore(env: obj.Environment, bindings: dict[str, object]) -> None:
+    for name, value in bindings.items():
+        if value is not _MISSING:
+            env[name] = value
+        elif name in env:
+            del env[name]
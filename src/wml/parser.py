@@ -25,6 +25,7 @@ from wml.ast import (
 from wml.errors import SyntaxError, Error, ParseError
 from wml.lexer import Lexer
 from wml.token import Token, TokenType
+from wml.utils.strings import unquote
 
 
 # Type aliases for parsing functions
@@ -511,7 +512,7 @@ class Parser:
 
     def _parse_string_literal(self) -> Optional[Expression]:
         assert self._current_token is not None
-        return StringLiteral(token=self._current_token, value=self._current_token.literal)
+        return StringLiteral(token=self._current_token, value=unquote(self._current_token.literal))
 
     def _parse_variable(self, typing: Token | None = None) -> Optional[Variable]:
         assert self._current_token is not None
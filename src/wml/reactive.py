@@ -0,0 +1,126 @@
+from typing import NamedTuple, Optional
+
+from wml import ast
+from wml import object as obj
+from wml.analysis import scope_assigned_names
+from wml.evaluator import evaluate
+
+_MISSING = object()
+
+# Values that compare by content, so that recomputing the same one stops the update
+SCALARS = (obj.Boolean, obj.Float, obj.Integer, obj.String)
+
+
+class UpdateStats(NamedTuple):
+    recomputed: int
+    statements: int
+
+
+class _Recorder(dict):
+    """The names of the top-level scope, remembering which ones are looked up and set."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.reads: set[str] = set()
+        self.writes: set[str] = set()
+
+    def get(self, key: str, default: object = None) -> object:
+        self.reads.add(key)
+        return super().get(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        self.reads.add(key)
+        return super().__contains__(key)
+
+    def __getitem__(self, key: str) -> object:
+        self.reads.add(key)
+        return super().__getitem__(key)
+
+    def __setitem__(self, key: str, value: object) -> None:
+        self.writes.add(key)
+        super().__setitem__(key, value)
+
+
+class ReactiveProgram:
+    """A program whose top-level statements only run again when what they read changes.
+
+    `run` evaluates every statement once and records the names each one reads,
+    including the ones read by the actions it calls. Afterwards, `set` binds a name
+    from the host and only evaluates again the statements that read it, then the
+    ones reading what those set, and so on, like a spreadsheet. A statement whose
+    value comes out the same does not update its dependents.
+
+    A name set from the host keeps that value: the statement that set it in the
+    program no longer runs. Every name must be set by at most one top-level
+    statement, so that its value is the same for every statement reading it.
+    """
+
+    def __init__(self, program: ast.Program) -> None:
+        repeated = sorted(name for name, count in scope_assigned_names(program.statements).items() if count > 1)
+        if repeated:
+            raise ValueError(f"Names set more than once: {', '.join(repeated)}")
+
+        self._statements = program.statements
+        self._store = _Recorder()
+        self.env = obj.Environment(store=self._store)
+        self._reads: list[set[str]] = [set() for _ in self._statements]
+        self._writes: list[set[str]] = [set() for _ in self._statements]
+        self._results: list[Optional[obj.Type]] = [None for _ in self._statements]
+        self._overridden: set[str] = set()
+        self.last_update: Optional[UpdateStats] = None
+
+    @property
+    def result(self) -> Optional[obj.Type]:
+        """The value of the last statement."""
+        return self._results[-1] if self._results else None
+
+    def run(self) -> Optional[obj.Type]:
+        for idx in range(len(self._statements)):
+            self._evaluate(idx)
+        self.last_update = UpdateStats(len(self._statements), len(self._statements))
+
+        return self.result
+
+    def set(self, name: str, value: obj.Type) -> UpdateStats:
+        """Bind `name` to `value` and update everything that depends on it."""
+        self._overridden.add(name)
+        changed = {name}
+        if not _same(dict.get(self._store, name, _MISSING), value):
+            dict.__setitem__(self._store, name, value)
+            obj.Environment.invalidate()
+        else:
+            changed.clear()
+
+        recomputed = 0
+        for idx, reads in enumerate(self._reads):
+            if not changed or not reads & changed or self._writes[idx] & self._overridden:
+                continue
+
+            before = {name: dict.get(self._store, name, _MISSING) for name in self._writes[idx]}
+            self._evaluate(idx)
+            recomputed += 1
+            changed.update(
+                name for name in self._writes[idx]
+                if not _same(before.get(name, _MISSING), dict.get(self._store, name, _MISSING))
+            )
+
+        self.last_update = UpdateStats(recomputed, len(self._statements))
+        return self.last_update
+
+    def _evaluate(self, idx: int) -> None:
+        # Cached resolutions would skip the lookups to record
+        obj.Environment.invalidate()
+        self._store.reads = set()
+        self._store.writes = set()
+
+        self._results[idx] = evaluate(self._statements[idx], self.env)
+
+        self._reads[idx] = self._store.reads
+        self._writes[idx] = self._store.writes
+
+
+def _same(old: object, new: object) -> bool:
+    if old is new:
+        return True
+
+    return type(old) == type(new) and type(new) in SCALARS and old.value == new.value
@@ -2,6 +2,7 @@ from wml.ast import Program
 from wml.evaluator import evaluate
 from wml.lexer import Lexer
 from wml.object import Environment
+from wml.optimizer import optimize
 from wml.parser import Parser
 from wml.token import Token, TokenType
 
@@ -19,7 +20,7 @@ def start_repl() -> None:
     scanned: list[str] = []
 
     while (source := input(">>> ")) != "exit":
-        if source != "pretty":
+        if source not in ("pretty", "optimized"):
             scanned.append(source)
 
         lexer: Lexer = Lexer("\n".join(scanned))
@@ -30,7 +31,7 @@ def start_repl() -> None:
 
         if len(parser.errors) > 0:
             _print_errors(parser.errors)
-            if source != "pretty":
+            if source not in ("pretty", "optimized"):
                 scanned.pop()
             continue
 
@@ -38,6 +39,10 @@ def start_repl() -> None:
             print(program.beautify())
             continue
 
+        if source == "optimized":
+            print(optimize(program).beautify())
+            continue
+
         evaluated = evaluate(program, env)
 
         if evaluated is not None:
@@ -45,7 +50,7 @@ def start_repl() -> None:
             scanned = program.beautify().split("\n")
 
 
-def execute_file(filename: str) -> None:
+def execute_file(filename: str, optimized: bool = False, print_optimized: bool = False) -> None:
     with open(filename, "r") as f:
         source = f.read()
 
@@ -58,6 +63,12 @@ def execute_file(filename: str) -> None:
         _print_errors(parser.errors)
         return
 
+    if optimized or print_optimized:
+        program = optimize(program)
+
+    if print_optimized:
+        print(program.beautify())
+
     evaluated = evaluate(program, env)
 
     if evaluated is not None:
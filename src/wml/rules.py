@@ -0,0 +1,35 @@
+from typing import Iterable, Iterator, Mapping, Optional
+
+from wml import object as obj
+from wml.compiler import _to_object, compile
+from wml.evaluator import evaluate
+
+# A record of a stream, its fields by name
+Record = Mapping[str, obj.Type | bool | int | float | str]
+
+
+class RuleSet:
+    """Rules, each one a WML program, applied to every record of a stream.
+
+    The rules are compiled once. For each record, they are evaluated in order in a
+    single scope inside `env`, where the fields of the record are bound, so a rule
+    can read the names set by the rules before it. That scope is emptied and used
+    again for the next record, and nothing is kept from one record to the next, so
+    a stream of any length is applied in constant memory.
+
+    Raises ValueError if a rule has syntax errors.
+    """
+
+    def __init__(self, rules: Mapping[str, str], env: Optional[obj.Environment] = None) -> None:
+        self.rules = {name: compile(source).program for name, source in rules.items()}
+        self.env = env
+
+    def apply(self, records: Iterable[Record]) -> Iterator[dict[str, Optional[obj.Type]]]:
+        """Yield the value of each rule for each record of `records`, by rule name, as the records come."""
+        frame = obj.Environment(self.env)
+        rules = list(self.rules.items())
+        for record in records:
+            frame.clear()
+            for field, value in record.items():
+                frame[field] = _to_object(value)
+            yield {name: evaluate(program, frame) for name, program in rules}
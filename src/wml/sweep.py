@@ -0,0 +1,128 @@
+import json
+import os
+from concurrent.futures import Executor, FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice, product
+from typing import Callable, Collection, Iterable, Iterator, NamedTuple, Optional, TextIO
+
+from wml import object as obj
+from wml.ast import Program
+from wml.compiler import CompiledProgram, compile
+from wml.errors import Error
+from wml.interpreters import decode, encode, Encoded
+
+# The values a parameter can take, as Python values
+Value = bool | int | float | str
+Point = dict[str, Value]
+
+# Number of runs sent to a worker at once
+DEFAULT_CHUNK_SIZE = 64
+
+
+class SweepResult(NamedTuple):
+    index: int
+    parameters: Point
+    value: Optional[obj.Type]
+
+
+Sink = Callable[[SweepResult], None]
+
+
+def grid(parameters: dict[str, list[Value]]) -> Iterator[Point]:
+    """Yield every combination of the values of `parameters`, the last one varying fastest."""
+    names = list(parameters)
+    for values in product(*parameters.values()):
+        yield dict(zip(names, values))
+
+
+def sweep(
+        program: Program | str,
+        parameters: dict[str, list[Value]],
+        sink: Sink,
+        executor: Optional[Executor] = None,
+        workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        skip: Collection[int] = (),
+) -> int:
+    """Evaluate `program` once per point of the grid of `parameters`, and return the number of runs.
+
+    Each run starts from an environment where the parameters are already bound to
+    the values of its point. The program is parsed once, and the runs are sent to
+    the `workers` of `executor`, a pool of processes by default, in chunks of
+    `chunk_size`. Only a few chunks are in flight at a time, so the grid is never
+    held in memory, and `sink` gets the results of each chunk as soon as it is
+    done, so in no particular order.
+
+    The points whose index is in `skip` are left out, as when resuming a sweep that
+    stopped, see `completed`.
+    """
+    if isinstance(program, str):
+        program = compile(program).program
+    if executor is None:
+        with ProcessPoolExecutor(workers) as executor:
+            return sweep(program, parameters, sink, executor, workers, chunk_size, skip)
+
+    points = ((idx, point) for idx, point in enumerate(grid(parameters)) if idx not in skip)
+    chunks = iter(lambda: list(islice(points, chunk_size)), [])
+    # Enough chunks to keep every worker busy while the results of others are handled
+    limit = 2 * (workers or os.cpu_count() or 1)
+
+    runs = 0
+    pending: set[Future] = set()
+    for chunk in chunks:
+        pending.add(executor.submit(_run_chunk, program, chunk))
+        if len(pending) >= limit:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            runs += _drain(done, sink)
+    runs += _drain(wait(pending).done, sink)
+
+    return runs
+
+
+def completed(lines: Iterable[str]) -> set[int]:
+    """Return the indexes of the runs already written by `json_sink`, ignoring a truncated last line."""
+    indexes = set()
+    for line in lines:
+        try:
+            indexes.add(json.loads(line)["index"])
+        except (ValueError, KeyError):
+            continue
+
+    return indexes
+
+
+def json_sink(output: TextIO) -> Sink:
+    """Return a sink writing each result to `output` as a line of JSON."""
+
+    def write(result: SweepResult) -> None:
+        value = result.value
+        output.write(json.dumps({
+            "index": result.index,
+            "parameters": result.parameters,
+            "type": None if value is None else str(value.type()),
+            "value": None if value is None else _to_json(value),
+        }) + "\n")
+        output.flush()
+
+    return write
+
+
+def _run_chunk(program: Program, chunk: list[tuple[int, Point]]) -> list[tuple[int, Point, Optional[Encoded]]]:
+    compiled = CompiledProgram(program)
+    return [(idx, point, encode(compiled.run(point))) for idx, point in chunk]
+
+
+def _drain(futures: Iterable[Future], sink: Sink) -> int:
+    runs = 0
+    for future in futures:
+        for idx, point, encoded in future.result():
+            sink(SweepResult(idx, point, decode(encoded)))
+            runs += 1
+
+    return runs
+
+
+def _to_json(value: obj.Type) -> object:
+    if isinstance(value, Error) or type(value) == obj.Null:
+        return value.inspect()
+
+    return value.value
@@ -0,0 +1,72 @@
+from typing import Optional
+
+from wml import ast
+from wml.analysis import captured_names, free_names, statement_dependencies, walk
+from wml.evaluator import evaluate
+from wml.lexer import Lexer
+from wml.object import Action, Environment
+from wml.parser import Parser
+
+
+def test_free_names() -> None:
+    tests: list[tuple[str, set[str]]] = [
+        ("action(a) { a + b };", {"b"}),
+        ("action(a) { int c = a; c + d };", {"c", "d"}),
+        ("action(a) { action(b) { a + b + c } };", {"c"}),
+        ("action(a) { f(a, length) };", {"f", "length"}),
+    ]
+
+    for source, expected in tests:
+        assert free_names(_actions_test(source)[0]) == expected
+
+
+def test_captured_names() -> None:
+    tests: list[tuple[str, Optional[frozenset[str]]]] = [
+        ("action(a, b) { int c = a * 2; action(x) { x + c } };", frozenset({"c"})),
+        ("action(a) { action() { n } };", frozenset()),
+        ("action(a) { int g = action() { a }; int a = 2; g };", None),  # `a` is set again
+        ("action() { int f = action(n) { f(n) }; f };", None),  # `f` is set once `f` is created
+        ("action(a) { if (a) { int b = 1; }; action() { b } };", frozenset({"b"})),
+        ("action(a) { action() { action() { a } } };", frozenset({"a"})),
+    ]
+
+    for source, expected in tests:
+        outer, inner = _actions_test(source)[:2]
+        assert captured_names(outer)[inner] == expected
+
+
+def test_closures_only_keep_what_they_use() -> None:
+    env = Environment()
+    source = "int make = action(a, b) { int big = a * 1000; return action(x) { x + b }; }; int add = make(1, 2); add(3);"
+
+    assert evaluate(_parse_test(source), env).inspect() == "5"
+    add = env["add"]
+    assert isinstance(add, Action)
+    assert add.env.keys() == ["b"]
+
+
+def test_statement_dependencies() -> None:
+    tests: list[tuple[str, list[set[int]]]] = [
+        ("int a = 1; int b = 2; int c = a + b;", [set(), set(), {0, 1}]),
+        ("int a = 1; int b = a; int a = 2;", [set(), {0}, {0, 1}]),  # `a` is read before it is set again
+        ("int k = 1; int f = action(x) { x * k }; int k = 2; f(1);", [set(), {0}, {0, 1}, {1, 2}]),
+        ("int a = 1; return a; int b = 2;", [set(), {0}, {1}]),
+        ("int a = 1; if (a > 0) { int b = a; }; b;", [set(), {0}, {0, 1}]),
+    ]
+
+    for source, expected in tests:
+        assert statement_dependencies(_parse_test(source).statements) == [frozenset(deps) for deps in expected]
+
+
+def _actions_test(source: str) -> list[ast.Action]:
+    return [node for node in walk(_parse_test(source)) if type(node) == ast.Action]
+
+
+def _parse_test(source: str) -> ast.Program:
+    lexer: Lexer = Lexer(source)
+    parser: Parser = Parser(lexer)
+    program: ast.Program = parser.parse_program()
+
+    assert len(parser.errors) == 0, f"Errors found: {parser.errors}"
+
+    return program
@@ -0,0 +1,71 @@
+import pytest
+
+from wml import ast
+from wml.budget import Budget
+from wml.errors import BudgetExceeded
+from wml.evaluator import evaluate
+from wml.lexer import Lexer
+from wml.object import Environment
+from wml.parser import Parser
+
+RUNAWAY = "int spin = action(n) { spin(n + 1) }; spin(0);"
+GROWTH = "int grow = action(n, v) { if (n == 0) { return v; }; grow(n - 1, v * v) }; grow(30, 3);"
+WORK = "int work = action(n, s) { if (n < 2) { return 1; }; return work(n - 1, s * 2) + work(n - 2, s * 2 + 1); }; work(12, 1);"
+
+
+@pytest.mark.parametrize("source, budget, limit", [
+    (WORK, Budget(steps=100), "steps"),
+    (RUNAWAY, Budget(depth=50), "depth"),
+    (WORK.replace("work(12, 1)", "work(40, 1)"), Budget(seconds=0.01), "seconds"),
+    (GROWTH, Budget(int_bits=4096), "int_bits"),
+])
+def test_limits(source: str, budget: Budget, limit: str) -> None:
+    result = evaluate(_parse_test(source), Environment(), budget)
+
+    assert isinstance(result, BudgetExceeded)
+    assert result.limit == limit
+
+
+@pytest.mark.parametrize("budget", [Budget(seconds=0.2), Budget(depth=10 ** 9)])
+def test_running_out_of_stack(budget: Budget) -> None:
+    # Without a depth limit, or with one too high to be reached
+    result = evaluate(_parse_test(RUNAWAY), Environment(), budget)
+    limited = evaluate(_parse_test(RUNAWAY), Environment(), Budget(depth=50))
+
+    assert isinstance(result, BudgetExceeded)
+    assert result.limit == "depth"
+    assert (result.line, result.column) == (limited.line, limited.column)
+
+
+def test_powers_are_checked_before_they_are_computed() -> None:
+    program = _parse_test("3 * 100000000000;")
+    # The parser has no `**` yet
+    program.statements[0].expression.operator = "**"
+
+    result = evaluate(program, Environment(), Budget(int_bits=4096))
+
+    assert isinstance(result, BudgetExceeded)
+    assert result.limit == "int_bits"
+
+
+def test_within_budget() -> None:
+    budget = Budget(steps=1000, seconds=60.0, depth=50, int_bits=4096)
+
+    assert evaluate(_parse_test(WORK), Environment(), budget).inspect() == "233"
+    assert evaluate(_parse_test(GROWTH.replace("grow(30, 3)", "grow(5, 3)")), Environment(), budget).inspect() == str(3 ** 32)
+
+
+def test_evaluations_without_a_budget_are_not_metered() -> None:
+    evaluate(_parse_test(RUNAWAY.replace("spin(0)", "0")), Environment(), Budget(steps=1))
+
+    assert evaluate(_parse_test(WORK), Environment()).inspect() == "233"
+
+
+def _parse_test(source: str) -> ast.Program:
+    lexer: Lexer = Lexer(source)
+    parser: Parser = Parser(lexer)
+    program: ast.Program = parser.parse_program()
+
+    assert len(parser.errors) == 0, f"Errors found: {parser.errors}"
+
+    return program
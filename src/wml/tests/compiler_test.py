@@ -0,0 +1,51 @@
+import pytest
+
+import wml
+from wml.compiler import ProgramCache
+from wml.evaluator import evaluate
+from wml.object import Environment
+
+
+def test_programs_are_compiled_once() -> None:
+    cache = ProgramCache()
+
+    first = cache.compile("int a = 1; a + 2;")
+    assert cache.compile("int a = 1; a + 2;") is first
+    assert cache.compile("int a = 1; a + 3;") is not first
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 2, 2)
+    assert stats.hit_rate == 1 / 3
+
+
+def test_least_recently_used_programs_are_evicted_by_size() -> None:
+    cache = ProgramCache(max_size=20)
+
+    for source in ["1 + 1;", "2 + 2;", "1 + 1;", "3 + 3;", "4 + 4;", "1 + 1;", "2 + 2;"]:
+        cache.compile(source)
+
+    # Each source is 6 characters long, so only 3 of them are kept at once
+    assert cache.stats() == (2, 5, 2, 3, 18, 20)
+    cache.compile("x" * 21 + ";")
+    assert cache.stats().entries == 3
+
+
+def test_run_binds_python_values() -> None:
+    program = wml.compile("if (flag) { name + '!' } else { count * 2 + ratio };")
+
+    assert program.run({"flag": True, "name": "wml", "count": 1, "ratio": 0.5}).inspect() == '"wml!"'
+    assert program.run({"flag": False, "name": "wml", "count": 1, "ratio": 0.5}).inspect() == "2.5"
+
+
+def test_runs_do_not_share_bindings() -> None:
+    env = Environment()
+    evaluate(wml.compile("int k = 10;").program, env)
+    program = wml.compile("int a = if (a) { a + 1 } else { k }; a;")
+
+    assert program.run({"a": 0}, env).inspect() == "10"
+    assert program.run({"a": 5}, env).inspect() == "6"
+    assert "a" not in env
+
+
+def test_syntax_errors() -> None:
+    with pytest.raises(ValueError):
+        wml.compile("(1;")
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from wml import ast
+from wml.budget import Budget
+from wml.cooperative import evaluate_async
+from wml.errors import BudgetExceeded
+from wml.evaluator import evaluate
+from wml.lexer import Lexer
+from wml.object import Environment
+from wml.parser import Parser
+
+WORK = "int work = action(n, s) { if (n < 2) { return 1; }; return work(n - 1, s * 2) + work(n - 2, s * 2 + 1); }; work(14, 1);"
+
+
+@pytest.mark.parametrize("source", [
+    "1 + 2;",
+    WORK,
+    "int a = 1; return a + 1; a;",
+    "int a = x;",
+])
+def test_same_as_evaluate(source: str) -> None:
+    result = asyncio.run(evaluate_async(_parse_test(source), Environment(), interval=10))
+
+    assert result.inspect() == evaluate(_parse_test(source), Environment()).inspect()
+
+
+def test_evaluations_take_turns_with_other_tasks() -> None:
+    ticks: list[int] = []
+
+    async def ticker() -> None:
+        while True:
+            ticks.append(len(ticks))
+            await asyncio.sleep(0)
+
+    async def main() -> list[str]:
+        task = asyncio.create_task(ticker())
+        results = await asyncio.gather(*(
+            evaluate_async(_parse_test(WORK), Environment(), interval=50) for _ in range(3)
+        ))
+        task.cancel()
+        return [result.inspect() for result in results]
+
+    assert asyncio.run(main()) == ["610"] * 3
+    # Each evaluation makes about 1200 calls, so pauses about 24 times
+    assert len(ticks) > 20
+
+
+def test_cancellation() -> None:
+    async def main() -> None:
+        task = asyncio.create_task(evaluate_async(_parse_test(WORK.replace("14", "40")), Environment(), interval=10))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize("interval", [0, -1])
+def test_invalid_interval(interval: int) -> None:
+    with pytest.raises(ValueError):
+        asyncio.run(evaluate_async(_parse_test(WORK), Environment(), interval=interval))
+
+
+def test_budget() -> None:
+    result = asyncio.run(evaluate_async(_parse_test(WORK), Environment(), budget=Budget(steps=100)))
+
+    assert isinstance(result, BudgetExceeded)
+
+
+def _parse_test(source: str) -> ast.Program:
+    lexer: Lexer = Lexer(source)
+    parser: Parser = Parser(lexer)
+    program: ast.Program = parser.parse_program()
+
+    assert len(parser.errors) == 0, f"Errors found: {parser.errors}"
+
+    return program
@@ -0,0 +1,23 @@
+from wml.errors import TypeMismatch, _TypeError, UnknownPrefixOperator
+from wml.object import Integer, Boolean
+
+
+def test_error_message_formatting() -> None:
+    tests = [
+        (TypeMismatch(Integer.type(), "+", Boolean.type(), 1, 3), "TypeMismatch: Integer + Boolean on line 1, column 3"),
+        (UnknownPrefixOperator("-", Boolean.type(), 1, 1), "UnknownPrefixOperator: -Boolean on line 1, column 1"),
+        (_TypeError("foobar", 1, 1), "TypeError: foobar, line 1, column 1"),
+    ]
+
+    for error, expected in tests:
+        assert error.message == expected
+        assert str(error) == expected
+        assert error.inspect() == expected
+
+
+def test_error_stores_only_structured_fields() -> None:
+    error = TypeMismatch(Integer.type(), "+", Boolean.type(), 1, 3)
+
+    assert not hasattr(error, "__dict__")
+    assert (error.left, error.operator, error.right) == (Integer.type(), "+", Boolean.type())
+    assert (error.line, error.column) == (1, 3)
@@ -1,9 +1,12 @@
+import gc
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from typing import cast, Any, Union
 
 import wml.object as obj
 from wml.ast import Program
 from wml.errors import Error
-from wml.evaluator import evaluate, NULL
+from wml.evaluator import evaluate
 from wml.lexer import Lexer
 from wml.parser import Parser
 
@@ -47,6 +50,12 @@ def test_action_call_evaluation() -> None:
             };
             add(8, add(5, 3));
         """, 16),
+        ("""
+            int sub = action(a, b) {
+                return a - b;
+            };
+            sub(10, 3);
+        """, 7),
         ("action(a) { return a + 5; }(5);", 10),
         ("""
             bool tell_if_is_adult = action(int age) {
@@ -70,6 +79,39 @@ def test_action_call_evaluation() -> None:
             assert False, f"Unexpected type: {type(evaluated)}"
 
 
+def test_action_resolution_follows_rebinding() -> None:
+    tests: list[tuple[str, int]] = [
+        ("int f = action() { 1 }; int g = action() { f() }; int a = g(); int f = action() { 2 }; a + g();", 3),
+        ("int f = action() { 1 }; int g = action(f) { f() }; g(action() { 5 }) + g(f);", 6),
+        ("int h = action(s) { length(s) }; int a = h('ab'); int length = action(s) { 10 }; a + h('ab');", 12),
+        ("""
+            int make = action() {
+                int g = action() { f() };
+                int f = action() { 3 };
+                int a = g();
+                int f = action() { 4 };
+                return a + g();
+            };
+            make();
+        """, 7),
+    ]
+
+    for source, expected in tests:
+        _test_integer_object(_evaluate_test(source), expected)
+
+
+def test_call_sites_do_not_keep_their_environments() -> None:
+    program = Parser(Lexer("int f = action() { 1 }; int g = action() { f() }; g();")).parse_program()
+    env = obj.Environment()
+    evaluate(program, env)
+    env_ref = weakref.ref(env)
+
+    del env
+    gc.collect()
+
+    assert env_ref() is None
+
+
 def test_assignment_evaluation() -> None:
     tests: list[tuple[str, Any]] = [
         ("int a = 5; a;", 5),
@@ -187,6 +229,11 @@ def test_error_handling() -> None:
         """, "UnknownInfixOperator: Boolean + Boolean on line 4, column 33"),
         ("foobar", "TypeError: foobar, line 1, column 1"),
         ('"Hello" / "World"', "UnknownInfixOperator: String / String on line 1, column 8"),
+        ("int f = action(a) { return a + True; }; f(1); 5;", "TypeMismatch: Integer + Boolean on line 1, column 30"),
+        ("length(foobar)", "TypeError: foobar, line 1, column 9"),
+        ("5(1)", "NotAnActionError: Integer, line 1, column 2"),
+        ("int b = 5; int add = action(a, b) { return a + b; }; add(1);", "InvalidNumberOfArguments: Expected 2, got 1"),
+        ("int add = action(a, b) { return a + b; }; add(1, 2, 3);", "InvalidNumberOfArguments: Expected 2, got 3"),
     ]
 
     for source, expected in tests:
@@ -275,6 +322,20 @@ def test_return_evaluation() -> None:
                 return 10;
             }
         """, 9),
+        ("""
+            int sign = action(a) {
+                if (a > 0) {
+                    return 1;
+                };
+                return 0;
+            };
+            sign(5) + sign(-5);
+        """, 1),
+        ("""
+            int identity = action(a) { return a; };
+            int next = action(b) { identity(b); return b + 1; };
+            next(3);
+        """, 4),
     ]
 
     for source, expected in tests:
@@ -295,7 +356,22 @@ def test_string_evaluation() -> None:
 
     for source, expected in tests:
         evaluated = _evaluate_test(source)
-        _test_string_object(evaluated, expected)
+        assert isinstance(evaluated, obj.String)
+        assert evaluated.token.literal == expected
+
+
+def test_string_inspect() -> None:
+    tests: list[tuple[str, str, str]] = [
+        ('"Hello, World!"', "Hello, World!", '"Hello, World!"'),
+        ("action() { return 'WML is awesome!'; }();", "WML is awesome!", '"WML is awesome!"'),  # Double quotes preferred
+        ("'Say \"Hi\"'", 'Say "Hi"', "'Say \"Hi\"'"),  # Single quotes when the content has double quotes
+    ]
+
+    for source, value, expected in tests:
+        evaluated = _evaluate_test(source)
+        assert isinstance(evaluated, obj.String)
+        assert evaluated.value == value
+        assert evaluated.inspect() == expected
 
 
 def test_string_concatenation() -> None:
@@ -314,7 +390,16 @@ def test_string_concatenation() -> None:
             hello("Kenny");
             ''',
             '"Hello, Kenny!"',
-        )
+        ),
+        (
+            '''
+            str base = "Foo";
+            str left = base + "Bar";
+            str right = base + "Baz";
+            left + right + base;
+            ''',
+            '"FooBarFooBazFoo"',
+        ),  # Concatenations branching off the same string
     ]
 
     for source, expected in tests:
@@ -354,6 +439,27 @@ def test_string_comparison() -> None:
         _test_boolean_object(evaluated, expected)
 
 
+def test_values_are_not_shared_between_evaluations() -> None:
+    first = _evaluate_test("1 < 2")
+    second = _evaluate_test("3 < 4")
+
+    assert first is not second
+    assert (first.token.literal, second.token.literal) == ("2", "4")
+    assert _evaluate_test("!(5 > 6)").value is True
+
+
+def test_concurrent_evaluations() -> None:
+    tests: list[tuple[str, str]] = [
+        ("int f = action(n) { if (n < 2) { return n; }; return f(n - 1) + f(n - 2); }; f(15);", "610"),
+        ("str s = 'a'; int g = action(t) { t + t }; g(s) + g(s + 'b');", '"aaabab"'),
+        ("int a = 1; if (a > 1) { 1 } else { (a == 1) == True };", "True"),
+    ]
+
+    with ThreadPoolExecutor(8) as executor:
+        for source, expected in tests:
+            assert list(executor.map(lambda _: _evaluate_test(source).inspect(), range(32))) == [expected] * 32
+
+
 def _evaluate_test(source: str) -> obj.Type:
     lexer: Lexer = Lexer(source)
     parser: Parser = Parser(lexer)
@@ -411,11 +517,11 @@ def _test_integer_object(evaluated: obj.Type, expected: int) -> None:
 
 
 def _test_null_object(evaluated: obj.Type) -> None:
-    assert evaluated is NULL
+    assert isinstance(evaluated, obj.Null)
 
 
 def _test_string_object(evaluated: obj.Type, expected: str) -> None:
     assert isinstance(evaluated, obj.String)
 
     evaluated = cast(obj.String, evaluated)
-    assert evaluated.value == expected
+    assert evaluated.inspect() == expected
@@ -0,0 +1,45 @@
+import gc
+from multiprocessing import get_all_start_methods
+
+import pytest
+
+from wml.forkserver import ForkServer
+
+pytestmark = pytest.mark.skipif("fork" not in get_all_start_methods(), reason="Forking is only available on POSIX")
+
+LIBRARY = """
+int scale = 3;
+int triple = action(x) { x * scale };
+int fib = action(n) { if (n < 2) { return n; }; return fib(n - 1) + fib(n - 2); };
+"""
+
+
+def test_jobs_see_the_library() -> None:
+    with ForkServer(LIBRARY, workers=2) as server:
+        results = list(server.map(["triple(14);", "fib(20);", "int scale = 5; triple(1) + scale;", "y;"]))
+
+    assert [result.inspect() for result in results] == ["42", "6765", "8", "TypeError: y, line 1, column 2"]
+
+
+def test_jobs_do_not_see_each_other() -> None:
+    with ForkServer(LIBRARY, workers=1) as server:
+        server.run("int a = 1;")
+
+        assert server.run("a;").inspect().startswith("TypeError: a")
+        assert server.run("scale;").inspect() == "3"
+
+
+def test_the_collector_of_this_process_is_left_alone() -> None:
+    frozen = gc.get_freeze_count()
+    with ForkServer(LIBRARY, workers=1) as server:
+        assert gc.get_freeze_count() == frozen
+        assert server.run("fib(10);").inspect() == "55"
+
+    assert gc.get_freeze_count() == frozen
+
+
+def test_library_errors_are_raised() -> None:
+    with pytest.raises(ValueError):
+        ForkServer("int a = x;", workers=1)
+    with pytest.raises(ValueError):
+        ForkServer("int = ;", workers=1)
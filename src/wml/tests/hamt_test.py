@@ -0,0 +1,109 @@
+from wml.ast import Program
+from wml.evaluator import evaluate
+from wml.hamt import HAMT, PersistentDict
+from wml.lexer import Lexer
+from wml.object import Environment
+from wml.parser import Parser
+
+
+class _Key:
+    # Keys whose hashes collide as much as wanted
+
+    def __init__(self, name: str, hash_: int) -> None:
+        self.name = name
+        self.hash = hash_
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Key) and self.name == other.name
+
+    def __hash__(self) -> int:
+        return self.hash
+
+
+def test_set_get_and_delete() -> None:
+    mapping = HAMT()
+    for idx in range(2_000):
+        mapping = mapping.set(f"name{idx}", idx)
+
+    assert len(mapping) == 2_000
+    assert all(mapping[f"name{idx}"] == idx for idx in range(2_000))
+    assert mapping.get("missing") is None
+
+    for idx in range(0, 2_000, 2):
+        mapping = mapping.delete(f"name{idx}")
+
+    assert len(mapping) == 1_000
+    assert sorted(mapping) == sorted(f"name{idx}" for idx in range(1, 2_000, 2))
+    assert "name0" not in mapping and "name1" in mapping
+
+
+def test_colliding_hashes() -> None:
+    keys = [_Key("a", 7), _Key("b", 7), _Key("c", 7 + (1 << 40)), _Key("d", -7)]
+    mapping = HAMT()
+    for idx, key in enumerate(keys):
+        mapping = mapping.set(key, idx)
+
+    assert [mapping[key] for key in keys] == [0, 1, 2, 3]
+    assert mapping.get(_Key("e", 7)) is None
+
+    for key in keys:
+        mapping = mapping.delete(key)
+        assert key not in mapping
+
+    assert len(mapping) == 0
+
+
+def test_older_versions_are_unchanged() -> None:
+    base = HAMT().set("a", 1).set("b", 2)
+    changed = base.set("a", 10).delete("b").set("c", 3)
+
+    assert dict(base.items()) == {"a": 1, "b": 2}
+    assert dict(changed.items()) == {"a": 10, "c": 3}
+    assert base.set("a", 1) is base
+    assert base.delete("missing") is base
+
+
+def test_forks_are_independent() -> None:
+    base = PersistentDict()
+    base["a"] = 1
+    fork = base.fork()
+    fork["a"] = 2
+    fork["b"] = 3
+    base["c"] = 4
+
+    assert dict(base) == {"a": 1, "c": 4}
+    assert dict(fork) == {"a": 2, "b": 3}
+
+
+def test_forked_scenarios() -> None:
+    base = Environment(persistent=True)
+    evaluate(_parse_test("int rate = 2; int size = 10;"), base)
+
+    scenario = base.fork()
+    result = evaluate(_parse_test("int rate = 3; rate * size;"), scenario)
+
+    assert result.inspect() == "30"
+    assert base["rate"].inspect() == "2"
+    assert scenario["size"] is base["size"]
+
+
+def test_forked_actions_keep_reading_the_base() -> None:
+    base = Environment(persistent=True)
+    evaluate(_parse_test("int rate = 2; int f = action() { rate * 5 };"), base)
+
+    scenario = base.fork()
+    kept = evaluate(_parse_test("int rate = 3; f();"), scenario)
+    redefined = evaluate(_parse_test("int f = action() { rate * 5 }; f();"), scenario)
+
+    assert kept.inspect() == "10"
+    assert redefined.inspect() == "15"
+
+
+def _parse_test(source: str) -> Program:
+    lexer: Lexer = Lexer(source)
+    parser: Parser = Parser(lexer)
+    program: Program = parser.parse_program()
+
+    assert len(parser.errors) == 0, f"Errors found: {parser.errors}"
+
+    return program
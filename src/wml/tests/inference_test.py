@@ -0,0 +1,90 @@
+import pytest
+
+from wml import ast
+from wml.analysis import walk
+from wml.evaluator import evaluate
+from wml.inference import infer_types
+from wml.lexer import Lexer
+from wml.object import Environment
+from wml.parser import Parser
+from wml.token import TokenType
+
+
+def test_operations_on_known_types() -> None:
+    tests: list[tuple[str, list[TokenType | None]]] = [
+        ("1 + 2;", [TokenType.INT_TYPE]),
+        ("1.5 * 2.0;", [TokenType.FLOAT_TYPE]),
+        ("1 / 2;", [None]),
+        ("1 + 2.0;", [None]),
+        ("(1 + 2) * 3.0 - 0.5;", [TokenType.FLOAT_TYPE, None, TokenType.INT_TYPE]),
+        ("'a' + 'b';", [None]),
+        ("int a = 1; a * a;", [TokenType.INT_TYPE]),
+        ("int a = x; a * a;", [None]),
+        ("int a = 1; if (x) { flt a = 1.0; }; a * a;", [None]),
+        ("int a = 1; if (x) { int a = 2; } else { int a = 3; }; a * a;", [TokenType.INT_TYPE]),
+        ("int a = 1; action(b) { a + b };", [None]),
+    ]
+
+    for source, expected in tests:
+        program = _infer_test(source)
+        assert [node.operand_type for node in walk(program) if type(node) == ast.Infix] == expected
+
+
+def test_set_statements_with_known_types() -> None:
+    program = _infer_test("int a = 1 + 2; flt b = a; str c = 'x'; bool d = True; int e = 1.5;")
+
+    assert [node.value_type for node in walk(program) if type(node) == ast.SetStatement] == [
+        TokenType.INT_TYPE, None, TokenType.STR_TYPE, None, None,
+    ]
+
+
+def test_actions_with_typed_parameters_are_specialized() -> None:
+    program = _infer_test("action(int a, b) { int c = a * 2; c + b };")
+    action = next(node for node in walk(program) if type(node) == ast.Action)
+
+    assert action.specialized is not None
+    assert [node.operand_type for node in walk(action.specialized) if type(node) == ast.Infix] == [
+        TokenType.INT_TYPE, None,
+    ]
+    assert [node.operand_type for node in walk(action.body) if type(node) == ast.Infix] == [None, None]
+
+
+def test_nested_actions_are_shared_by_the_specialized_body() -> None:
+    program = _infer_test("action(int a) { action(int b) { action(int c) { a * b * c } } };")
+    outer, middle, inner = [node for node in walk(program) if type(node) == ast.Action]
+
+    assert outer.specialized.statements[0].expression is middle
+    assert middle.specialized.statements[0].expression is inner
+    assert inner.specialized is not None
+
+
+@pytest.mark.parametrize("source", [
+    "int twice = action(int a) { a * 2 }; twice(21);",
+    "int twice = action(int a) { a * 2 }; twice(1.5);",
+    "int twice = action(int a) { a * 2 }; twice(True);",
+    "flt f = action(flt x, int n) { if (n < 1) { return x; }; return f(x * 0.5, n - 1); }; f(8.0, 3);",
+    "flt f = action(flt x, int n) { if (n < 1) { return x; }; return f(x * 0.5, n - 1); }; f(8, 3);",
+    "bool b = 1 < 2; b;",
+    "int a = 1; if (a > 0) { int a = a * 10; }; a + 1;",
+])
+def test_typed_program_evaluates_the_same(source: str) -> None:
+    expected = evaluate(_parse_test(source), Environment()).inspect()
+
+    assert evaluate(_infer_test(source), Environment()).inspect() == expected
+
+
+def _infer_test(source: str) -> ast.Program:
+    program = _parse_test(source)
+    infer_types(program)
+
+    return program
+
+
+def _parse_test(source: str) -> ast.Program:
+    lexer: Lexer = Lexer(source)
+    parser: Parser = Parser(lexer)
+    program: ast.Program = parser.parse_program()
+
+    assert len(parser.errors) == 0, f"Errors found: {parser.errors}"
+
+    return program
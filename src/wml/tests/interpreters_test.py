@@ -0,0 +1,51 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from wml.interpreters import decode, encode, evaluate_sources, InterpreterPoolExecutor, run_source
+
+SOURCES = [
+    "int a = 2; a * 21;",
+    "1.5 + 1;",
+    "'a' + 'b';",
+    "1 < 2;",
+    "if (False) { 1 };",
+    "int a = x;",
+    "return 7; 8;",
+    "int a = 1;",
+]
+
+
+@pytest.mark.parametrize("source", SOURCES)
+def test_encoded_values_decode_to_the_same(source: str) -> None:
+    encoded = run_source(source)
+
+    assert encode(decode(encoded)) == encoded
+
+
+def test_actions_are_not_encoded() -> None:
+    with pytest.raises(TypeError):
+        run_source("action(x) { x };")
+
+
+def test_parse_errors_are_raised() -> None:
+    with pytest.raises(ValueError):
+        run_source("int = ;")
+
+
+def test_evaluate_sources_in_any_executor() -> None:
+    with ThreadPoolExecutor(2) as executor:
+        results = evaluate_sources(SOURCES, executor)
+
+    assert [result and result.inspect() for result in results] == [
+        "42", "2.5", '"ab"', "True", "Null", "TypeError: x, line 1, column 10", "7", None,
+    ]
+
+
+@pytest.mark.skipif(InterpreterPoolExecutor is None, reason="Sub-interpreters need Python 3.14 or later")
+def test_evaluate_sources_in_sub_interpreters() -> None:
+    results = evaluate_sources(SOURCES)
+
+    assert [result and result.inspect() for result in results] == [
+        result and result.inspect() for result in evaluate_sources(SOURCES, ThreadPoolExecutor(1))
+    ]
@@ -0,0 +1,105 @@
+from wml.ast import Program
+from wml.evaluator import evaluate
+from wml.lexer import Lexer
+from wml.memo import memoize
+from wml.object import Action, BuiltIn, Environment, Integer
+from wml.parser import Parser
+from wml.token import Token, TokenType
+
+FIB = "int fib = action(n) { if (n < 2) { return n; }; return fib(n - 1) + fib(n - 2); };"
+
+
+def test_actions_are_not_memoized_by_default() -> None:
+    env = Environment()
+    evaluate(_parse_test(FIB + "fib(10);"), env)
+
+    assert env["fib"].memo is None
+
+
+def test_recursive_calls_are_memoized() -> None:
+    env = Environment()
+    evaluate(_parse_test(FIB), env)
+    memo = memoize(env["fib"])
+    result = evaluate(_parse_test("fib(30);"), env)
+
+    assert result.inspect() == "832040"
+    # fib(n - 1) and fib(n - 2) pass the same value from two places
+    stats = memo.stats()
+    assert (stats.hits, stats.misses, stats.size) == (54, 59, 59)
+
+
+def test_memo_is_dropped_when_a_name_it_reads_is_rebound() -> None:
+    env = Environment()
+    evaluate(_parse_test("int k = 2; int f = action(n) { return n * k; };"), env)
+    memoize(env["f"])
+
+    assert evaluate(_parse_test("int a = f(3); int k = 10; a + f(3);"), env).inspect() == "36"
+
+
+def test_negative_zero_is_another_argument() -> None:
+    env = Environment()
+    evaluate(_parse_test("flt id = action(x) { return x; };"), env)
+    memoize(env["id"])
+
+    assert evaluate(_parse_test("id(0.0); id(-0.0);"), env).inspect() == "-0.0"
+
+
+def test_results_keep_the_positions_of_their_call() -> None:
+    source = "int id = action(n) { return n; };\nid(5);\nid(5)(1);"
+    env = Environment()
+    evaluate(_parse_test(source.split(";")[0] + ";"), env)
+    memoize(env["id"])
+
+    assert evaluate(_parse_test(source), env).inspect() == evaluate(_parse_test(source), Environment()).inspect()
+
+
+def test_memo_evicts_least_recently_used_results() -> None:
+    env = Environment()
+    evaluate(_parse_test("int double = action(n) { n * 2 };"), env)
+    memoize(env["double"], capacity=2)
+
+    for source in ["double(1);", "double(2);", "double(1);", "double(3);", "double(1);", "double(2);"]:
+        evaluate(_parse_test(source), env)
+
+    assert env["double"].memo.stats() == (2, 4, 2, 2, 2)
+
+
+def test_actions_reaching_impure_builtins_are_not_memoized() -> None:
+    calls: list[int] = []
+
+    def tick() -> Integer:
+        calls.append(1)
+        return Integer(len(calls), Token(TokenType.INT_VALUE, str(len(calls))))
+
+    env = Environment()
+    env["tick"] = BuiltIn(tick)
+    evaluate(_parse_test("int f = action(n) { n + tick() }; int g = action(n) { f(n) };"), env)
+    memoize(env["f"])
+    memoize(env["g"])
+    result = evaluate(_parse_test("g(1) + g(1);"), env)
+
+    assert result.inspect() == "5"
+    assert env["g"].memo.stats().size == 0
+
+
+def test_calls_with_non_scalar_arguments_are_not_memoized() -> None:
+    env = Environment()
+    evaluate(_parse_test("int apply = action(f, n) { f(n) }; int inc = action(n) { n + 1 };"), env)
+    memoize(env["apply"])
+    memoize(env["inc"])
+    evaluate(_parse_test("apply(inc, 1);"), env)
+
+    apply = env["apply"]
+    assert isinstance(apply, Action)
+    assert apply.memo.stats().misses == 0
+    assert env["inc"].memo.stats().misses == 1
+
+
+def _parse_test(source: str) -> Program:
+    lexer: Lexer = Lexer(source)
+    parser: Parser = Parser(lexer)
+    program: Program = parser.parse_program()
+
+    assert len(parser.errors) == 0, f"Errors found: {parser.errors}"
+
+    return program
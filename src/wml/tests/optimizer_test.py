@@ -0,0 +1,196 @@
+import pytest
+
+from wml.ast import Program
+from wml.evaluator import evaluate
+from wml.lexer import Lexer
+from wml.object import Environment
+from wml.optimizer import optimize
+from wml.parser import Parser
+
+
+def test_constant_folding() -> None:
+    tests: list[tuple[str, str]] = [
+        ("2 * 3 + 1", "7;"),
+        ("-(2 * 3)", "-6;"),
+        ("5.5 / 5", "1.1;"),
+        ("1 < 2", "True;"),
+        ("'Foo' + \"Bar\"", '"FooBar";'),
+        ("x * (2 + 3)", "(x * 5);"),
+        ("5 + True", "(5 + True);"),  # Errors are left for the evaluator
+        ("1 / 0", "(1 / 0);"),
+    ]
+
+    for source, expected in tests:
+        assert str(_optimize_test(source)) == expected
+
+
+@pytest.mark.parametrize("source", [
+    "'a\"' + \"'b\";",
+    "'a\"' + 'b';",
+    "\"a'\" + \"b\";",
+    "str s = 'x\"'; s + \"'y\";",
+])
+def test_beautified_output_round_trips(source: str) -> None:
+    optimized = _optimize_test(source)
+    expected = evaluate(_parse_test(source), Environment()).inspect()
+
+    assert evaluate(_parse_test(optimized.beautify()), Environment()).inspect() == expected
+
+
+def test_constant_propagation() -> None:
+    tests: list[tuple[str, str]] = [
+        ("int a = 2 * 3; int b = a + 1; b * 2;", "14;"),
+        ("int a = 5; int f = action(a) { return a + 1; }; f;",
+         "int a = 5;int f = action(a){ return (a + 1); };f;"),  # Parameters shadow constants
+        ("int a = 1; int a = 2; a;", "int a = 1;int a = 2;a;"),  # Reassigned variables are not constants
+        ("int a = 5.5; a;", "int a = 5.5;a;"),  # Invalid assignments never bind
+        ("a; int a = 1;", "a;int a = 1;"),  # Only later statements see the value
+    ]
+
+    for source, expected in tests:
+        assert str(_optimize_test(source)) == expected
+
+
+def test_dead_branch_elimination() -> None:
+    tests: list[tuple[str, str]] = [
+        ("int x = 10; if (x > 5) { int y = x * 2; } else { int y = 0; }; y;", "int y = 20;y;"),
+        ("if (False) { 1 }; 5", "5;"),
+        ("if (False) { 1 }", "if (False) { 1; };"),  # The value of the program is still Null
+        ("1 + if (1 < 2) { 10 } else { 20 }", "11;"),
+        ("action(x) { if (True) { return x * 2; } else { return 0; } }",
+         "action(x){ return (x * 2); };"),
+    ]
+
+    for source, expected in tests:
+        assert str(_optimize_test(source)) == expected
+
+
+def test_unused_set_statements() -> None:
+    tests: list[tuple[str, str]] = [
+        ("int unused = 42; int used = x; used;", "int used = x;used;"),
+        ("int unused = x; 5;", "int unused = x;5;"),  # The lookup could fail
+        ("int f = action(a) { return a; }; 5;", "5;"),
+        ("int last = 1;", "int last = 1;"),
+    ]
+
+    for source, expected in tests:
+        assert str(_optimize_test(source)) == expected
+
+
+def test_inlining() -> None:
+    tests: list[tuple[str, str]] = [
+        ("int twice = action(a) { return a * 2; }; twice(5);", "10;"),
+        ("int sub = action(a, b) { return a - b; }; sub(x, 3);", "(x - 3);"),
+        ("action(a, b) { return a * b; }(6, 7);", "42;"),
+        ("int inc = action(a) { return a + 1; }; int twice = action(a) { return a * 2; }; twice(inc(x));",
+         "((x + 1) * 2);"),
+        ("int f = action(a) { return a + n; }; int n = 100; f(3);", "int n = 100;103;"),
+        ("int fib = action(n) { return fib(n - 1); }; fib(3);",
+         "int fib = action(n){ return fib((n - 1)); };int fib%0 = action(){ return fib(2); };fib%0();"),  # Recursive
+        ("int f = action(a) { return a + n; }; int g = action(n) { return f(n); }; g;",
+         "int f = action(a){ return (a + n); };int g = action(n){ return f(n); };g;"),  # `n` is shadowed
+        ("int f = action(a) { return a + a; }; f(x);",
+         "int f = action(a){ return (a + a); };f(x);"),  # `x` would be evaluated twice
+        ("int f = action(a, b) { return b - a; }; f(x, y);",
+         "int f = action(a, b){ return (b - a); };f(x, y);"),  # `y` would be evaluated before `x`
+        ("int f = action(a) { int b = a; return b; }; f(1);",
+         "int f%0 = action(){ int b = 1;return b; };f%0();"),  # Not a single expression
+    ]
+
+    for source, expected in tests:
+        assert str(_optimize_test(source)) == expected
+
+
+def test_inline_threshold() -> None:
+    source = "int f = action(a) { return a * 2 + 1; }; f(x);"
+
+    assert str(optimize(_parse_test(source), inline_threshold=5)) == "((x * 2) + 1);"
+    assert str(optimize(_parse_test(source), inline_threshold=4)) == "int f = action(a){ return ((a * 2) + 1); };f(x);"
+    assert str(optimize(_parse_test(source), inline_threshold=0)) == "int f = action(a){ return ((a * 2) + 1); };f(x);"
+
+
+def test_kept_set_statements() -> None:
+    source = "int scale = 3; int triple = action(a) { return a * scale; }; int unused = 1; triple(2);"
+
+    assert str(optimize(_parse_test(source), keep={"scale", "triple"})) == (
+        "int scale = 3;int triple = action(a){ return (a * 3); };6;"
+    )
+
+
+def test_specialization() -> None:
+    tests: list[tuple[str, str]] = [
+        ("int f = action(a, b) { return if (b) { a * 2 } else { a - 1 }; }; f(x, True) + f(y, False) + f(z, True);",
+         "int f%0 = action(a){ return (a * 2); };int f%1 = action(a){ return (a - 1); };"
+         "((f%0(x) + f%1(y)) + f%0(z));"),
+        ("int f = action(a, b) { int a = a + 1; return a * b; }; f(1, 2);",
+         "int f%0 = action(a){ int a = (a + 1);return (a * 2); };f%0(1);"),  # `a` is reassigned
+        ("int f = action(a, b) { return a * b; }; f(1);",
+         "int f = action(a, b){ return (a * b); };f(1);"),  # Missing argument
+        ("int f = action(a, b) { return if (b) { a } else { a + 1 }; }; int f = 0; f(1, True);",
+         "int f = action(a, b){ return if (b) { a; } else { (a + 1); }; };int f = 0;f(1, True);"),  # Reassigned
+    ]
+
+    for source, expected in tests:
+        assert str(_optimize_test(source)) == expected
+
+
+def test_common_subexpression_elimination() -> None:
+    tests: list[tuple[str, str]] = [
+        ("flt f = action(rate, dt) { flt s = 0.5; return rate * dt + s * (rate * dt) * (rate * dt); }; f;",
+         "flt f = action(rate, dt){ flt s = 0.5;return ((%0 := (rate * dt)) + ((s * %0) * %0)); };f;"),
+        ("int f = action(a) { int b = -a; return -a * b + (-a * b); }; f;",
+         "int f = action(a){ int b = (%0 := (-a));return ((%1 := (%0 * b)) + %1); };f;"),
+        ("int f = action(a) { int x = a * 2; int a = 1; return x + a * 2; }; f;",
+         "int f = action(a){ int x = (a * 2);int a = 1;return (x + (a * 2)); };f;"),  # `a` is reassigned
+        ("int f = action(a) { int b = a; return if (a) { a * b } else { 0 } + a * b; }; f;",
+         "int f = action(a){ int b = a;return (if (a) { (a * b); } else { 0; } + (a * b)); };f;"),  # May not run
+        ("int g = action(a) { int b = a; return b; }; int f = action(a) { return g(a) + g(a); }; f;",
+         "int g = action(a){ int b = a;return b; };int f = action(a){ return (g(a) + g(a)); };f;"),  # Calls
+    ]
+
+    for source, expected in tests:
+        assert str(_optimize_test(source)) == expected
+
+
+@pytest.mark.parametrize("source", [
+    "int a = 2 * 3 + 1; int b = a * 2; b + 1;",
+    "int x = 10; if (x > 5) { int y = x * 2; } else { int y = 0; }; y;",
+    "int double = action(a) { if (1 > 2) { return 0; }; return a * 2; }; double(21);",
+    "str s = 'a' + \"b\"; s + 'c';",
+    "int unused = 42; int used = 3; used + (1 < 2);",
+    "int a = 5.5; a;",
+    "if (False) { 1 }",
+    "int inc = action(a) { return a + 1; }; int twice = action(a) { return a * 2; }; twice(inc(4));",
+    "int f = action(a, b) { return b - a; }; f(x, y);",
+    "int f = action(a) { return 'x' + a; }; f(5 + True);",
+    "int f = action(a) { int b = a * 2; if (b > 2) { int a = 0; }; return a * 2 + b * (a * 2); }; f(1) + f(5);",
+    "int pow = action(b, e, on) { if (e == 0) { return 1; }; if (on) { return b * pow(b, e - 1, on); }; return 0; }; "
+    "pow(2, 10, True) + pow(3, 2, True) + pow(2, 3, False);",
+    "str f = action(s) { str t = s + '!'; return t + (s + '!') + (s + '!'); }; f('hi');",
+])
+def test_optimized_program_evaluates_the_same(source: str) -> None:
+    program = _parse_test(source)
+    optimized = optimize(program)
+
+    assert evaluate(optimized, Environment()).inspect() == evaluate(program, Environment()).inspect()
+
+
+def test_division_by_zero_is_reported_at_runtime() -> None:
+    program = optimize(_parse_test("int a = 5; flt r = a / 0; r;"))
+
+    with pytest.raises(ZeroDivisionError):
+        evaluate(program, Environment())
+
+
+def _optimize_test(source: str) -> Program:
+    return optimize(_parse_test(source))
+
+
+def _parse_test(source: str) -> Program:
+    lexer: Lexer = Lexer(source)
+    parser: Parser = Parser(lexer)
+    program: Program = parser.parse_program()
+
+    assert len(parser.errors) == 0, f"Errors found: {parser.errors}"
+
+    return program
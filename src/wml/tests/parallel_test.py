@@ -0,0 +1,87 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterator
+
+import pytest
+
+from wml import ast
+from wml.evaluator import evaluate
+from wml.lexer import Lexer
+from wml.object import BuiltIn, Environment
+from wml.parallel import evaluate_parallel
+from wml.parser import Parser
+
+
+@pytest.fixture(params=[ThreadPoolExecutor, ProcessPoolExecutor], scope="module")
+def executor(request: pytest.FixtureRequest) -> Iterator[Executor]:
+    with request.param(2) as executor:
+        yield executor
+
+
+@pytest.mark.parametrize("source", [
+    "int a = 1; int b = 2; int c = a + b; c * 2;",
+    "int fib = action(int n) { if (n < 2) { return n; }; return fib(n - 1) + fib(n - 2); }; "
+    "int a = fib(8); int b = fib(9); int c = fib(10); a + b + c;",
+    "int k = 2; int f = action(x) { x * k }; int a = f(1); int k = 3; int b = f(1); a + b;",
+    "int a = 1; int b = if (a > 0) { 1 < 2 } else { 2 < 1 }; if (b) { 10 } else { 20 };",
+    "str a = 'x'; str b = 'y'; a + b;",
+    "int a = 1; int b = 2; return a + b; int c = 3;",
+    "int make = action(a) { action(x) { x + a } }; int g = make(1); int h = make(2); g(10) + h(20);",
+    "int a = 1; int b = 2; int a = b; int b = a; a + b;",
+])
+def test_same_as_sequential(executor: Executor, source: str) -> None:
+    expected_env = Environment()
+    expected = evaluate(_parse_test(source), expected_env)
+    env = Environment()
+
+    assert evaluate_parallel(_parse_test(source), env, executor, workers=2).inspect() == expected.inspect()
+    assert _inspect_test(env) == _inspect_test(expected_env)
+
+
+def test_errors_are_reported_in_source_order(executor: Executor) -> None:
+    env = Environment()
+    source = "int a = 1; int b = 2; int c = x; int d = y; int e = 5; e;"
+
+    result = evaluate_parallel(_parse_test(source), env, executor, workers=2)
+
+    assert result.inspect() == evaluate(_parse_test(source), Environment()).inspect()
+    assert "x" in result.inspect()
+    assert sorted(env.keys()) == ["a", "b"]
+
+
+@pytest.mark.parametrize("source", [
+    "int a = x; int b = boom(); b;",
+    "int a = boom(); int b = x; b;",
+    "int a = 1; int b = a + True; flt c = 1 / 0; int d = 2;",
+])
+def test_python_exceptions_are_raised_in_source_order(executor: Executor, source: str) -> None:
+    env = Environment()
+    env["boom"] = BuiltIn(_boom_test)
+
+    try:
+        expected = evaluate(_parse_test(source), Environment({"boom": BuiltIn(_boom_test)})).inspect()
+    except (RuntimeError, ZeroDivisionError) as error:
+        expected = repr(error)
+    try:
+        result = evaluate_parallel(_parse_test(source), env, executor, workers=2).inspect()
+    except (RuntimeError, ZeroDivisionError) as error:
+        result = repr(error)
+
+    assert result == expected
+
+
+def _boom_test() -> None:
+    raise RuntimeError("boom")
+
+
+def _inspect_test(env: Environment) -> dict[str, str]:
+    return {name: value.inspect() for name, value in env.items()}
+
+
+def _parse_test(source: str) -> ast.Program:
+    lexer: Lexer = Lexer(source)
+    parser: Parser = Parser(lexer)
+    program: ast.Program = parser.parse_program()
+
+    assert len(parser.errors) == 0, f"Errors found: {parser.errors}"
+
+    return program
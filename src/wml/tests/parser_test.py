@@ -545,7 +545,26 @@ def test_string_literal_expression() -> None:
         string_literal: StringLiteral = cast(StringLiteral, expression_statement.expression)
 
         assert string_literal is not None
+        assert string_literal.token_literal() == expected_value
+
+
+def test_string_literal_value() -> None:
+    tests: list[tuple[str, str, str]] = [
+        ('"Hello, World!";', 'Hello, World!', '"Hello, World!"'),  # Double quotes
+        ("'Hello, World!';", 'Hello, World!', '"Hello, World!"'),  # Single quotes
+        ("'Say \"Hi\"';", 'Say "Hi"', "'Say \"Hi\"'"),  # Quotes are stored unescaped
+    ]
+    for source, expected_value, expected_str in tests:
+        lexer: Lexer = Lexer(source)
+        parser: Parser = Parser(lexer)
+
+        program: Program = parser.parse_program()
+
+        expression_statement: ExpressionStatement = cast(ExpressionStatement, program.statements[0])
+        string_literal: StringLiteral = cast(StringLiteral, expression_statement.expression)
+
         assert string_literal.value == expected_value
+        assert str(string_literal) == expected_str
 
 
 def test_variable_expression() -> None:
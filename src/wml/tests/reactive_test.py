@@ -0,0 +1,98 @@
+import pytest
+
+from wml import ast
+from wml.lexer import Lexer
+from wml.object import Float, Integer
+from wml.parser import Parser
+from wml.reactive import ReactiveProgram, UpdateStats
+from wml.token import Token, TokenType
+
+SOURCE = """
+int rate = 2;
+int base = 10;
+int scaled = base * rate;
+int offset = 5;
+int shifted = offset + 1;
+int total = scaled + shifted;
+total;
+"""
+
+
+def test_run_evaluates_every_statement() -> None:
+    program = ReactiveProgram(_parse_test(SOURCE))
+
+    assert program.run().inspect() == "26"
+    assert program.last_update == UpdateStats(7, 7)
+
+
+def test_set_recomputes_only_the_dependents() -> None:
+    tests: list[tuple[str, int, str, int]] = [
+        ("rate", 3, "36", 3),
+        ("offset", 0, "21", 3),
+        ("base", 10, "26", 0),
+        ("scaled", 1, "7", 2),
+    ]
+
+    for name, value, expected, recomputed in tests:
+        program = ReactiveProgram(_parse_test(SOURCE))
+        program.run()
+
+        stats = program.set(name, _integer(value))
+
+        assert program.result.inspect() == expected
+        assert stats == UpdateStats(recomputed, 7)
+
+
+def test_unchanged_values_stop_the_update() -> None:
+    program = ReactiveProgram(_parse_test("int a = 1; int b = a * 0; int c = b + 1; c;"))
+    program.run()
+
+    stats = program.set("a", _integer(7))
+
+    assert program.result.inspect() == "1"
+    assert stats == UpdateStats(1, 4)
+
+
+def test_set_overrides_the_statement_setting_the_name() -> None:
+    program = ReactiveProgram(_parse_test(SOURCE))
+    program.run()
+    program.set("scaled", _integer(1))
+
+    program.set("rate", _integer(100))
+
+    assert program.result.inspect() == "7"
+
+
+def test_dependencies_through_actions() -> None:
+    source = """
+    flt factor = 2.0;
+    flt scale = action(flt x) { x * factor };
+    flt area = scale(3.0);
+    area;
+    """
+    program = ReactiveProgram(_parse_test(source))
+    program.run()
+
+    stats = program.set("factor", Float(0.5, Token(TokenType.FLOAT_VALUE, "0.5")))
+
+    assert program.result.inspect() == "1.5"
+    assert stats == UpdateStats(2, 4)
+
+
+def test_names_set_more_than_once_are_rejected() -> None:
+    with pytest.raises(ValueError, match="a, b"):
+        ReactiveProgram(_parse_test("int a = 1; int b = 2; int a = 3; int b = 4;"))
+
+
+def _integer(value: int) -> Integer:
+    return Integer(value, Token(TokenType.INT_VALUE, str(value)))
+
+
+def _parse_test(source: str) -> ast.Program:
+    lexer: Lexer = Lexer(source)
+    parser: Parser = Parser(lexer)
+    program: ast.Program = parser.parse_program()
+
+    assert len(parser.errors) == 0, f"Errors found: {parser.errors}"
+
+    return program
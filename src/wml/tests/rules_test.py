@@ -0,0 +1,56 @@
+from itertools import count, islice
+
+import pytest
+
+from wml.compiler import parse
+from wml.evaluator import evaluate
+from wml.object import Environment
+from wml.rules import RuleSet
+
+
+def test_rules_are_applied_to_each_record() -> None:
+    rules = RuleSet({
+        "total": "int total = price * quantity; total;",
+        "large": "total > 100;",
+        "label": "if (vip) { 'vip' } else { 'regular' };",
+    })
+    records = [
+        {"price": 30, "quantity": 4, "vip": True},
+        {"price": 5, "quantity": 10, "vip": False},
+    ]
+
+    results = [{name: value.inspect() for name, value in result.items()} for result in rules.apply(records)]
+
+    assert results == [
+        {"total": "120", "large": "True", "label": '"vip"'},
+        {"total": "50", "large": "False", "label": '"regular"'},
+    ]
+
+
+def test_records_do_not_see_each_other() -> None:
+    rules = RuleSet({"seen": "if (first) { int kept = 1; }; kept;"})
+
+    first, second = rules.apply([{"first": True}, {"first": False}])
+
+    assert first["seen"].inspect() == "1"
+    assert "kept" in second["seen"].inspect()
+
+
+def test_rules_see_the_environment() -> None:
+    env = Environment()
+    evaluate(parse("int rate = 3; int fee = action(amount) { amount * rate };"), env)
+    rules = RuleSet({"fee": "fee(amount);"}, env)
+
+    assert [result["fee"].inspect() for result in rules.apply({"amount": n} for n in range(3))] == ["0", "3", "6"]
+
+
+def test_streams_are_applied_lazily() -> None:
+    rules = RuleSet({"small": "n < 2;"})
+    records = ({"n": n} for n in count())
+
+    assert [result["small"].inspect() for result in islice(rules.apply(records), 4)] == ["True", "True", "False", "False"]
+
+
+def test_syntax_errors() -> None:
+    with pytest.raises(ValueError):
+        RuleSet({"broken": "(1;"})
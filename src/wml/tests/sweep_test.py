@@ -0,0 +1,65 @@
+import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from wml.__main__ import main
+from wml.sweep import completed, grid, sweep, SweepResult
+
+SOURCE = "flt area = width * height; if (area > 2) { area } else { label + '!' };"
+PARAMETERS = {"width": [1, 2, 3], "height": [0.5, 1.5], "label": ["small"]}
+EXPECTED = ['"small!"', '"small!"', '"small!"', "3.0", '"small!"', "4.5"]
+
+
+def test_grid() -> None:
+    assert list(grid({"a": [1, 2], "b": [True, False]})) == [
+        {"a": 1, "b": True}, {"a": 1, "b": False}, {"a": 2, "b": True}, {"a": 2, "b": False},
+    ]
+
+
+def test_sweep() -> None:
+    for executor in (ThreadPoolExecutor(2), ProcessPoolExecutor(2)):
+        results: list[SweepResult] = []
+        with executor:
+            runs = sweep(SOURCE, PARAMETERS, results.append, executor, workers=2, chunk_size=4)
+
+        assert runs == 6
+        assert [result.value.inspect() for result in sorted(results)] == EXPECTED
+        assert sorted(results)[3].parameters == {"width": 2, "height": 1.5, "label": "small"}
+
+
+def test_sweep_skips_completed_runs() -> None:
+    results: list[SweepResult] = []
+    with ThreadPoolExecutor(1) as executor:
+        runs = sweep(SOURCE, PARAMETERS, results.append, executor, chunk_size=1, skip={0, 2, 5})
+
+    assert runs == 3
+    assert sorted(result.index for result in results) == [1, 3, 4]
+
+
+def test_completed_ignores_truncated_lines() -> None:
+    lines = ['{"index": 3, "value": 1}', '{"index": 0, "value": 2}', '{"index": 5, "val']
+
+    assert completed(lines) == {0, 3}
+
+
+@pytest.mark.parametrize("last", [
+    '{"index": 4, "par',
+    '{"index": 4, "parameters": {}, "type": "String", "value": "small!"}',  # The newline is missing
+])
+def test_command_line_resume(tmp_path: Path, last: str) -> None:
+    program = tmp_path / "program.wml"
+    program.write_text(SOURCE)
+    output = tmp_path / "results.jsonl"
+    output.write_text('{"index": 1, "parameters": {}, "type": "String", "value": "small!"}\n' + last)
+    args = [str(program), "--param", "width=1,2,3", "--param", "height=0.5,1.5", "--param", "label=small"]
+
+    assert main(["sweep", *args, "--output", str(output), "--resume", "--workers", "1"]) == 0
+
+    lines = output.read_text().splitlines()
+    assert completed(lines) == set(range(6))
+    # The last line, without its newline, is gone and its run written again
+    rows = {row["index"]: row for row in map(json.loads, lines)}
+    assert len(rows) == len(lines) == 6
+    assert rows[3] == {"index": 3, "parameters": {"width": 2, "height": 1.5, "label": "small"}, "type": "Float", "value": 3.0}
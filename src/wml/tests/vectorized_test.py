@@ -0,0 +1,190 @@
+from array import array
+from typing import Optional, Sequence
+
+import pytest
+
+from wml import ast
+from wml import vectorized
+from wml.evaluator import evaluate
+from wml.lexer import Lexer
+from wml.object import Environment
+from wml.parser import Parser
+from wml.vectorized import call_lanes, evaluate_lanes
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+INPUTS = {
+    "x": [-3, -1, 0, 1, 2, 5, 8, 13],
+    "y": [0.5, -2.25, 3.0, 0.0, 1.5, -0.75, 10.0, 2.0],
+    "b": [True, False, False, True, True, False, True, False],
+}
+
+
+@pytest.fixture(autouse=True, params=["lists", "numpy"])
+def backend(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Every test runs with the values of the lanes in lists, and in NumPy arrays
+    if request.param == "numpy" and numpy is None:
+        pytest.skip("NumPy is not installed")
+    monkeypatch.setattr(vectorized, "numpy", numpy if request.param == "numpy" else None)
+
+
+WALK = (
+    "int walk = action(n, position) { "
+    "if (n == 0) { return position; }; "
+    "if (position > 2) { return walk(n - 1, position - 1); }; "
+    "walk(n - 1, position + 1) "
+    "};"
+)
+
+
+@pytest.mark.parametrize("source", [
+    "x * 2 + 1;",
+    "x + y;",
+    "x / 4;",
+    "y * y - x;",
+    "-x;",
+    "!b;",
+    "x < 2;",
+    "b == (x > 0);",
+    "if (x > 0) { x * 10 } else { x - 1 };",
+    "if (x != 0) { 10 / x } else { x / 1 };",
+    "int z = 0; if (x > 1) { int z = x; }; z;",
+    "int z = if (x > 1) { x } else { 0 }; z + 1;",
+    "if (x < 0) { return 0; }; x + 1;",
+    "int f = action(a) { if (a > 3) { return a; }; a * 2 }; f(x) + f(1);",
+    "int fib = action(n) { if (n < 2) { return n; }; return fib(n - 1) + fib(n - 2); }; fib(x);",
+    WALK + " walk(6, x);",
+    "int make = action(a) { action(v) { v + a } }; int g = make(x); g(y);",
+    "int a = 1; int b = 2; a + b;",
+    "flt z = y; z * 2;",
+    "int z = 0; int z = y; z;",
+    "if (b) { return x * 1.5; }; y - x;",
+    "flt z = 0.5; flt z = y - x; z;",
+    "int z = 1; int z = y * x; z;",
+    "int z = 0; int z = (-1.5 > x); z;",
+])
+def test_same_as_each_lane(source: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    program = _parse_test(source)
+    expected = _each_lane_test(program, INPUTS)
+
+    # Every one of these is computed for all the lanes at once
+    monkeypatch.setattr(vectorized, "_evaluate_lane_by_lane", _unexpected_test)
+    result = evaluate_lanes(program, INPUTS)
+
+    assert _inspect_test(result) == expected
+
+
+@pytest.mark.parametrize("source", [
+    "if (x > 0) { 'positive' } else { 'other' };",
+    "if (b) { y };",
+    "if (x > 0) { x } else { y };",
+    "if (x > 0) { int z = 1; }; z;",
+    "x + b;",
+    "flt z = if (b) { x * 1.5 } else { y - x }; z;",
+    "int g = action(v) { v }; if (b) { g } else { 1 };",
+    "int z = y * x; z;",
+])
+def test_falls_back_to_each_lane(source: str) -> None:
+    program = _parse_test(source)
+
+    assert _inspect_test(evaluate_lanes(program, INPUTS)) == _each_lane_test(program, INPUTS)
+
+
+def test_division_by_zero() -> None:
+    # Raised as `evaluate` raises it
+    with pytest.raises(ZeroDivisionError):
+        evaluate_lanes(_parse_test("10 / x;"), INPUTS)
+
+
+@pytest.mark.parametrize("source", [
+    "x * x * x;",
+    "if (x < 100) { x * x } else { 0 };",
+])
+def test_large_integers(source: str) -> None:
+    # Python integers never overflow, NumPy ones do
+    program = _parse_test(source)
+    inputs = {"x": [2 ** 40, 3, -5, -(2 ** 40)]}
+
+    assert _inspect_test(evaluate_lanes(program, inputs)) == _each_lane_test(program, inputs)
+
+
+def test_numpy_inputs(monkeypatch: pytest.MonkeyPatch) -> None:
+    if vectorized.numpy is None:
+        pytest.skip("NumPy arrays are only taken as inputs with NumPy")
+    program = _parse_test("if (b) { y * 2.0 } else { y - x };")
+    inputs = {name: numpy.array(values) for name, values in INPUTS.items()}
+
+    monkeypatch.setattr(vectorized, "_evaluate_lane_by_lane", _unexpected_test)
+    assert _inspect_test(evaluate_lanes(program, inputs)) == _each_lane_test(program, INPUTS)
+
+
+def test_outer_environment() -> None:
+    env = Environment()
+    evaluate(_parse_test("int k = 3; int f = action(a) { a * k };"), env)
+    program = _parse_test("f(x) + k;")
+
+    assert _inspect_test(evaluate_lanes(program, INPUTS, env)) == _each_lane_test(program, INPUTS, env)
+
+
+def test_columns() -> None:
+    result = evaluate_lanes(_parse_test("x * 2;"), {"x": [1, 2, 3]})
+
+    assert result.kind.__name__ == "Integer"
+    assert list(result.values) == [2, 4, 6]
+    assert evaluate_lanes(_parse_test("int z = x;"), {"x": [1, 2, 3]}) is None
+    with pytest.raises(ValueError):
+        evaluate_lanes(_parse_test("x + y;"), {"x": [1, 2], "y": [1]})
+
+
+@pytest.mark.parametrize("source, vectorized_", [
+    ("action(a, r) { if (a > 2) { return a * r; }; r - a }", True),
+    ("action(a, r) { score(a) + r }", True),
+    ("action(a, r) { int c = 0; int c = (r > a); c }", True),
+    ("action(a, r) { if (a > 2) { 'high' } else { 'low' } }", False),
+    ("action(a, r) { if (a > 2) { a + missing } else { r } }", False),
+])
+def test_call_lanes(source: str, vectorized_: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    env = Environment()
+    evaluate(_parse_test(f"int score = action(a) {{ a * 3 - 1 }}; int f = {source};"), env)
+    columns = [array("q", [-3, -1, 0, 1, 2, 5, 8, 13]), array("d", INPUTS["y"])]
+    expected = [
+        evaluate(_parse_test("f(a, r);"), Environment(env, store={"a": a, "r": r})).inspect()
+        for a, r in zip(vectorized._objects(columns[0]), vectorized._objects(columns[1]))
+    ]
+
+    if vectorized_:
+        monkeypatch.setattr(vectorized, "_call_row_by_row", _unexpected_test)
+    assert _inspect_test(call_lanes(env["f"], columns)) == expected
+
+
+def _each_lane_test(program: ast.Program, inputs: dict[str, Sequence], env: Optional[Environment] = None) -> list[str]:
+    results = []
+    for idx in range(len(next(iter(inputs.values())))):
+        lane_env = Environment(env)
+        for name, values in inputs.items():
+            lane_env[name] = vectorized._wrap(values[idx])
+        result = evaluate(program, lane_env)
+        results.append(None if result is None else result.inspect())
+
+    return results if any(result is not None for result in results) else None
+
+
+def _inspect_test(result: Optional[vectorized.Column]) -> Optional[list[str]]:
+    return None if result is None else [value.inspect() for value in result.objects()]
+
+
+def _unexpected_test(*args: object) -> None:
+    raise AssertionError("Evaluated lane by lane")
+
+
+def _parse_test(source: str) -> ast.Program:
+    lexer: Lexer = Lexer(source)
+    parser: Parser = Parser(lexer)
+    program: ast.Program = parser.parse_program()
+
+    assert len(parser.errors) == 0, f"Errors found: {parser.errors}"
+
+    return program
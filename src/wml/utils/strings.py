@@ -0,0 +1,19 @@
+### String literals ###
+
+
+def quote(content: str) -> str:
+    """Wrap `content` in quotes, preferring double quotes unless it only contains double quotes."""
+    has_simple_quotes = "'" in content
+    has_double_quotes = '"' in content
+
+    wrapper = "'" if has_double_quotes and not has_simple_quotes else '"'
+    return f"{wrapper}{content}{wrapper}"
+
+
+def unquote(literal: str) -> str:
+    """Strip the quotes of a string literal.
+
+    The lexer has no escapes: a literal ends at the first quote like the one it
+    starts with, so its content is everything in between, as it is.
+    """
+    return literal[1:-1]
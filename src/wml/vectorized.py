@@ -0,0 +1,700 @@
+import operator
+from array import array
+from typing import Callable, Mapping, NamedTuple, Optional, Sequence, Union
+
+from wml import ast
+from wml import object as obj
+from wml.builtings import BUILTINS
+from wml.evaluator import (
+    _do_action,
+    _ErrorSignal,
+    _evaluate_infix_expression,
+    _evaluate_prefix_expression,
+    _is_truthy,
+    _validate_set_statement_types,
+    evaluate,
+)
+from wml.token import Token, TokenType
+
+try:
+    import numpy
+except ImportError:  # Without NumPy, the values of the lanes are kept in lists
+    numpy = None
+
+# The types of values lanes can hold, and the type of the tokens they start with
+KINDS: dict[type[obj.Type], TokenType] = {
+    obj.Boolean: TokenType.BOOL_VALUE,
+    obj.Float: TokenType.FLOAT_VALUE,
+    obj.Integer: TokenType.INT_VALUE,
+}
+_PYTHON_KINDS: dict[type, type[obj.Type]] = {bool: obj.Boolean, float: obj.Float, int: obj.Integer}
+# The kind of lanes each type code of `array.array` and each kind of NumPy dtype gives
+_ARRAY_KINDS: dict[str, type[obj.Type]] = {
+    **dict.fromkeys("bBhHiIlLqQ", obj.Integer),
+    **dict.fromkeys("fd", obj.Float),
+}
+_DTYPE_KINDS: dict[str, type[obj.Type]] = {"b": obj.Boolean, "f": obj.Float, "i": obj.Integer, "u": obj.Integer}
+
+_ARITHMETIC: dict[str, Callable[[object, object], object]] = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+}
+_COMPARISONS: dict[str, Callable[[object, object], object]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    ">": operator.gt,
+    "<=": operator.le,
+    ">=": operator.ge,
+}
+# The operators the evaluator knows for floats, any other one gives null
+_FLOAT_OPERATORS = {"+", "-", "*", "/", "**", "==", "!=", "<", ">", "<=", ">="}
+
+# Integers stay below this bound for NumPy to compute them as Python does, without overflowing
+_INT_BOUND = 2 ** 31
+
+_MISSING = object()
+
+# The type of the tokens of lanes whose tokens are not all of the same type
+MIXED_TOKENS = object()
+
+
+class Column(NamedTuple):
+    """The values of a program in every lane.
+
+    `values` holds the Python values of the lanes when they are all of the type
+    `kind`, or else the WML values themselves and `kind` is None.
+    """
+
+    kind: Optional[type[obj.Type]]
+    values: Sequence
+
+    def objects(self) -> list[obj.Type]:
+        """Return the WML value of each lane."""
+        if self.kind is None:
+            return list(self.values)
+        if self.kind == obj.Null:
+            return [obj.Null() for _ in self.values]
+
+        return [_wrap(value, self.kind) for value in _to_list(self.values)]
+
+
+def evaluate_lanes(
+        program: ast.Program,
+        inputs: Mapping[str, Sequence],
+        env: Optional[obj.Environment] = None,
+) -> Optional[Column]:
+    """Evaluate `program` once per lane, with the names of `inputs` bound to the values of the lane.
+
+    Lane `i` gets the value `evaluate` gives in a new scope inside `env` where each
+    name of `inputs` is bound to its `i`-th value. The inputs are columns of
+    booleans, integers or floats, all of the same length: NumPy arrays when NumPy is
+    installed, `array.array`s or any sequences.
+
+    The program is walked once for all the lanes. Each operation computes every lane
+    at once, and both branches of an `if` run, each one on the lanes taking it. A
+    return statement leaves its lanes out of the rest of the action. Whatever cannot
+    be computed this way exactly as `evaluate` would, as strings, errors or a
+    division by zero, has the program evaluated lane by lane instead.
+
+    Returns None if the program has no value, as when it ends with a set statement.
+    """
+    size = len(next(iter(inputs.values()))) if inputs else 1
+    if any(len(values) != size for values in inputs.values()):
+        raise ValueError("All the inputs must have the same number of lanes")
+
+    try:
+        lanes = {name: _lanes_of(values) for name, values in inputs.items()}
+        return _Evaluator(size).program(program, lanes, env)
+    except _Unsupported:
+        return _evaluate_lane_by_lane(program, inputs, env, size)
+
+
+def call_lanes(action: obj.Action, columns: Sequence[Sequence]) -> Optional[Column]:
+    """Call `action` once per row of `columns`, each column holding the values of one of its arguments.
+
+    The columns are as the inputs of `evaluate_lanes`, and so is the way the calls
+    are made: the body of the action is walked once for the whole batch, unless it
+    does something that can only be done row by row. The rows are then called one
+    after the other, as `evaluate` calls an action.
+    """
+    size = len(columns[0]) if columns else 1
+    if any(len(values) != size for values in columns):
+        raise ValueError("All the columns must have the same number of rows")
+
+    try:
+        args = [_lanes_of(values) for values in columns]
+        return _Evaluator(size).call(action, args)
+    except _Unsupported:
+        return _call_row_by_row(action, columns, size)
+
+
+class Lanes(NamedTuple):
+    """A value in every lane, all of the type `kind` and with tokens of the type `token_type`.
+
+    The type of the tokens only matters to set statements, and is `MIXED_TOKENS` if
+    it differs between lanes. When set in some lanes only, as in a single branch of
+    an `if`, `defined` tells in which ones.
+    """
+
+    kind: type[obj.Type]
+    token_type: object
+    values: Sequence
+    defined: Optional[Sequence] = None
+
+
+class _Unsupported(Exception):
+    """Raised when the lanes cannot be computed at once exactly as `evaluate` computes each one."""
+
+
+class _VectorAction(NamedTuple):
+    # An action created while evaluating lanes, which sees the lanes of its scope
+    parameters: list[ast.Variable]
+    body: ast.Block
+    scope: "_Scope"
+
+
+# The value of an expression, either the same in every lane or one per lane
+Value = Union[obj.Type, Lanes, _VectorAction]
+
+# The value of an `if` whose branches have values of different types, which can only
+# be used lane by lane
+_MIXED = object()
+
+
+class _Scope:
+    """The names bound in a scope, in every lane, in front of an outer scope."""
+
+    def __init__(self, outer: Union["_Scope", obj.Environment, None]) -> None:
+        self.store: dict[str, Value] = {}
+        self.outer = outer
+
+    def lookup(self, name: str, size: int) -> object:
+        value = self.store.get(name, _MISSING)
+        if value is _MISSING:
+            return self._outer_lookup(name, size)
+        if type(value) != Lanes or value.defined is None:
+            return value
+
+        # The lanes where the name is not bound here find it in the outer scopes
+        outer = self._outer_lookup(name, size)
+        if outer is _MISSING:
+            return value
+        return _merge(value.defined, value, outer, size)
+
+    def _outer_lookup(self, name: str, size: int) -> object:
+        if type(self.outer) == _Scope:
+            return self.outer.lookup(name, size)
+        if self.outer is None:
+            return _MISSING
+        try:
+            return self.outer[name]
+        except KeyError:
+            return _MISSING
+
+
+class _Evaluator:
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        # The lanes still running, or None when all of them are
+        self.active: Optional[Sequence] = None
+        # The lanes that returned from the current action or program, and their values
+        self.returned: Optional[Sequence] = None
+        self.result: object = None
+
+    def program(self, program: ast.Program, inputs: dict[str, Lanes], env: Optional[obj.Environment]) -> Optional[Column]:
+        scope = _Scope(env)
+        scope.store.update(inputs)
+        return _column(self._frame(program.statements, scope, None), self.size)
+
+    def call(self, action: obj.Action, args: list[Lanes]) -> Optional[Column]:
+        return _column(self._call(action, args), self.size)
+
+    def _frame(self, statements: list[ast.Statement], scope: _Scope, active: Optional[Sequence]) -> object:
+        # The statements of an action or a program, where return statements stop
+        saved = self.active, self.returned, self.result
+        self.active, self.returned, self.result = active, None, None
+        try:
+            value = self._block(statements, scope)
+            if self.returned is None:
+                return value
+            if self.active is not None and not _any(self.active):
+                return self.result
+            # The lanes that did not return have the value of the last statement
+            return _merge(self.returned, self.result, _used(value), self.size)
+        finally:
+            self.active, self.returned, self.result = saved
+
+    def _block(self, statements: list[ast.Statement], scope: _Scope) -> object:
+        value: object = None
+        for statement in statements:
+            if self.active is not None and not _any(self.active):
+                return None
+            value = self._statement(statement, scope)
+
+        return value
+
+    def _statement(self, node: ast.Statement, scope: _Scope) -> object:
+        node_type = type(node)
+
+        if node_type == ast.ExpressionStatement:
+            return self._expression(node.expression, scope)
+
+        if node_type == ast.SetStatement:
+            value = _used(self._expression(node.value, scope))
+            if node.value_type is None and not self._can_set(node, value, scope):
+                return None
+            self._bind(scope, node.name.value, value)
+            return None
+
+        if node_type == ast.ReturnStatement:
+            value = _used(self._expression(node.value, scope))
+            active = self._running()
+            if self.returned is None:
+                self.returned, self.result = active, value
+            else:
+                self.result = _merge(active, value, self.result, self.size)
+                self.returned = _or(self.returned, active)
+            self.active = _and(active, _not(self.returned))
+            return None
+
+        raise _Unsupported()
+
+    def _can_set(self, node: ast.SetStatement, value: Value, scope: _Scope) -> bool:
+        # Mirrors `wml.evaluator._set_environment_value`
+        if type(value) == _VectorAction:
+            return True
+        value_type = value.token_type if type(value) == Lanes else value.token.token_type
+        if value_type == TokenType.ACTION:
+            return True
+        if value_type is MIXED_TOKENS:
+            # Bound in the lanes of some types only
+            if node.token.token_type != TokenType.ANY_TYPE:
+                raise _Unsupported()
+        elif not _validate_set_statement_types(node.token.token_type, value_type):
+            return False
+        if node.token.token_type in (TokenType.CONSTANT, TokenType.IDENTIFIER) and node.name.value in scope.store:
+            old = scope.store[node.name.value]
+            if type(old) == Lanes and old.defined is not None:
+                # Reassigned in some lanes only
+                raise _Unsupported()
+            return False
+        return True
+
+    def _bind(self, scope: _Scope, name: str, value: Value) -> None:
+        if self.active is None:
+            scope.store[name] = value
+            return
+
+        # Only the running lanes are bound, the others keep what they had
+        old = scope.store.get(name, _MISSING)
+        if old is _MISSING:
+            scope.store[name] = _lanes(value, self.size)._replace(defined=self.active)
+        else:
+            scope.store[name] = _merge(self.active, value, old, self.size)
+
+    def _expression(self, node: ast.Expression, scope: _Scope) -> object:
+        node_type = type(node)
+
+        if node_type in (ast.Boolean, ast.Float, ast.Integer, ast.StringLiteral):
+            return evaluate(node, obj.Environment())
+
+        if node_type in (ast.Constant, ast.Identifier, ast.Variable):
+            return self._lookup(node, scope)
+
+        if node_type == ast.Infix:
+            left = _used(self._expression(node.left, scope))
+            right = _used(self._expression(node.right, scope))
+            return self._infix(node.operator, left, right)
+
+        if node_type == ast.Prefix:
+            return self._prefix(node.operator, _used(self._expression(node.right, scope)))
+
+        if node_type == ast.If:
+            return self._if(node, scope)
+
+        if node_type == ast.Call:
+            action = _used(self._expression(node.action, scope))
+            args = [_used(self._expression(argument, scope)) for argument in node.arguments]
+            return self._call(action, args)
+
+        if node_type == ast.Action:
+            return _VectorAction(node.parameters, node.body, scope)
+
+        if node_type == ast.Temporary:
+            value = _used(self._expression(node.value, scope))
+            self._bind(scope, node.name, value)
+            return value
+
+        raise _Unsupported()
+
+    def _lookup(self, node: ast.Expression, scope: _Scope) -> Value:
+        # Mirrors `wml.evaluator._evaluate_constant` and `_evaluate_identifier`
+        name = node.value
+        if type(node) == ast.Constant and name in BUILTINS:
+            return BUILTINS[name]
+
+        value = scope.lookup(name, self.size)
+        if value is _MISSING:
+            if type(node) != ast.Constant and name in BUILTINS:
+                return BUILTINS[name]
+            raise _Unsupported()
+        if type(value) == Lanes and value.defined is not None:
+            # The running lanes where the name is not bound would fail
+            if _any(_and(self._running(), _not(value.defined))):
+                raise _Unsupported()
+            return value._replace(defined=None)
+        return value
+
+    def _call(self, action: Value, args: list[Value]) -> object:
+        if type(action) == obj.BuiltIn:
+            if not all(isinstance(arg, obj.Type) for arg in args):
+                raise _Unsupported()
+            result = action.function(*args)
+            if type(result) not in KINDS and type(result) not in (obj.Null, obj.String):
+                raise _Unsupported()
+            return result
+
+        if type(action) == obj.Action:
+            scope = _Scope(action.env)
+        elif type(action) == _VectorAction:
+            scope = _Scope(action.scope)
+        else:
+            raise _Unsupported()
+
+        # The evaluator reports the error, lane by lane
+        if len(args) != len(action.parameters):
+            raise _Unsupported()
+        for param, arg in zip(action.parameters, args):
+            scope.store[param.value] = arg
+        return self._frame(action.body.statements, scope, self.active)
+
+    def _if(self, node: ast.If, scope: _Scope) -> object:
+        condition = _used(self._expression(node.condition, scope))
+        if type(condition) != Lanes:
+            if _is_truthy(condition):
+                return self._block(node.consequence.statements, scope)
+            if node.alternative is not None:
+                return self._block(node.alternative.statements, scope)
+            return obj.Null(node.token)
+
+        taken = _truthy(condition)
+        running = self._running()
+        # The value of each branch, and the lanes that took it and are still running
+        branches: list[tuple[Sequence, object]] = []
+        for block, lanes in ((node.consequence, _and(running, taken)), (node.alternative, _and(running, _not(taken)))):
+            if not _any(lanes):
+                continue
+            self.active = lanes
+            value = obj.Null(node.token) if block is None else self._block(block.statements, scope)
+            branches.append((self.active, value))
+        self.active = _or(*(lanes for lanes, _ in branches)) if branches else _full(False, self.size)
+
+        # The branches where every lane returned have no value
+        branches = [(lanes, value) for lanes, value in branches if _any(lanes)]
+        if not branches:
+            return None
+        if len(branches) == 1:
+            return branches[0][1]
+        (lanes, value), (_, other) = branches
+        if value is None and other is None:
+            return None
+        try:
+            return _merge(lanes, _used(value), _used(other), self.size)
+        except _Unsupported:
+            return _MIXED
+
+    def _infix(self, operator_: str, left: Value, right: Value) -> Value:
+        if type(left) != Lanes and type(right) != Lanes:
+            # The same in every lane, so computed once
+            return _scalar(_evaluate_infix_expression, operator_, left, right)
+
+        left, right = _lanes(left, self.size), _lanes(right, self.size)
+        kinds = (left.kind, right.kind)
+        active = self.active
+
+        # Mirrors `wml.evaluator._evaluate_infix_expression`, results carry the token of the right operand
+        if kinds == (obj.Integer, obj.Integer) and operator_ != "/":
+            if operator_ in _ARITHMETIC:
+                _check_bounds(active, left.values, right.values)
+                return Lanes(obj.Integer, right.token_type, _apply(_ARITHMETIC[operator_], left.values, right.values, active))
+            if operator_ in _COMPARISONS:
+                return Lanes(obj.Boolean, right.token_type, _apply(_COMPARISONS[operator_], left.values, right.values, active))
+            raise _Unsupported()
+
+        if left.kind in (obj.Integer, obj.Float) and right.kind in (obj.Integer, obj.Float):
+            left_values, right_values = _floats(left), _floats(right)
+            # As `obj.Float` does, an integer token becomes a float token
+            float_token = TokenType.FLOAT_VALUE if right.token_type == TokenType.INT_VALUE else right.token_type
+            if operator_ in _ARITHMETIC:
+                return Lanes(obj.Float, float_token, _apply(_ARITHMETIC[operator_], left_values, right_values, active))
+            if operator_ == "/":
+                if _any_zero(right_values, active):
+                    raise _Unsupported()
+                return Lanes(obj.Float, float_token, _apply(operator.truediv, left_values, right_values, active))
+            if operator_ in _COMPARISONS:
+                return Lanes(obj.Boolean, float_token, _apply(_COMPARISONS[operator_], left_values, right_values, active))
+            if operator_ not in _FLOAT_OPERATORS:
+                return Lanes(obj.Null, right.token_type, _full(False, self.size))
+            raise _Unsupported()
+
+        if kinds in ((obj.Boolean, obj.Boolean), (obj.Null, obj.Null)) and operator_ in ("==", "!="):
+            if left.kind == obj.Null:
+                equal = _full(True, self.size)
+            else:
+                equal = _apply(operator.eq, left.values, right.values, active)
+            return Lanes(obj.Boolean, right.token_type, equal if operator_ == "==" else _not(equal))
+
+        raise _Unsupported()
+
+    def _prefix(self, operator_: str, right: Value) -> Value:
+        if type(right) != Lanes:
+            return _scalar(_evaluate_prefix_expression, operator_, right)
+
+        if operator_ == "!":
+            return Lanes(obj.Boolean, right.token_type, _not(_truthy(right)))
+        if operator_ == "-" and right.kind in (obj.Integer, obj.Float):
+            if right.kind == obj.Integer:
+                _check_bounds(self.active, right.values)
+            return Lanes(right.kind, right.token_type, _negate(right.values))
+
+        raise _Unsupported()
+
+    def _running(self) -> Sequence:
+        return self.active if self.active is not None else _full(True, self.size)
+
+
+def _evaluate_lane_by_lane(
+        program: ast.Program,
+        inputs: Mapping[str, Sequence],
+        env: Optional[obj.Environment],
+        size: int,
+) -> Optional[Column]:
+    columns = {name: _to_list(values) for name, values in inputs.items()}
+    results = []
+    for idx in range(size):
+        lane_env = obj.Environment(env)
+        for name, values in columns.items():
+            lane_env[name] = _wrap(values[idx])
+        results.append(evaluate(program, lane_env))
+
+    return _collect(results)
+
+
+def _call_row_by_row(action: obj.Action, columns: Sequence[Sequence], size: int) -> Optional[Column]:
+    rows = zip(*(_objects(values) for values in columns)) if columns else ([] for _ in range(size))
+    results = []
+    for args in rows:
+        try:
+            results.append(_do_action(action, list(args)))
+        except _ErrorSignal as signal:
+            results.append(signal.error)
+
+    return _collect(results)
+
+
+def _collect(results: list[Optional[obj.Type]]) -> Optional[Column]:
+    if all(result is None for result in results):
+        return None
+    kinds = {type(result) for result in results}
+    if len(kinds) == 1 and next(iter(kinds)) in KINDS:
+        kind = kinds.pop()
+        values = [result.value for result in results]
+        try:
+            return Column(kind, _array(values, kind))
+        except OverflowError:
+            # Integers too large for NumPy are kept as they are
+            return Column(kind, values)
+    return Column(None, results)
+
+
+def _column(value: object, size: int) -> Optional[Column]:
+    if value is None:
+        return None
+    value = _used(value)
+    if type(value) == _VectorAction:
+        raise _Unsupported()
+    if type(value) == Lanes:
+        return Column(value.kind, [None] * size if value.kind == obj.Null else value.values)
+    if type(value) in KINDS:
+        return Column(type(value), _array([value.value] * size, type(value)))
+    return Column(None, [value] * size)
+
+
+def _used(value: object) -> Value:
+    # A value some lanes do not have, or of another type in some lanes, can only be used lane by lane
+    if value is None or value is _MIXED:
+        raise _Unsupported()
+    return value
+
+
+def _scalar(function: Callable[..., obj.Type], operator_: str, *operands: Value) -> obj.Type:
+    if not all(isinstance(operand, obj.Type) for operand in operands):
+        raise _Unsupported()
+    try:
+        return function(operator_, *operands)
+    except (_ErrorSignal, ArithmeticError):
+        raise _Unsupported()
+
+
+def _lanes_of(values: Sequence) -> Lanes:
+    kind = _kind_of(values)
+    if kind is None:
+        raise _Unsupported()
+
+    lanes = _array(values, kind)
+    if kind == obj.Integer:
+        _check_bounds(None, lanes)
+    return Lanes(kind, KINDS[kind], lanes)
+
+
+def _kind_of(values: Sequence) -> Optional[type[obj.Type]]:
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        return _DTYPE_KINDS.get(values.dtype.kind)
+    if isinstance(values, array):
+        return _ARRAY_KINDS.get(values.typecode)
+
+    kinds = {type(value) for value in values}
+    return _PYTHON_KINDS.get(kinds.pop()) if len(kinds) == 1 else None
+
+
+def _objects(values: Sequence) -> list[obj.Type]:
+    kind = _kind_of(values)
+    if kind is None:
+        return [_wrap(value) for value in _to_list(values)]
+
+    python_type = {obj.Boolean: bool, obj.Float: float, obj.Integer: int}[kind]
+    token_type = KINDS[kind]
+    return [kind(value, Token(token_type, str(value), 0, 0)) for value in map(python_type, _to_list(values))]
+
+
+def _lanes(value: Value, size: int) -> Lanes:
+    # The lanes of a value, which may be the same in all of them
+    if type(value) == Lanes:
+        return value
+    if type(value) in KINDS:
+        return Lanes(type(value), value.token.token_type, _array([value.value] * size, type(value)))
+    if type(value) == obj.Null:
+        return Lanes(obj.Null, None if value.token is None else value.token.token_type, _full(False, size))
+    raise _Unsupported()
+
+
+def _merge(mask: Sequence, value: object, other: object, size: int) -> Lanes:
+    # The lanes of `value` where `mask` is set, and of `other` elsewhere
+    value, other = _lanes(value, size), _lanes(other, size)
+    if value.kind != other.kind:
+        raise _Unsupported()
+
+    defined = None
+    if value.defined is not None or other.defined is not None:
+        everywhere = _full(True, size)
+        defined = _where(
+            mask,
+            everywhere if value.defined is None else value.defined,
+            everywhere if other.defined is None else other.defined,
+        )
+    token_type = value.token_type if value.token_type == other.token_type else MIXED_TOKENS
+    return Lanes(value.kind, token_type, _where(mask, value.values, other.values), defined)
+
+
+def _wrap(value: object, kind: Optional[type[obj.Type]] = None) -> obj.Type:
+    kind = kind or _PYTHON_KINDS.get(type(value))
+    if kind is None:
+        raise TypeError(f"Lanes cannot hold {type(value).__name__} values")
+
+    value = {obj.Boolean: bool, obj.Float: float, obj.Integer: int}[kind](value)
+    return kind(value, Token(KINDS[kind], str(value), 0, 0))
+
+
+### The values of all the lanes at once, in NumPy arrays or in lists ###
+
+
+def _array(values: Sequence, kind: type[obj.Type]) -> Sequence:
+    if numpy is None:
+        return list(values)
+    return numpy.asarray(values, dtype={obj.Boolean: bool, obj.Float: numpy.float64, obj.Integer: numpy.int64}[kind])
+
+
+def _to_list(values: Sequence) -> list:
+    return values.tolist() if numpy is not None and isinstance(values, numpy.ndarray) else list(values)
+
+
+def _full(value: bool, size: int) -> Sequence:
+    return numpy.full(size, value) if numpy is not None else [value] * size
+
+
+def _apply(function: Callable[[object, object], object], left: Sequence, right: Sequence, active: Optional[Sequence]) -> Sequence:
+    if numpy is not None:
+        # The lanes that are not running may hold anything, which must not warn
+        with numpy.errstate(all="ignore"):
+            return function(left, right)
+    if active is None:
+        return [function(a, b) for a, b in zip(left, right)]
+    return [function(a, b) if running else a for a, b, running in zip(left, right, active)]
+
+
+def _check_bounds(active: Optional[Sequence], *columns: Sequence) -> None:
+    # Python integers never overflow, NumPy ones do
+    if numpy is None:
+        return
+    for values in columns:
+        if active is not None:
+            values = values[active]
+        if len(values) and int(numpy.abs(values).max()) >= _INT_BOUND:
+            raise _Unsupported()
+
+
+def _floats(lanes: Lanes) -> Sequence:
+    if lanes.kind == obj.Float:
+        return lanes.values
+    if numpy is not None:
+        return lanes.values.astype(numpy.float64)
+    return [float(value) for value in lanes.values]
+
+
+def _negate(values: Sequence) -> Sequence:
+    return -values if numpy is not None else [-value for value in values]
+
+
+def _truthy(lanes: Lanes) -> Sequence:
+    # Mirrors `wml.evaluator._is_truthy`
+    if lanes.kind == obj.Null:
+        return _full(False, len(lanes.values))
+    if numpy is not None:
+        return lanes.values != 0
+    return [value != 0 for value in lanes.values]
+
+
+def _any_zero(values: Sequence, active: Optional[Sequence]) -> bool:
+    if numpy is not None:
+        zero = values == 0
+        return bool((zero if active is None else zero & active).any())
+    if active is None:
+        return any(value == 0 for value in values)
+    return any(value == 0 for value, running in zip(values, active) if running)
+
+
+def _any(mask: Sequence) -> bool:
+    return bool(mask.any()) if numpy is not None else any(mask)
+
+
+def _not(mask: Sequence) -> Sequence:
+    return ~mask if numpy is not None else [not value for value in mask]
+
+
+def _and(left: Sequence, right: Sequence) -> Sequence:
+    return left & right if numpy is not None else [a and b for a, b in zip(left, right)]
+
+
+def _or(*masks: Sequence) -> Sequence:
+    if numpy is not None:
+        return numpy.logical_or.reduce(masks)
+    return [any(values) for values in zip(*masks)]
+
+
+def _where(mask: Sequence, values: Sequence, others: Sequence) -> Sequence:
+    if numpy is not None:
+        return numpy.where(mask, values, others)
+    return [value if taken else other for taken, value, other in zip(mask, values, others)]